@@ -1,74 +1,22 @@
-import time
-import tracemalloc
-import sys
-import random
+import os
 import numpy as np
 import matplotlib.pyplot as plt
-from graph_model import Cell, create_graph_from_grid
-from dfs_solver import find_path_recursive, dfs_iterative
+from performance_analyzer import run_sweep
 
 # Analysis Configuration
 GRID_SIZES = [(20, 20), (40, 40), (60, 60)]
 OBSTACLE_DENSITIES = [0.1, 0.2, 0.3] # 10%, 20%, 30%
 NUM_RUNS = 3  # Number of runs to average
 
-def generate_obstacles(grid_size, density):
-    rows, cols = grid_size
-    obstacles = set()
-    num_obstacles = int(rows * cols * density)
-    while len(obstacles) < num_obstacles:
-        r, c = random.randint(0, rows - 1), random.randint(0, cols - 1)
-        # Ensure start and goal are not obstacles
-        if (r, c) != (0, 0) and (r, c) != (rows - 1, cols - 1):
-            obstacles.add(Cell(r, c))
-    return list(obstacles)
-
-def run_single_analysis(grid_size, obstacle_density, algorithm):
-    rows, cols = grid_size
-    graph = create_graph_from_grid(grid_size, generate_obstacles(grid_size, obstacle_density))
-    start_node = Cell(0, 0)
-    goal_node = Cell(rows - 1, cols - 1)
-
-    # Set a higher recursion limit for larger grids for the recursive algorithm
-    if algorithm == 'recursive':
-        original_limit = sys.getrecursionlimit()
-        new_limit = rows * cols
-        if new_limit > original_limit:
-            sys.setrecursionlimit(new_limit)
-
-    tracemalloc.start()
-    start_time = time.perf_counter()
-
-    if algorithm == 'recursive':
-        path, _, max_depth = find_path_recursive(graph, start_node, goal_node)
-    else:
-        path, _ = dfs_iterative(graph, start_node, goal_node)
-        max_depth = 0 # Not applicable for iterative
-
-    end_time = time.perf_counter()
-    _, peak_mem = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-
-    if algorithm == 'recursive':
-        sys.setrecursionlimit(original_limit) # Reset to default
-
-    return {
-        'time': end_time - start_time,
-        'memory': peak_mem / 1024,  # in KB
-        'depth': max_depth,
-        'path_found': path is not None
-    }
-
-def main():
-    results = {size: {density: {'recursive': [], 'iterative': []} for density in OBSTACLE_DENSITIES} for size in GRID_SIZES}
+def main(workers=None):
+    """
+    Runs the sweep on a process pool and plots time, memory and depth.
 
+    :param workers: Worker processes for the sweep; defaults to every core.
+    """
     print("Running performance analysis...")
-    for size in GRID_SIZES:
-        for density in OBSTACLE_DENSITIES:
-            print(f"  Grid Size: {size}, Obstacle Density: {density*100}%")
-            for _ in range(NUM_RUNS):
-                results[size][density]['recursive'].append(run_single_analysis(size, density, 'recursive'))
-                results[size][density]['iterative'].append(run_single_analysis(size, density, 'iterative'))
+    results = run_sweep(GRID_SIZES, OBSTACLE_DENSITIES, ['recursive', 'iterative'],
+                        num_runs=NUM_RUNS, workers=workers or os.cpu_count())
     print("Analysis complete.")
 
     # --- Data Processing and Plotting ---
@@ -95,8 +43,8 @@ def main():
     # 2. Memory Usage Plot
     fig2, ax2 = plt.subplots(figsize=(10, 6))
     for i, density in enumerate(OBSTACLE_DENSITIES):
-        rec_mems = [np.mean([run['memory'] for run in results[size][density]['recursive']]) for size in GRID_SIZES]
-        it_mems = [np.mean([run['memory'] for run in results[size][density]['iterative']]) for size in GRID_SIZES]
+        rec_mems = [np.mean([run['memory_kb'] for run in results[size][density]['recursive']]) for size in GRID_SIZES]
+        it_mems = [np.mean([run['memory_kb'] for run in results[size][density]['iterative']]) for size in GRID_SIZES]
 
         r = np.arange(len(GRID_SIZES))
         ax2.bar(r - bar_width/2 + i*bar_width, rec_mems, width=bar_width, label=f'Recursive {density*100}%')
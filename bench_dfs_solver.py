@@ -0,0 +1,205 @@
+# bench_dfs_solver.py
+
+import argparse
+import itertools
+import json
+import statistics
+import sys
+import time
+import types
+
+import matplotlib
+matplotlib.use('Agg') # Headless: the GUI benchmark renders off-screen
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from graph_model import Cell, GridGraph, create_graph_from_grid
+from dfs_solver import find_path_recursive, dfs_iterative, dfs_iterative_events, BACKTRACK
+from maze_generator import backtracker_maze, obstacle_cells
+from benchmark_store import git_revision, machine_info
+
+# Benchmark Configuration
+GRID_SIZES = [10, 100, 500, 2000]
+MAZE_SEED = 1234
+MIN_TIME = 0.2      # Seconds of repeated measurement per benchmark
+MAX_ROUNDS = 1000
+ANIMATION_FRAMES = 50
+
+def measure(func, min_time=MIN_TIME, max_rounds=MAX_ROUNDS):
+    """
+    Times func() repeatedly, pytest-benchmark style: one calibration call,
+    then enough rounds to fill min_time (at least one, at most max_rounds).
+
+    :return: Dictionary of min, max, mean, median, stddev (seconds) and rounds.
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    rounds = max(1, min(max_rounds, int(min_time / first) if first > 0 else max_rounds))
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'min': min(samples),
+        'max': max(samples),
+        'mean': statistics.mean(samples),
+        'median': statistics.median(samples),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'rounds': rounds,
+    }
+
+def _headless_visualizer(maze, start, goal):
+    """
+    Builds the minimal state DFSVisualizer.update_frame needs, on an Agg canvas,
+    with the frame artists excluded from the cached background as blitting does.
+    """
+    from gui import GridRaster
+    fig, ax = plt.subplots()
+    canvas = FigureCanvasAgg(fig)
+    raster = GridRaster(ax, maze, (start.row, start.col), (goal.row, goal.col))
+    for artist in raster.artists:
+        artist.set_animated(True)
+    canvas.draw()
+    return types.SimpleNamespace(fig=fig, ax=ax, canvas=canvas, background=canvas.copy_from_bbox(ax.bbox), raster=raster)
+
+def bench_cell_hashing(size, maze):
+    """Builds and probes a set of every cell of the grid."""
+    cells = [Cell(r, c) for r in range(size) for c in range(size)]
+    def run():
+        seen = set(cells)
+        return all(cell in seen for cell in cells)
+    return run
+
+def bench_create_graph_from_grid(size, maze):
+    obstacles = obstacle_cells(maze)
+    return lambda: create_graph_from_grid((size, size), obstacles)
+
+def bench_create_grid_graph(size, maze):
+    return lambda: GridGraph(maze)
+
+def bench_dfs_recursive(graph_type):
+    def factory(size, maze):
+        graph = _build(graph_type, size, maze)
+        return lambda: find_path_recursive(graph, Cell(0, 0), Cell(size - 1, size - 1))
+    return factory
+
+def bench_dfs_iterative(graph_type):
+    def factory(size, maze):
+        graph = _build(graph_type, size, maze)
+        return lambda: dfs_iterative(graph, Cell(0, 0), Cell(size - 1, size - 1))
+    return factory
+
+def bench_animate_update(size, maze):
+    """Renders the first ANIMATION_FRAMES blitted frames of a search animation."""
+    # Imported here so the solver benchmarks do not depend on Tk being importable
+    from gui import DFSVisualizer
+    start, goal = Cell(0, 0), Cell(size - 1, size - 1)
+    graph = GridGraph(maze)
+    path, _ = dfs_iterative(graph, start, goal, record_history=False)
+    state = _headless_visualizer(maze, start, goal)
+    def run():
+        events = (event for event in dfs_iterative_events(graph, start, goal) if event[2] != BACKTRACK)
+        for event in itertools.islice(events, ANIMATION_FRAMES):
+            # What FuncAnimation does per blitted frame
+            state.canvas.restore_region(state.background)
+            for artist in sorted(DFSVisualizer.update_frame(state, path, event), key=lambda a: a.get_zorder()):
+                state.ax.draw_artist(artist)
+            state.canvas.blit(state.ax.bbox)
+    return run
+
+def _build(graph_type, size, maze):
+    if graph_type == 'dict':
+        return create_graph_from_grid((size, size), obstacle_cells(maze))
+    return GridGraph(maze)
+
+# (name, factory, needs the legacy dict graph)
+BENCHMARKS = [
+    ('cell_hashing', bench_cell_hashing, False),
+    ('create_graph_from_grid', bench_create_graph_from_grid, True),
+    ('create_grid_graph', bench_create_grid_graph, False),
+    ('dfs_recursive[dict]', bench_dfs_recursive('dict'), True),
+    ('dfs_recursive[grid]', bench_dfs_recursive('grid'), False),
+    ('dfs_iterative[dict]', bench_dfs_iterative('dict'), True),
+    ('dfs_iterative[grid]', bench_dfs_iterative('grid'), False),
+    ('animate_update', bench_animate_update, False),
+]
+
+def run_suite(sizes, max_dict_size, selected=None, min_time=MIN_TIME):
+    """
+    Runs every benchmark on fixed-seed backtracker mazes of each size.
+
+    Benchmarks that build the legacy dict graph are skipped above
+    max_dict_size, where the dict alone needs gigabytes of memory.
+
+    :return: List of result dicts with name, size, stats (or skipped=True).
+    """
+    results = []
+    for size in sizes:
+        maze = backtracker_maze((size, size), seed=MAZE_SEED)
+        # Recursive DFS can go as deep as the number of cells
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), size * size + 1000))
+        for name, factory, needs_dict in BENCHMARKS:
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            entry = {'name': f"{name}[{size}x{size}]", 'group': name, 'params': {'size': size, 'seed': MAZE_SEED}}
+            if needs_dict and size > max_dict_size:
+                entry['skipped'] = True
+            else:
+                entry['stats'] = measure(factory(size, maze), min_time=min_time)
+            results.append(entry)
+            stats = entry.get('stats')
+            print(f"{entry['name']:<40} " + (f"median {stats['median'] * 1000:>12.3f} ms  ({stats['rounds']} rounds)"
+                                               if stats else "skipped"), file=sys.stderr)
+    return results
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Lists benchmarks whose median is more than `threshold` (relative) slower than in baseline.
+    """
+    baseline_medians = {entry['name']: entry['stats']['median'] for entry in baseline['benchmarks'] if 'stats' in entry}
+    slower = []
+    for entry in results:
+        before = baseline_medians.get(entry['name'])
+        if before and 'stats' in entry and entry['stats']['median'] > before * (1 + threshold):
+            slower.append((entry['name'], before, entry['stats']['median']))
+    return slower
+
+def parse_args(argv=None):
+    """Parses the command-line options of the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Micro and macro benchmarks for the DFS solver.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=GRID_SIZES, help="Square maze sizes.")
+    parser.add_argument('--max-dict-size', type=int, default=500, help="Largest size for dict-graph benchmarks.")
+    parser.add_argument('-k', dest='selected', action='append', help="Only run benchmarks whose name contains this text.")
+    parser.add_argument('--min-time', type=float, default=MIN_TIME, help="Seconds of measurement per benchmark.")
+    parser.add_argument('--json', metavar='PATH', help="Write results as JSON to PATH ('-' for stdout).")
+    parser.add_argument('--compare', metavar='BASELINE', help="Baseline JSON written by an earlier --json run.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Relative slowdown that fails --compare.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Runs the suite and exits with status 1 if --compare finds slowdowns.
+    """
+    args = parse_args(argv)
+    results = run_suite(args.sizes, args.max_dict_size, args.selected, args.min_time)
+    report = {'commit_info': {'revision': git_revision()}, 'machine_info': machine_info(), 'benchmarks': results}
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+    elif args.json:
+        with open(args.json, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            slower = compare_to_baseline(results, json.load(baseline_file), args.threshold)
+        for name, before, after in slower:
+            print(f"SLOWER {name}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+# benchmark_store.py
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from statistics import median
+
+def git_revision():
+    """
+    Returns the current git commit hash, suffixed with '-dirty' when tracked
+    files have uncommitted changes, or 'unknown' outside a git checkout.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        revision = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=here, capture_output=True,
+                                  text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD'], cwd=here).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return revision + ('-dirty' if dirty else '')
+
+def machine_info():
+    """Describes the hardware and interpreter the benchmarks ran on."""
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'system': platform.system(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+    }
+
+def machine_fingerprint(info=None):
+    """
+    Returns a short stable hash of machine_info(), used to compare only
+    results that were measured on the same kind of machine.
+    """
+    info = machine_info() if info is None else info
+    return hashlib.sha256(json.dumps(info, sort_keys=True).encode()).hexdigest()[:12]
+
+def append_results(path, sweep_results, graph_type='dict', revision=None, fingerprint=None):
+    """
+    Appends every trial of a sweep to a JSON lines file.
+
+    :param path: File to append to; created if missing.
+    :param sweep_results: Nested dict returned by performance_analyzer.run_sweep.
+    :param graph_type: Graph representation the sweep searched.
+    :param revision: Git revision to record; defaults to git_revision().
+    :param fingerprint: Machine fingerprint to record; defaults to machine_fingerprint().
+    :return: Number of records written.
+    """
+    revision = git_revision() if revision is None else revision
+    fingerprint = machine_fingerprint() if fingerprint is None else fingerprint
+    timestamp = time.time()
+    count = 0
+    with open(path, 'a') as results_file:
+        for (rows, cols), by_density in sweep_results.items():
+            for density, by_algorithm in by_density.items():
+                for algorithm, trials in by_algorithm.items():
+                    for run_index, trial in enumerate(trials):
+                        record = {
+                            'revision': revision,
+                            'machine': fingerprint,
+                            'timestamp': timestamp,
+                            'grid_size': f"{rows}x{cols}",
+                            'density': density,
+                            'algorithm': algorithm,
+                            'graph_type': graph_type,
+                            'run': run_index,
+                            **trial,
+                        }
+                        results_file.write(json.dumps(record) + "\n")
+                        count += 1
+    return count
+
+def load_results(path, revision=None, fingerprint=None):
+    """
+    Reads stored records, optionally keeping only one revision and/or machine.
+
+    A revision may be given as any prefix of the stored hash.
+    """
+    records = []
+    with open(path) as results_file:
+        for line in results_file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if revision is not None and not record['revision'].startswith(revision):
+                continue
+            if fingerprint is not None and record['machine'] != fingerprint:
+                continue
+            records.append(record)
+    return records
+
+def mann_whitney_greater(baseline, candidate):
+    """
+    One-sided Mann-Whitney U test that candidate values tend to be larger.
+
+    Uses the normal approximation with a tie correction, which needs no
+    third-party packages and makes no normality assumption about timings.
+
+    :return: p-value (1.0 when either sample is empty or all values tie).
+    """
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in baseline] + [(value, 1) for value in candidate])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1 # Average rank of the tied run
+        tied = end - start + 1
+        tie_term += tied ** 3 - tied
+        start = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 1)
+    u_statistic = rank_sum - n2 * (n2 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_statistic - n1 * n2 / 2) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare(baseline_records, candidate_records, metrics=('time', 'memory_kb'), alpha=0.05, min_change=0.05):
+    """
+    Flags configurations whose metrics got significantly worse.
+
+    Records are grouped by (grid_size, density, algorithm, graph_type). A
+    metric regresses when the candidate median exceeds the baseline median
+    by more than min_change (relative) and the one-sided Mann-Whitney test
+    gives p < alpha. Trials that found no path are ignored.
+
+    :return: List of dicts with key, metric, baseline/candidate medians, change and p_value,
+             sorted by configuration.
+    """
+    def group(records):
+        groups = {}
+        for record in records:
+            if record.get('path_found', True):
+                key = (record['grid_size'], record['density'], record['algorithm'], record['graph_type'])
+                groups.setdefault(key, []).append(record)
+        return groups
+
+    baseline_groups, candidate_groups = group(baseline_records), group(candidate_records)
+    regressions = []
+    for key in sorted(baseline_groups.keys() & candidate_groups.keys()):
+        for metric in metrics:
+            before = [record[metric] for record in baseline_groups[key] if metric in record]
+            after = [record[metric] for record in candidate_groups[key] if metric in record]
+            if not before or not after:
+                continue
+            before_median, after_median = median(before), median(after)
+            change = (after_median / before_median - 1) if before_median else 0.0
+            p_value = mann_whitney_greater(before, after)
+            if change > min_change and p_value < alpha:
+                regressions.append({
+                    'key': key,
+                    'metric': metric,
+                    'baseline': before_median,
+                    'candidate': after_median,
+                    'change': change,
+                    'p_value': p_value,
+                })
+    return regressions
+
+def parse_args(argv=None):
+    """Parses the command-line options of the results store."""
+    parser = argparse.ArgumentParser(description="Inspect and compare stored DFS benchmark results.")
+    parser.add_argument('--results', default='benchmark_results.jsonl', help="JSON lines results file.")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    subcommands.add_parser('list', help="List stored revisions and machines.")
+
+    compare_parser = subcommands.add_parser('compare', help="Flag regressions of a revision against a baseline.")
+    compare_parser.add_argument('baseline', help="Baseline revision (hash prefix).")
+    compare_parser.add_argument('candidate', nargs='?', default=None, help="Candidate revision (defaults to the working tree).")
+    compare_parser.add_argument('--alpha', type=float, default=0.05, help="Significance level.")
+    compare_parser.add_argument('--min-change', type=float, default=0.05, help="Minimum relative slowdown or growth to report.")
+    compare_parser.add_argument('--any-machine', action='store_true', help="Compare results from every machine.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Command-line entry point. 'compare' exits with status 1 when it finds
+    regressions, so it can gate merges.
+    """
+    args = parse_args(argv)
+    if args.command == 'list':
+        seen = {}
+        for record in load_results(args.results):
+            seen.setdefault((record['revision'], record['machine']), 0)
+            seen[(record['revision'], record['machine'])] += 1
+        for (revision, fingerprint), count in seen.items():
+            print(f"{revision:<48} machine {fingerprint}  {count} trials")
+        return 0
+
+    fingerprint = None if args.any_machine else machine_fingerprint()
+    candidate = git_revision() if args.candidate is None else args.candidate
+    baseline_records = load_results(args.results, args.baseline, fingerprint)
+    candidate_records = load_results(args.results, candidate, fingerprint)
+    if not baseline_records or not candidate_records:
+        print(f"No comparable results for baseline {args.baseline} and candidate {candidate}.")
+        return 2
+
+    regressions = compare(baseline_records, candidate_records, alpha=args.alpha, min_change=args.min_change)
+    if not regressions:
+        print(f"No significant regressions in {candidate} against {args.baseline}.")
+        return 0
+    print(f"{len(regressions)} regression(s) in {candidate} against {args.baseline}:")
+    for regression in regressions:
+        grid_size, density, algorithm, graph_type = regression['key']
+        print(f"  {grid_size:<10} {density*100:>5g}% {algorithm:<13} {graph_type:<6} {regression['metric']:<10} "
+              f"{regression['baseline']:.6g} -> {regression['candidate']:.6g} "
+              f"({regression['change']*100:+.1f}%, p={regression['p_value']:.4f})")
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# cluster_graph.py
+
+import numpy as np
+from graph_model import label_components
+from dfs_solver import dfs_iterative, is_rejected
+
+DEFAULT_CLUSTER_SIZE = 16
+
+class _RegionView:
+    """
+    Adjacency view of a grid graph restricted to one region, so a search
+    started inside it never leaves it.
+    """
+    def __init__(self, graph, labels, region):
+        self.graph = graph
+        self.labels = labels
+        self.cols = graph.cols
+        self.region = region
+
+    def get(self, cell, default=None):
+        neighbors = self.graph.get(cell)
+        if neighbors is None:
+            return default
+        labels, cols, region = self.labels, self.cols, self.region
+        return [neighbor for neighbor in neighbors if labels[neighbor[0] * cols + neighbor[1]] == region]
+
+class _AbstractView:
+    """
+    Adjacency view of the region graph that lists the neighbors whose
+    entrance lies closest (in grid steps) to the goal first.
+    """
+    def __init__(self, clusters, goal_node):
+        self.clusters = clusters
+        self.goal = goal_node
+
+    def get(self, region, default=None):
+        neighbors = self.clusters.adjacency.get(region)
+        if neighbors is None:
+            return default
+        entrances, cols = self.clusters.entrances, self.clusters.cols
+        goal_row, goal_col = self.goal
+        def distance_to_goal(neighbor):
+            row, col = divmod(entrances[region, neighbor][1], cols)
+            return abs(row - goal_row) + abs(col - goal_col)
+        return sorted(neighbors, key=distance_to_goal)
+
+class ClusterGraph:
+    """
+    Two-level index over a GridGraph for long-range path queries.
+
+    The grid is cut into square clusters of cluster_size cells. Each
+    4-connected open area inside one cluster is a region; regions are the
+    nodes of a small abstract graph, linked where an open cell of one
+    region borders an open cell of a region in the next cluster (one
+    entrance is kept per pair of regions). A query first runs DFS on the
+    abstract graph, then refines it region by region with dfs_iterative,
+    each run confined to its region. Since every region is connected and
+    the regions on the abstract path are distinct, the refined path is a
+    simple path whenever the abstract search succeeds.
+
+    The index is rebuilt automatically on the first query after the
+    graph's obstacles change.
+    """
+    def __init__(self, graph, cluster_size=DEFAULT_CLUSTER_SIZE):
+        """
+        :param graph: GridGraph (or subclass) to index.
+        :param cluster_size: Side of the square clusters, in cells.
+        """
+        if cluster_size < 1:
+            raise ValueError("Cluster size must be positive.")
+        self.graph = graph
+        self.rows, self.cols = graph.rows, graph.cols
+        self.cluster_size = cluster_size
+        self.build()
+
+    def build(self):
+        """Labels the regions and collects the entrances between them."""
+        graph, size = self.graph, self.cluster_size
+        rows, cols = self.rows, self.cols
+        mask = graph.mask
+        # Labeling with a line of walls between neighboring clusters labels
+        # every cluster's regions separately in one vectorized pass
+        row_map = np.arange(rows) + np.arange(rows) // size
+        col_map = np.arange(cols) + np.arange(cols) // size
+        spread = np.ones((row_map[-1] + 1, col_map[-1] + 1), dtype=np.uint8)
+        spread[np.ix_(row_map, col_map)] = mask
+        labels = label_components(spread)[np.ix_(row_map, col_map)]
+
+        index = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+        boundaries = []
+        # Horizontal crossings at the right edge of every cluster column, then vertical ones
+        left = np.arange(size - 1, cols - 1, size)
+        boundaries.append((labels[:, left], labels[:, left + 1], index[:, left], index[:, left + 1]))
+        top = np.arange(size - 1, rows - 1, size)
+        boundaries.append((labels[top, :], labels[top + 1, :], index[top, :], index[top + 1, :]))
+        region_a = np.concatenate([b[0].reshape(-1) for b in boundaries])
+        region_b = np.concatenate([b[1].reshape(-1) for b in boundaries])
+        cell_a = np.concatenate([b[2].reshape(-1) for b in boundaries])
+        cell_b = np.concatenate([b[3].reshape(-1) for b in boundaries])
+        crossing = (region_a >= 0) & (region_b >= 0)
+        pairs = np.stack([region_a[crossing], region_b[crossing]], axis=1)
+        pairs, first = np.unique(pairs, axis=0, return_index=True)
+        cell_a, cell_b = cell_a[crossing][first], cell_b[crossing][first]
+
+        self.labels = memoryview(labels.astype(np.int64).reshape(-1))
+        self.adjacency = {region: [] for region in np.unique(labels[labels >= 0]).tolist()}
+        self.entrances = {} # (from region, to region) -> (exit cell index, entry cell index)
+        for (a, b), exit_index, entry_index in zip(pairs.tolist(), cell_a.tolist(), cell_b.tolist()):
+            self.adjacency[a].append(b)
+            self.adjacency[b].append(a)
+            self.entrances[a, b] = (exit_index, entry_index)
+            self.entrances[b, a] = (entry_index, exit_index)
+        self.version = graph.version
+
+    def region_of(self, cell):
+        """Returns the region label of an open Cell, or -1 for obstacles."""
+        return self.labels[cell.row * self.cols + cell.col]
+
+    def find_path(self, start_node, goal_node, components=None, record_history=True):
+        """
+        Finds a path with the abstract search followed by per-region refinement.
+
+        :param start_node: Starting Cell.
+        :param goal_node: Target Cell.
+        :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+        :param record_history: If False, no history is kept and None is returned in its place.
+        :return: Tuple of (path, history, max_depth) as for find_path_recursive. History
+                 holds the nodes visited while refining; max_depth is the goal's depth on the path.
+        """
+        history = [] if record_history else None
+        if is_rejected(components, start_node, goal_node):
+            return None, history, 0
+        if start_node == goal_node:
+            # Found at once, wall or not, as in the flat engines
+            return [start_node], [start_node] if record_history else None, 0
+        if self.graph.get(start_node) is None or self.graph.get(goal_node) is None:
+            return None, history, 0
+        if self.version != self.graph.version:
+            self.build()
+        start_region, goal_region = self.region_of(start_node), self.region_of(goal_node)
+        if start_region < 0 or goal_region < 0:
+            return None, history, 0
+
+        regions, _ = dfs_iterative(_AbstractView(self, goal_node), start_region, goal_region, record_history=False)
+        if regions is None:
+            return None, history, 0
+
+        cell_at = self.graph.cell_at
+        path = []
+        entry = start_node
+        for region, next_region in zip(regions, regions[1:] + [None]):
+            if next_region is None:
+                exit_cell, next_entry = goal_node, None
+            else:
+                exit_index, entry_index = self.entrances[region, next_region]
+                exit_cell, next_entry = cell_at(exit_index), cell_at(entry_index)
+            segment, segment_history = dfs_iterative(_RegionView(self.graph, self.labels, region), entry, exit_cell,
+                                                     record_history=record_history)
+            path.extend(segment)
+            if history is not None:
+                history.extend(segment_history)
+            entry = next_entry
+        return path, history, len(path) - 1
+
+def find_path_hierarchical(graph, start_node, goal_node, components=None, record_history=True, clusters=None):
+    """
+    Convenience wrapper around ClusterGraph.find_path.
+
+    :param graph: GridGraph.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+    :param record_history: If False, no history is kept and None is returned in its place.
+    :param clusters: Prebuilt ClusterGraph of `graph`, to reuse across queries; built when omitted.
+    :return: Tuple of (path, history, max_depth), as for find_path_recursive.
+    """
+    if clusters is None:
+        clusters = ClusterGraph(graph)
+    return clusters.find_path(start_node, goal_node, components, record_history)
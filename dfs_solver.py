@@ -1,24 +1,71 @@
 # dfs_solver.py
 
-# Assuming Cell class is imported from graph_model.py or defined identically here
-from graph_model import Cell
+from array import array
+from collections import defaultdict
+import numpy as np
 
-def dfs_recursive(graph, current_node, goal_node, visited, path, history, depth=0):
+from graph_model import GridGraph
+
+# Kinds of search events yielded by the streaming searches as (node, depth, kind) tuples
+ENTER = 'enter'         # node was visited for the first time
+BACKTRACK = 'backtrack' # search left node for good
+GOAL = 'goal'           # node is the goal; follows its ENTER and ends the stream
+
+class SearchCancelled(Exception):
+    """Raised inside a search whose CancellationToken has been cancelled."""
+
+class CancellationToken:
+    """
+    Cooperative cancellation and progress reporting for a search that runs
+    in another thread.
+
+    Searches given a token call check() once per visited node: it records
+    how far the search got and raises SearchCancelled once cancel() has been
+    called. Attribute reads and writes are atomic under the GIL, so the
+    watching thread can poll nodes_visited and depth without locking.
+    """
+    def __init__(self):
+        self.cancelled = False
+        self.nodes_visited = 0
+        self.depth = 0
+
+    def cancel(self):
+        """Asks the search to stop at its next node."""
+        self.cancelled = True
+
+    def check(self, nodes_visited, depth):
+        """
+        Records progress and stops the search if it was cancelled.
+
+        :param nodes_visited: Nodes visited so far.
+        :param depth: Depth of the node just visited.
+        :raises SearchCancelled: If cancel() has been called.
+        """
+        self.nodes_visited = nodes_visited
+        self.depth = depth
+        if self.cancelled:
+            raise SearchCancelled(f"Search cancelled after {nodes_visited} nodes")
+
+def dfs_recursive(graph, current_node, goal_node, visited, path, history, depth=0, token=None):
     """
     Recursive Depth-First Search (DFS) to find a path and record history.
 
     :param graph: Adjacency list.
     :param current_node: Current Cell.
     :param goal_node: Target Cell.
-    :param visited: Set of visited Cells (for cycle detection).
+    :param visited: Set of visited Cells, or a CellBitmap (for cycle detection).
     :param path: List tracking current path from start to current_node.
-    :param history: List to record the sequence of visited nodes.
+    :param history: List to record the sequence of visited nodes, or None to skip recording.
     :param depth: Current recursion depth.
+    :param token: Optional CancellationToken checked at every node.
     :return: Tuple of (found, max_depth).
     """
     visited.add(current_node)
+    if token is not None:
+        token.check(token.nodes_visited + 1, depth)
     path.append(current_node)
-    history.append(current_node)
+    if history is not None:
+        history.append(current_node)
     max_depth = depth
 
     if current_node == goal_node:
@@ -26,7 +73,7 @@ def dfs_recursive(graph, current_node, goal_node, visited, path, history, depth=
 
     for neighbor in graph.get(current_node, []):
         if neighbor not in visited:
-            found, new_depth = dfs_recursive(graph, neighbor, goal_node, visited, path, history, depth + 1)
+            found, new_depth = dfs_recursive(graph, neighbor, goal_node, visited, path, history, depth + 1, token)
             max_depth = max(max_depth, new_depth)
             if found:
                 return True, max_depth
@@ -34,47 +81,646 @@ def dfs_recursive(graph, current_node, goal_node, visited, path, history, depth=
     path.pop() # Backtrack
     return False, max_depth
 
-def find_path_recursive(graph, start_node, goal_node):
+def is_rejected(components, start_node, goal_node):
+    """
+    Checks whether a component index proves there is no path, so the search can be skipped.
+
+    :param components: ComponentIndex, or None to never reject.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :return: True if start and goal are distinct and in different components.
+    """
+    if components is None or start_node == goal_node:
+        return False
+    return not components.connected(start_node, goal_node)
+
+def find_path_recursive(graph, start_node, goal_node, components=None, record_history=True, token=None, visited=None):
     """
     Wrapper for recursive DFS.
 
     :param graph: Adjacency list.
     :param start_node: Starting Cell.
     :param goal_node: Target Cell.
+    :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+    :param record_history: If False, no history is kept and None is returned in its place.
+    :param token: Optional CancellationToken checked at every node.
+    :param visited: Optional empty set-like visited structure, such as a CellBitmap
+                    reused across searches on a GridGraph; a new set by default.
     :return: Tuple of (path, history, max_depth). Path is a list of Cells, or None.
+    :raises SearchCancelled: If the token is cancelled during the search.
     """
-    visited = set()
+    if is_rejected(components, start_node, goal_node):
+        return None, [] if record_history else None, 0
+    if visited is None:
+        visited = set()
     path = []
-    history = []
-    found, max_depth = dfs_recursive(graph, start_node, goal_node, visited, path, history)
+    history = [] if record_history else None
+    found, max_depth = dfs_recursive(graph, start_node, goal_node, visited, path, history, token=token)
     if found:
         return path, history, max_depth
     return None, history, max_depth
 
-def dfs_iterative(graph, start_node, goal_node):
+def dfs_events(graph, start_node, goal_node):
     """
-    Iterative Depth-First Search (DFS) using an explicit stack.
+    Streams the events of a DFS in the exact order of dfs_recursive.
+
+    Nothing is materialized beyond the current branch and the visited set,
+    so a consumer that only watches the events (an animation, a counter)
+    never holds the whole history.
 
     :param graph: Adjacency list.
     :param start_node: Starting Cell.
     :param goal_node: Target Cell.
-    :return: Tuple of (path, history). Path is a list of Cells, or None. History is a list of visited nodes.
+    :return: Generator of (node, depth, kind) tuples, kind being ENTER, BACKTRACK or GOAL.
+             Depth is the node's distance from start_node along the branch.
     """
-    stack = [(start_node, [start_node])] # (node, current_path)
-    visited = {start_node}
-    history = []
+    yield start_node, 0, ENTER
+    yield from resume_dfs_events(graph, goal_node, [start_node], {start_node})
+
+def resume_dfs_events(graph, goal_node, path, visited):
+    """
+    Explicit-stack DFS event stream that continues from an existing branch.
+
+    Each frame is an iterator over a node's neighbors, so the search never
+    touches the C stack or the interpreter recursion limit. Every node on
+    `path` must already be in `visited`; they are not entered again, and
+    backtracking past them resumes their neighbor scans. When the GOAL event
+    is yielded, `path` holds the branch from the first node to the goal.
+
+    :param graph: Adjacency list.
+    :param goal_node: Target Cell.
+    :param path: Current branch from the start node (modified in place).
+    :param visited: Set of visited Cells, or a CellBitmap (modified in place).
+    :return: Generator of (node, depth, kind) tuples, as for dfs_events.
+    """
+    if path[-1] == goal_node:
+        yield goal_node, len(path) - 1, GOAL
+        return
+
+    frames = [iter(graph.get(node, [])) for node in path]
+    while frames:
+        for neighbor in frames[-1]:
+            if neighbor not in visited:
+                break
+        else:
+            frames.pop()
+            node = path.pop() # Backtrack
+            yield node, len(path), BACKTRACK
+            continue
+
+        visited.add(neighbor)
+        path.append(neighbor)
+        depth = len(path) - 1
+        yield neighbor, depth, ENTER
+
+        if neighbor == goal_node:
+            yield neighbor, depth, GOAL
+            return
+        frames.append(iter(graph.get(neighbor, [])))
+
+def resume_dfs(graph, goal_node, path, visited, history, token=None):
+    """
+    Runs resume_dfs_events to completion, recording the entered nodes.
+
+    :param graph: Adjacency list.
+    :param goal_node: Target Cell.
+    :param path: Current branch from the start node (modified in place).
+    :param visited: Set of visited Cells, or a CellBitmap (modified in place).
+    :param history: List to record the sequence of visited nodes, or None to skip recording.
+    :param token: Optional CancellationToken checked at every node.
+    :return: Tuple of (found, max_depth).
+    """
+    max_depth = len(path) - 1
+    for node, depth, kind in resume_dfs_events(graph, goal_node, path, visited):
+        if kind == ENTER:
+            if token is not None:
+                token.check(token.nodes_visited + 1, depth)
+            if history is not None:
+                history.append(node)
+            if depth > max_depth:
+                max_depth = depth
+        elif kind == GOAL:
+            return True, max_depth
+    return False, max_depth
+
+def find_path_explicit_stack(graph, start_node, goal_node, components=None, record_history=True, token=None,
+                             visited=None):
+    """
+    Stack-safe equivalent of find_path_recursive.
+
+    Returns the same path, history and max_depth as the recursive version,
+    but works on grids of any size without raising the recursion limit.
+
+    :param graph: Adjacency list.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+    :param record_history: If False, no history is kept and None is returned in its place.
+    :param token: Optional CancellationToken checked at every node.
+    :param visited: Optional empty set-like visited structure, as for find_path_recursive.
+    :return: Tuple of (path, history, max_depth). Path is a list of Cells, or None.
+    :raises SearchCancelled: If the token is cancelled during the search.
+    """
+    if is_rejected(components, start_node, goal_node):
+        return None, [] if record_history else None, 0
+    if token is not None:
+        token.check(1, 0)
+    if visited is None:
+        visited = set()
+    visited.add(start_node)
+    path = [start_node]
+    history = [start_node] if record_history else None
+    found, max_depth = resume_dfs(graph, goal_node, path, visited, history, token)
+    if found:
+        return path, history, max_depth
+    return None, history, max_depth
+
+class _GuidedView:
+    """
+    Adjacency view of a GridGraph that drops cells without a distance and
+    lists the remaining neighbors nearest to the goal first.
+    """
+    def __init__(self, graph, distances):
+        self.graph = graph
+        self.cols = graph.cols
+        self.distances = memoryview(np.ascontiguousarray(distances, dtype=np.int32).reshape(-1))
+
+    def get(self, cell, default=None):
+        neighbors = self.graph.get(cell)
+        if neighbors is None:
+            return default
+        distances, cols = self.distances, self.cols
+        reachable = [neighbor for neighbor in neighbors if distances[neighbor[0] * cols + neighbor[1]] >= 0]
+        reachable.sort(key=lambda neighbor: distances[neighbor[0] * cols + neighbor[1]])
+        return reachable
+
+def find_path_guided(graph, start_node, goal_node, components=None, record_history=True, token=None,
+                     distances=None, visited=None):
+    """
+    Explicit-stack DFS that tries the neighbors closest to the goal first.
+
+    `distances` serves as a validity oracle and a heuristic: a start
+    without a distance is rejected without searching, cells that cannot
+    reach the goal are never entered, and the rest are explored nearest
+    first. With the exact field (the default) the search walks a shortest
+    path and never backtracks, so the history equals the path. A start
+    equal to the goal is found at once, wall or not, as in the other engines.
+
+    :param graph: GridGraph.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+    :param record_history: If False, no history is kept and None is returned in its place.
+    :param token: Optional CancellationToken checked at every node.
+    :param distances: Optional distance field towards goal_node, as returned by
+                      graph.distance_field([goal_node]); computed when omitted.
+    :param visited: Optional empty set-like visited structure, such as a CellBitmap.
+    :return: Tuple of (path, history, max_depth). Path is a list of Cells, or None.
+    :raises SearchCancelled: If the token is cancelled during the search.
+    """
+    if is_rejected(components, start_node, goal_node):
+        return None, [] if record_history else None, 0
+    if start_node == goal_node:
+        return find_path_explicit_stack(graph, start_node, goal_node, record_history=record_history, token=token,
+                                        visited=visited)
+    if graph.get(start_node) is None or graph.get(goal_node) is None:
+        return None, [] if record_history else None, 0
+    if distances is None:
+        distances = graph.distance_field([goal_node])
+    if distances[start_node[0], start_node[1]] < 0:
+        return None, [] if record_history else None, 0
+    return find_path_explicit_stack(_GuidedView(graph, distances), start_node, goal_node,
+                                    record_history=record_history, token=token, visited=visited)
+
+def reconstruct_path(parent, goal_node):
+    """
+    Rebuilds a path by following predecessor links back from the goal.
+
+    :param parent: Dict mapping each discovered node to its predecessor (start maps to None).
+    :param goal_node: Node the path should end at.
+    :return: List of nodes from start to goal_node.
+    """
+    path = []
+    node = goal_node
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+def dfs_iterative_events(graph, start_node, goal_node, parent=None, visited=None, branch=None):
+    """
+    Streams the events of the stack-of-nodes DFS used by dfs_iterative.
+
+    The stack holds bare nodes (plus their depths); each discovered node
+    records its predecessor. A node popped at depth d hangs off the node
+    entered last at depth d - 1, so the current branch is kept by trimming
+    it to d nodes, which yields the BACKTRACK events.
+
+    :param graph: Adjacency list.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param parent: Optional dict to fill with each discovered node's predecessor
+                   (start maps to None); doubles as the visited set unless `visited` is given.
+    :param visited: Optional empty set-like visited structure, such as a CellBitmap.
+                    With it, predecessors are only recorded if `parent` is passed too.
+    :param branch: Optional empty list to hold the current branch; when the GOAL
+                   event is yielded it is the path from start_node to the goal.
+    :return: Generator of (node, depth, kind) tuples, as for dfs_events.
+    """
+    if visited is None:
+        if parent is None:
+            parent = {}
+        visited = parent
+    else:
+        visited.add(start_node)
+    if parent is not None:
+        parent[start_node] = None
+    stack = [start_node]
+    depths = [0]
+    if branch is None:
+        branch = []
 
     while stack:
-        current_node, path = stack.pop()
-        history.append(current_node)
+        current_node = stack.pop()
+        depth = depths.pop()
+        while len(branch) > depth:
+            node = branch.pop()
+            yield node, len(branch), BACKTRACK
+        branch.append(current_node)
+        yield current_node, depth, ENTER
 
         if current_node == goal_node:
-            return path, history
+            yield current_node, depth, GOAL
+            return
 
         for neighbor in reversed(graph.get(current_node, [])):
             if neighbor not in visited:
-                visited.add(neighbor)
-                new_path = path + [neighbor]
-                stack.append((neighbor, new_path))
-    
+                if parent is not None:
+                    parent[neighbor] = current_node
+                if visited is not parent:
+                    visited.add(neighbor)
+                stack.append(neighbor)
+                depths.append(depth + 1)
+
+    while branch:
+        node = branch.pop()
+        yield node, len(branch), BACKTRACK
+
+def dfs_iterative_tree(graph, start_node, goal_node, record_history=True, token=None, visited=None):
+    """
+    Search phase of dfs_iterative: explores without building the path.
+
+    :param graph: Adjacency list.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param record_history: If False, no history is kept and None is returned in its place.
+    :param token: Optional CancellationToken checked at every node.
+    :param visited: Optional empty set-like visited structure, such as a CellBitmap;
+                    the parent dict is still filled.
+    :return: Tuple of (found, parent, history). Pass parent to reconstruct_path to get the path.
+    """
+    parent = {}
+    history = [] if record_history else None
+    expanded = 0
+    for node, depth, kind in dfs_iterative_events(graph, start_node, goal_node, parent, visited):
+        if kind == ENTER:
+            if token is not None:
+                expanded += 1
+                token.check(expanded, depth)
+            if history is not None:
+                history.append(node)
+        elif kind == GOAL:
+            return True, parent, history
+    return False, parent, history
+
+def dfs_iterative(graph, start_node, goal_node, components=None, record_history=True, token=None, visited=None):
+    """
+    Iterative Depth-First Search (DFS) using an explicit stack.
+
+    The stack holds bare nodes; each discovered node records its predecessor,
+    and the path is rebuilt once when the goal is reached. Given a `visited`
+    structure, no predecessors are kept at all: the path is the branch the
+    event stream maintains anyway.
+
+    :param graph: Adjacency list.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+    :param record_history: If False, no history is kept and None is returned in its place.
+    :param token: Optional CancellationToken checked at every node.
+    :param visited: Optional empty set-like visited structure, such as a CellBitmap
+                    reused across searches on a GridGraph.
+    :return: Tuple of (path, history). Path is a list of Cells, or None. History is a list of visited nodes.
+    :raises SearchCancelled: If the token is cancelled during the search.
+    """
+    if is_rejected(components, start_node, goal_node):
+        return None, [] if record_history else None
+    if visited is not None:
+        branch = []
+        history = [] if record_history else None
+        for node, depth, kind in dfs_iterative_events(graph, start_node, goal_node, visited=visited, branch=branch):
+            if kind == ENTER:
+                if token is not None:
+                    token.check(token.nodes_visited + 1, depth)
+                if history is not None:
+                    history.append(node)
+            elif kind == GOAL:
+                return branch, history
+        return None, history
+    found, parent, history = dfs_iterative_tree(graph, start_node, goal_node, record_history, token)
+    if found:
+        return reconstruct_path(parent, goal_node), history
     return None, history
+
+def dfs_bidirectional(graph, start_node, goal_node, components=None):
+    """
+    Bidirectional DFS that grows one search from each end until they meet.
+
+    The two explicit stacks take turns expanding one node each. As soon as
+    one side discovers a node already discovered by the other, the two
+    predecessor chains are joined into a path. Assumes undirected edges, as
+    produced by create_graph_from_grid and GridGraph.
+
+    :param graph: Adjacency list.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+    :return: Tuple of (path, history). History interleaves the nodes expanded by both sides.
+    """
+    if is_rejected(components, start_node, goal_node):
+        return None, []
+    if start_node == goal_node:
+        return [start_node], [start_node]
+
+    forward_stack, forward_parent = [start_node], {start_node: None}
+    backward_stack, backward_parent = [goal_node], {goal_node: None}
+    sides = ((forward_stack, forward_parent, backward_parent, True),
+             (backward_stack, backward_parent, forward_parent, False))
+    history = []
+
+    while forward_stack and backward_stack:
+        for stack, parent, other_parent, is_forward in sides:
+            current_node = stack.pop()
+            history.append(current_node)
+            for neighbor in reversed(graph.get(current_node, [])):
+                if neighbor in other_parent:
+                    # Frontiers met on the edge current_node - neighbor
+                    near, far = (current_node, neighbor) if is_forward else (neighbor, current_node)
+                    path = reconstruct_path(forward_parent, near)
+                    path.extend(reversed(reconstruct_path(backward_parent, far)))
+                    return path, history
+                if neighbor not in parent:
+                    parent[neighbor] = current_node
+                    stack.append(neighbor)
+            if not stack:
+                break # This side exhausted its component without meeting the other
+
+    return None, history
+
+def run_search(graph, start_node, goal_node, algorithm, components=None, visited=None):
+    """
+    Runs one of the DFS variants by name with a uniform return value.
+
+    :param graph: Adjacency list.
+    :param start_node: Starting Cell.
+    :param goal_node: Target Cell.
+    :param algorithm: One of 'recursive', 'explicit', 'iterative', 'bidirectional' or
+                      'guided' (GridGraph only).
+    :param components: Optional ComponentIndex used to reject unreachable goals without searching.
+    :param visited: Optional empty set-like visited structure for the single-ended searches;
+                    the bidirectional search keeps its own predecessor dicts.
+    :return: Tuple of (path, history, max_depth). max_depth is 0 for the iterative searches.
+    """
+    if algorithm == 'recursive':
+        return find_path_recursive(graph, start_node, goal_node, components, visited=visited)
+    if algorithm == 'explicit':
+        return find_path_explicit_stack(graph, start_node, goal_node, components, visited=visited)
+    if algorithm == 'iterative':
+        path, history = dfs_iterative(graph, start_node, goal_node, components, visited=visited)
+        return path, history, 0
+    if algorithm == 'bidirectional':
+        path, history = dfs_bidirectional(graph, start_node, goal_node, components)
+        return path, history, 0
+    if algorithm == 'guided':
+        return find_path_guided(graph, start_node, goal_node, components, visited=visited)
+    raise ValueError(f"Unknown DFS algorithm: {algorithm}")
+
+class SearchWorkspace:
+    """
+    Reusable visited/parent buffers for running many searches on one graph.
+
+    A node counts as visited only when its stamp equals the current
+    generation, so starting a new query is a counter increment instead of
+    clearing or reallocating the buffers. GridGraph inputs use flat typed
+    arrays over cell indices; legacy dict graphs use dicts keyed by Cell.
+    """
+    def __init__(self, graph, components=None):
+        """
+        :param graph: Adjacency list or GridGraph the queries will run on.
+        :param components: Optional ComponentIndex used to skip unreachable queries.
+        """
+        self.graph = graph
+        self.components = components
+        self.generation = 0
+        self.last_expanded = 0
+        if isinstance(graph, GridGraph):
+            self.stamp = array('I', bytes(4 * len(graph)))
+            self.parent = array('q', bytes(8 * len(graph)))
+            self._neighbors = graph.neighbor_indices
+        else:
+            self.stamp = defaultdict(int)
+            self.parent = {}
+            self._neighbors = lambda node: graph.get(node, [])
+
+    def _key(self, cell):
+        """Maps a Cell to its buffer key (flat index for grids, the Cell otherwise)."""
+        if isinstance(self.graph, GridGraph):
+            return self.graph.index_of(cell)
+        return cell
+
+    def _node(self, key):
+        """Maps a buffer key back to a Cell."""
+        if isinstance(self.graph, GridGraph):
+            return self.graph.cell_at(key)
+        return key
+
+    def is_open(self, cell):
+        """Checks whether a Cell can be entered at all (inside the grid and not a wall)."""
+        if isinstance(self.graph, GridGraph):
+            return cell in self.graph and not self.graph.is_blocked(cell)
+        return bool(self.graph.get(cell))
+
+    def _next_generation(self):
+        """Starts a new query, wiping the stamps only when the counter wraps."""
+        self.generation += 1
+        if isinstance(self.stamp, array) and self.generation >= 2 ** 32:
+            self.stamp = array('I', bytes(4 * len(self.stamp)))
+            self.generation = 1
+        return self.generation
+
+    def find_path(self, start_node, goal_node):
+        """
+        Iterative DFS from start_node to goal_node using the shared buffers.
+
+        Explores nodes in the same order as dfs_iterative but records no history.
+        Queries whose endpoints are walls, outside the graph, or in different
+        components (when an index is attached) return None without searching.
+
+        :param start_node: Starting Cell.
+        :param goal_node: Target Cell.
+        :return: Path as a list of Cells, or None.
+        """
+        self.last_expanded = 0
+        if start_node == goal_node:
+            return [start_node]
+        if not (self.is_open(start_node) and self.is_open(goal_node)):
+            return None
+        if is_rejected(self.components, start_node, goal_node):
+            return None
+
+        generation = self._next_generation()
+        stamp, parent, neighbors = self.stamp, self.parent, self._neighbors
+        start, goal = self._key(start_node), self._key(goal_node)
+        stamp[start] = generation
+        stack = [start]
+        expanded = 0
+
+        while stack:
+            current = stack.pop()
+            expanded += 1
+            if current == goal:
+                self.last_expanded = expanded
+                return self._reconstruct(start, goal)
+            for neighbor in reversed(neighbors(current)):
+                if stamp[neighbor] != generation:
+                    stamp[neighbor] = generation
+                    parent[neighbor] = current
+                    stack.append(neighbor)
+
+        self.last_expanded = expanded
+        return None
+
+    def _reconstruct(self, start, goal):
+        """Follows parent links from goal back to start and converts them to Cells."""
+        keys = [goal]
+        while keys[-1] != start:
+            keys.append(self.parent[keys[-1]])
+        return [self._node(key) for key in reversed(keys)]
+
+def solve_batch(graph, queries, workspace=None, components=None):
+    """
+    Answers many (start, goal) queries against one built graph.
+
+    Results are yielded one at a time, so memory stays flat no matter how
+    many queries are streamed in. All queries share one SearchWorkspace.
+
+    :param graph: Adjacency list or GridGraph.
+    :param queries: Iterable of (start_cell, goal_cell) pairs.
+    :param workspace: Optional SearchWorkspace to reuse across batches.
+    :param components: Optional ComponentIndex for a new workspace to reject unreachable pairs.
+    :return: Generator of (start, goal, path) tuples. Path is a list of Cells, or None.
+    """
+    if workspace is None:
+        workspace = SearchWorkspace(graph, components)
+    for start_node, goal_node in queries:
+        yield start_node, goal_node, workspace.find_path(start_node, goal_node)
+
+class IncrementalSolver:
+    """
+    Re-solves one (start, goal) query on a GridGraph as obstacles change.
+
+    Searches in recursive order (see resume_dfs) and keeps the history of the
+    last solve, which encodes the whole DFS tree: the parent of any visited
+    cell is the latest earlier history entry adjacent to it. An edit can only
+    change the search from the first moment it touches the edited cell, so
+    the solver rewinds to that moment and resumes from the branch that was
+    active there. The result is identical to a fresh find_path_explicit_stack run.
+    """
+    def __init__(self, graph, start_node, goal_node, components=None):
+        """
+        :param graph: GridGraph to search; edits should go through this solver.
+        :param start_node: Starting Cell.
+        :param goal_node: Target Cell.
+        :param components: Optional ComponentIndex of the graph, used to skip hopeless searches.
+        """
+        self.graph = graph
+        self.start_node = start_node
+        self.goal_node = goal_node
+        self.components = components
+        self.path = None
+        self.history = []
+
+    def solve(self):
+        """
+        Runs a full search from the start node.
+
+        :return: Tuple of (path, history). Path is a list of Cells, or None.
+        """
+        self.history = []
+        self.path = None
+        if is_rejected(self.components, self.start_node, self.goal_node):
+            return self.path, self.history
+        self.history.append(self.start_node)
+        return self._resume([self.start_node], {self.start_node})
+
+    def add_obstacle(self, cell):
+        """
+        Adds a wall and repairs the previous result.
+
+        If the search never entered the cell nothing changes; otherwise it
+        resumes from the branch that led to the cell, keeping everything
+        explored before it.
+
+        :param cell: Cell to block.
+        :return: Tuple of (path, history). Path is a list of Cells, or None.
+        """
+        if not self.graph.add_obstacle(cell) or cell not in self.history:
+            return self.path, self.history
+        entered = self.history.index(cell)
+        if entered == 0 or is_rejected(self.components, self.start_node, self.goal_node):
+            return self.solve()
+        branch = self._branch_at(entered)[:-1]
+        self.history = self.history[:entered]
+        return self._resume(branch, set(self.history))
+
+    def remove_obstacle(self, cell):
+        """
+        Removes a wall and repairs the previous result.
+
+        The search is rewound to the first visit of a neighbor of the opened
+        cell, the earliest point where the new cell could be discovered.
+
+        :param cell: Cell to open.
+        :return: Tuple of (path, history). Path is a list of Cells, or None.
+        """
+        if not self.graph.remove_obstacle(cell):
+            return self.path, self.history
+        if cell == self.start_node or not self.history:
+            return self.solve() # Nothing to rewind to
+        neighbors = set(self.graph.neighbors(cell))
+        first_seen = next((i for i, node in enumerate(self.history) if node in neighbors), None)
+        if first_seen is None:
+            return self.path, self.history # The search never got next to the cell
+        branch = self._branch_at(first_seen)
+        self.history = self.history[:first_seen + 1]
+        return self._resume(branch, set(self.history))
+
+    def _branch_at(self, position):
+        """
+        Rebuilds the DFS branch (start to history[position]) that was active
+        when history[position] was entered.
+        """
+        branch = [self.history[position]]
+        for index in range(position - 1, -1, -1):
+            node, child = self.history[index], branch[-1]
+            if abs(node.row - child.row) + abs(node.col - child.col) == 1:
+                branch.append(node)
+        branch.reverse()
+        return branch
+
+    def _resume(self, path, visited):
+        """Continues the search from the given branch and stores the result."""
+        found, _ = resume_dfs(self.graph, self.goal_node, path, visited, self.history)
+        self.path = path if found else None
+        return self.path, self.history
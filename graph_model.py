@@ -1,24 +1,23 @@
 # graph_model.py
 
-class Cell:
-    """Represents a single cell (vertex) in the grid-based maze."""
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-
-    def __hash__(self):
-        """Enables Cell objects to be used in sets and as dictionary keys."""
-        return hash((self.row, self.col))
-
-    def __eq__(self, other):
-        """Defines equality for Cell objects based on coordinates."""
-        if not isinstance(other, Cell):
-            return NotImplemented
-        return self.row == other.row and self.col == other.col
-
-    def __repr__(self):
-        """Provides a string representation for debugging."""
-        return f"({self.row}, {self.col})"
+from collections import deque, namedtuple
+import hashlib
+import numpy as np
+
+_CellBase = namedtuple('_CellBase', ['row', 'col'])
+
+class Cell(_CellBase):
+    """
+    Represents a single cell (vertex) in the grid-based maze.
+
+    An immutable (row, col) tuple without a per-instance __dict__. Hashing and
+    equality run in C, so set and dict lookups in the solvers never call back
+    into Python code. Equal to a plain (row, col) tuple with the same values.
+    """
+    __slots__ = ()
+
+    # Provides a string representation for debugging, e.g. "(2, 3)"
+    __repr__ = tuple.__repr__
 
 def create_graph_from_grid(grid_dims, obstacles):
     """
@@ -63,3 +62,708 @@ def create_graph_from_grid(grid_dims, obstacles):
     
     return graph
 
+
+class _CellPool(dict):
+    """Per-grid cache that hands out one shared Cell per flat index."""
+    def __init__(self, cols):
+        super().__init__()
+        self.cols = cols
+
+    def __missing__(self, index):
+        cell = self[index] = Cell(*divmod(index, self.cols))
+        return cell
+
+class GridGraph:
+    """
+    Compact grid graph backed by a NumPy obstacle mask (one byte per cell).
+
+    Neighbors are computed on the fly from flat cell indices
+    (``row * cols + col``) instead of being stored per cell. The class
+    answers ``graph.get(cell, default)`` exactly like the adjacency dict
+    returned by create_graph_from_grid, so it can be passed to the DFS
+    solvers in its place.
+    """
+    def __init__(self, mask, intern_cells=False):
+        """
+        :param mask: 2D array-like of shape (rows, cols); non-zero marks an obstacle.
+        :param intern_cells: If True, hand out one shared Cell object per cell
+                             instead of allocating a new one on every lookup.
+        """
+        self.mask = np.ascontiguousarray(mask, dtype=np.uint8)
+        if self.mask.ndim != 2:
+            raise ValueError("Grid mask must be two-dimensional.")
+        self.rows, self.cols = self.mask.shape
+        # Flat byte view for fast scalar lookups from Python code
+        self._blocked = memoryview(self.mask.reshape(-1))
+        self._cell_pool = _CellPool(self.cols) if intern_cells else None
+        self._components = None
+        self.version = 0 # Incremented on every obstacle edit
+
+    def in_bounds(self, row, col):
+        """Checks whether (row, col) lies inside the grid."""
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def index_of(self, cell):
+        """Returns the flat index of a Cell."""
+        return cell.row * self.cols + cell.col
+
+    def cell_at(self, index):
+        """Returns the Cell for a flat index."""
+        if self._cell_pool is not None:
+            return self._cell_pool[index]
+        return Cell(*divmod(index, self.cols))
+
+    def is_blocked(self, cell):
+        """Checks whether a Cell is an obstacle."""
+        return bool(self._blocked[cell.row * self.cols + cell.col])
+
+    def neighbor_indices(self, index):
+        """
+        Returns the flat indices of open neighbors, in (row, col) order.
+
+        :param index: Flat index of an open cell.
+        :return: List of flat indices.
+        """
+        rows, cols = self.rows, self.cols
+        blocked = self._blocked
+        row, col = divmod(index, cols)
+        result = []
+        # Up, Left, Right, Down matches the sorted order of the legacy graph
+        if row > 0 and not blocked[index - cols]:
+            result.append(index - cols)
+        if col > 0 and not blocked[index - 1]:
+            result.append(index - 1)
+        if col < cols - 1 and not blocked[index + 1]:
+            result.append(index + 1)
+        if row < rows - 1 and not blocked[index + cols]:
+            result.append(index + cols)
+        return result
+
+    def neighbors(self, cell):
+        """
+        Returns the open neighbors of a Cell, sorted by (row, col).
+
+        :param cell: An open Cell inside the grid.
+        :return: List of Cell objects.
+        """
+        rows, cols = self.rows, self.cols
+        blocked = self._blocked
+        row, col = cell.row, cell.col
+        index = row * cols + col
+        if self._cell_pool is not None:
+            pool = self._cell_pool
+            return [pool[neighbor] for neighbor in self.neighbor_indices(index)]
+        result = []
+        if row > 0 and not blocked[index - cols]:
+            result.append(Cell(row - 1, col))
+        if col > 0 and not blocked[index - 1]:
+            result.append(Cell(row, col - 1))
+        if col < cols - 1 and not blocked[index + 1]:
+            result.append(Cell(row, col + 1))
+        if row < rows - 1 and not blocked[index + cols]:
+            result.append(Cell(row + 1, col))
+        return result
+
+    def get(self, cell, default=None):
+        """
+        Dict-style neighbor lookup used by the solvers.
+
+        Obstacles have no outgoing edges; cells outside the grid return default.
+        """
+        if not self.in_bounds(cell.row, cell.col):
+            return default
+        if self._blocked[cell.row * self.cols + cell.col]:
+            return []
+        return self.neighbors(cell)
+
+    def _check_bounds(self, cell):
+        """Rejects cells outside the grid, whose flat index would wrap onto another cell."""
+        if not self.in_bounds(cell.row, cell.col):
+            raise ValueError(f"Cell {tuple(cell)} is outside the {self.rows}x{self.cols} grid.")
+
+    def add_obstacle(self, cell):
+        """
+        Turns an open cell into a wall. Neighbor lists are computed on the fly,
+        so this is a single byte write plus an update of the component index
+        if one has been built.
+
+        :param cell: Cell inside the grid.
+        :return: True if the grid changed.
+        :raises ValueError: If the cell lies outside the grid.
+        """
+        self._check_bounds(cell)
+        index = self.index_of(cell)
+        if self._blocked[index]:
+            return False
+        self._blocked[index] = 1
+        self.version += 1
+        if self._components is not None:
+            self._components.obstacle_added(cell)
+        return True
+
+    def remove_obstacle(self, cell):
+        """
+        Turns a wall back into an open cell.
+
+        :param cell: Cell inside the grid.
+        :return: True if the grid changed.
+        :raises ValueError: If the cell lies outside the grid.
+        """
+        self._check_bounds(cell)
+        index = self.index_of(cell)
+        if not self._blocked[index]:
+            return False
+        self._blocked[index] = 0
+        self.version += 1
+        if self._components is not None:
+            self._components.obstacle_removed(cell)
+        return True
+
+    def components(self):
+        """
+        Returns the ComponentIndex for this grid, building it on first use.
+        """
+        if self._components is None:
+            self._components = ComponentIndex(self)
+        return self._components
+
+    def distance_field(self, sources):
+        """
+        Hop distances from the nearest of `sources` to every cell; see distance_field.
+        """
+        return distance_field(self.mask, sources)
+
+    def __getitem__(self, cell):
+        neighbors = self.get(cell)
+        if neighbors is None:
+            raise KeyError(cell)
+        return neighbors
+
+    def __contains__(self, cell):
+        return isinstance(cell, Cell) and self.in_bounds(cell.row, cell.col)
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __iter__(self):
+        for row in range(self.rows):
+            for col in range(self.cols):
+                yield Cell(row, col)
+
+class CellBitmap:
+    """
+    Set-like visited marker for a grid: one byte per cell, indexed by the
+    flat index ``row * cols + col``.
+
+    Supports the subset of set the DFS engines use (``in``, add, discard,
+    len, clear), so it can be passed as their `visited` argument. A set
+    of Cells costs roughly 100 bytes per visited cell; the bitmap costs one
+    byte per grid cell, allocated once and reusable across searches with
+    clear(). Like SearchWorkspace, each byte holds a generation stamp: a
+    cell is marked when its stamp equals the current generation, so
+    clear() is a counter increment and the bytes are only wiped once every
+    255 searches. Cells must lie inside the grid.
+    """
+    def __init__(self, rows, cols):
+        """
+        :param rows: Number of grid rows.
+        :param cols: Number of grid columns.
+        """
+        self.rows, self.cols = rows, cols
+        self.marks = bytearray(rows * cols)
+        self.generation = 1
+
+    @classmethod
+    def for_graph(cls, graph):
+        """Creates a bitmap sized for a GridGraph."""
+        return cls(graph.rows, graph.cols)
+
+    def __contains__(self, cell):
+        """Checks whether a cell is marked in the current search."""
+        return self.marks[cell[0] * self.cols + cell[1]] == self.generation
+
+    def add(self, cell):
+        """Marks a cell."""
+        self.marks[cell[0] * self.cols + cell[1]] = self.generation
+
+    def discard(self, cell):
+        """Unmarks a cell; unmarked cells are left as they are."""
+        index = cell[0] * self.cols + cell[1]
+        if self.marks[index] == self.generation:
+            self.marks[index] = 0
+
+    def __len__(self):
+        """Counts the marked cells (a scan over the whole bitmap)."""
+        return self.marks.count(self.generation)
+
+    def clear(self):
+        """Unmarks every cell so the bitmap can serve the next search."""
+        self.generation += 1
+        if self.generation > 255:
+            self.marks[:] = bytes(len(self.marks))
+            self.generation = 1
+
+class PackedGridGraph(GridGraph):
+    """
+    GridGraph over a bit-packed obstacle mask: one bit per cell instead of
+    one byte.
+
+    Bit ``row * cols + col`` (most significant bit first, as written by
+    np.packbits) marks that cell as an obstacle. The bits are read straight
+    from the given buffer, typically a memory-mapped maze file (see
+    maze_io.open_maze), so opening a grid copies nothing and costs nothing
+    up front. Edits write to the buffer, which must then be writable.
+    """
+    def __init__(self, bits, rows, cols, offset=0, intern_cells=False):
+        """
+        :param bits: Buffer (bytes, bytearray, mmap, NumPy array) holding the packed mask.
+        :param rows: Number of grid rows.
+        :param cols: Number of grid columns.
+        :param offset: Byte offset of the packed mask inside the buffer.
+        :param intern_cells: If True, hand out one shared Cell object per cell.
+        """
+        num_bytes = (rows * cols + 7) // 8
+        self._bits = memoryview(bits).cast('B')[offset:offset + num_bytes]
+        if rows <= 0 or cols <= 0 or len(self._bits) < num_bytes:
+            raise ValueError("Packed mask does not match the grid dimensions.")
+        # GridGraph.__init__ is not called: its fields are set here, with
+        # _blocked left empty since every lookup below reads the bits
+        self.rows, self.cols = rows, cols
+        self._blocked = None
+        self._cell_pool = _CellPool(cols) if intern_cells else None
+        self._components = None
+        self._unpacked = None # (version, read-only mask) of the last unpack
+        self.version = 0 # Incremented on every obstacle edit
+
+    def unpack_mask(self):
+        """
+        Unpacks the obstacle mask into a new array, one byte per cell.
+
+        :return: Writable uint8 array of shape (rows, cols), independent of the graph.
+        """
+        bits = np.frombuffer(self._bits, dtype=np.uint8)
+        return np.unpackbits(bits, count=self.rows * self.cols).reshape(self.rows, self.cols)
+
+    @property
+    def mask(self):
+        """
+        Read-only unpacked obstacle mask, for vectorized consumers such as
+        label_components. It is unpacked once per graph version and shared
+        until the next edit; use unpack_mask() for a copy to modify.
+        """
+        if self._unpacked is None or self._unpacked[0] != self.version:
+            mask = self.unpack_mask()
+            mask.flags.writeable = False
+            self._unpacked = (self.version, mask)
+        return self._unpacked[1]
+
+    def is_blocked(self, cell):
+        """Checks whether a Cell is an obstacle."""
+        index = cell.row * self.cols + cell.col
+        return bool(self._bits[index >> 3] & (0x80 >> (index & 7)))
+
+    def neighbor_indices(self, index):
+        """
+        Returns the flat indices of open neighbors, in (row, col) order.
+
+        :param index: Flat index of an open cell.
+        :return: List of flat indices.
+        """
+        rows, cols = self.rows, self.cols
+        bits = self._bits
+        row, col = divmod(index, cols)
+        result = []
+        # Up, Left, Right, Down matches the sorted order of the legacy graph
+        if row > 0:
+            neighbor = index - cols
+            if not bits[neighbor >> 3] & (0x80 >> (neighbor & 7)):
+                result.append(neighbor)
+        if col > 0:
+            neighbor = index - 1
+            if not bits[neighbor >> 3] & (0x80 >> (neighbor & 7)):
+                result.append(neighbor)
+        if col < cols - 1:
+            neighbor = index + 1
+            if not bits[neighbor >> 3] & (0x80 >> (neighbor & 7)):
+                result.append(neighbor)
+        if row < rows - 1:
+            neighbor = index + cols
+            if not bits[neighbor >> 3] & (0x80 >> (neighbor & 7)):
+                result.append(neighbor)
+        return result
+
+    def neighbors(self, cell):
+        """
+        Returns the open neighbors of a Cell, in (row, col) order.
+
+        :param cell: Cell inside the grid.
+        :return: List of Cells.
+        """
+        index = cell.row * self.cols + cell.col
+        if self._cell_pool is not None:
+            pool = self._cell_pool
+            return [pool[neighbor] for neighbor in self.neighbor_indices(index)]
+        cols = self.cols
+        return [Cell(*divmod(neighbor, cols)) for neighbor in self.neighbor_indices(index)]
+
+    def get(self, cell, default=None):
+        """
+        Dict-style neighbor lookup used by the solvers.
+
+        Obstacles have no outgoing edges; cells outside the grid return default.
+        """
+        if not self.in_bounds(cell.row, cell.col):
+            return default
+        if self.is_blocked(cell):
+            return []
+        return self.neighbors(cell)
+
+    def _set_blocked(self, cell, blocked):
+        """Writes one obstacle bit and reports whether it changed."""
+        self._check_bounds(cell)
+        index = self.index_of(cell)
+        bit = 0x80 >> (index & 7)
+        old = self._bits[index >> 3]
+        new = old | bit if blocked else old & ~bit
+        if new == old:
+            return False
+        self._bits[index >> 3] = new
+        self.version += 1
+        return True
+
+    def add_obstacle(self, cell):
+        """
+        Turns an open cell into a wall.
+
+        :param cell: Cell inside the grid.
+        :return: True if the grid changed.
+        :raises ValueError: If the cell lies outside the grid.
+        """
+        if not self._set_blocked(cell, True):
+            return False
+        if self._components is not None:
+            self._components.obstacle_added(cell)
+        return True
+
+    def remove_obstacle(self, cell):
+        """
+        Turns a wall back into an open cell.
+
+        :param cell: Cell inside the grid.
+        :return: True if the grid changed.
+        :raises ValueError: If the cell lies outside the grid.
+        """
+        if not self._set_blocked(cell, False):
+            return False
+        if self._components is not None:
+            self._components.obstacle_removed(cell)
+        return True
+
+def create_grid_graph(grid_dims, obstacles, intern_cells=False):
+    """
+    Builds a GridGraph from grid dimensions and a list of obstacles.
+
+    Takes the same arguments as create_graph_from_grid, but marks all
+    obstacles in a single vectorized assignment instead of building
+    per-cell neighbor lists. Obstacles outside the grid are ignored.
+
+    :param grid_dims: Tuple (rows, cols) of grid dimensions.
+    :param obstacles: List of Cell objects representing wall locations.
+    :param intern_cells: Passed to GridGraph; share one Cell object per cell.
+    :return: GridGraph instance.
+    """
+    rows, cols = grid_dims
+    mask = np.zeros((rows, cols), dtype=np.uint8)
+    if obstacles:
+        coords = np.array([(cell.row, cell.col) for cell in obstacles], dtype=np.int64)
+        inside = (coords[:, 0] >= 0) & (coords[:, 0] < rows) & (coords[:, 1] >= 0) & (coords[:, 1] < cols)
+        coords = coords[inside]
+        mask[coords[:, 0], coords[:, 1]] = 1
+    return GridGraph(mask, intern_cells)
+
+def mask_fingerprint(mask):
+    """
+    Hashes an obstacle mask, so graphs and results built from it can be
+    cached and found again without comparing whole grids.
+
+    :param mask: 2D array-like; non-zero marks an obstacle.
+    :return: Hex digest covering the shape and the obstacle layout.
+    """
+    mask = np.ascontiguousarray(mask, dtype=np.uint8) != 0
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.array(mask.shape, dtype=np.int64).tobytes())
+    digest.update(np.packbits(mask).tobytes())
+    return digest.hexdigest()
+
+def label_components(mask):
+    """
+    Labels the 4-connected open regions of an obstacle mask.
+
+    Uses a vectorized union-find: every round hooks the larger root of each
+    cross-component edge onto the smaller one, then compresses all parent
+    chains with pointer jumping. Each round at least halves the number of
+    components that still share an edge, so only O(log n) rounds run.
+
+    :param mask: 2D array of shape (rows, cols); non-zero marks an obstacle.
+    :return: Integer array of the same shape. Open cells hold the flat index
+             of their component's smallest cell; obstacles hold -1.
+    """
+    rows, cols = mask.shape
+    size = rows * cols
+    dtype = np.int32 if size < 2 ** 31 else np.int64
+    is_open = np.asarray(mask) == 0
+    index = np.arange(size, dtype=dtype).reshape(rows, cols)
+
+    # Edge list between horizontally and vertically adjacent open cells
+    horizontal = is_open[:, :-1] & is_open[:, 1:]
+    vertical = is_open[:-1, :] & is_open[1:, :]
+    edge_a = np.concatenate([index[:, :-1][horizontal], index[:-1, :][vertical]])
+    edge_b = np.concatenate([index[:, 1:][horizontal], index[1:, :][vertical]])
+
+    parent = index.reshape(-1).copy()
+    while True:
+        root_a, root_b = parent[edge_a], parent[edge_b]
+        crossing = root_a != root_b
+        if not crossing.any():
+            break
+        # Edges inside one component stay inside it, so they can be dropped
+        edge_a, edge_b = edge_a[crossing], edge_b[crossing]
+        root_a, root_b = root_a[crossing], root_b[crossing]
+        parent[np.maximum(root_a, root_b)] = np.minimum(root_a, root_b)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    labels = parent.reshape(rows, cols)
+    labels[~is_open] = -1
+    return labels
+
+def distance_field(mask, sources):
+    """
+    Computes the BFS hop distance from the nearest source to every cell.
+
+    The search advances one whole wavefront per step: the frontier's flat
+    indices are shifted by the four neighbor offsets at once, then filtered
+    to open, unreached cells. The mask is padded with a ring of walls so
+    the shifts never need bounds checks. Every cell is handled once, and the
+    per-step NumPy overhead is paid once per distance level, so wide-open
+    grids (few, broad wavefronts) gain the most; long single corridors
+    still take one step per cell of their length.
+
+    Since moves are undirected, distance_field(mask, [goal]) >= 0 is also
+    exactly the set of cells that can reach the goal.
+
+    :param mask: 2D array of shape (rows, cols); non-zero marks an obstacle.
+    :param sources: Iterable of (row, col) cells at distance 0. Blocked sources are ignored.
+    :return: int32 array of the same shape; -1 marks obstacles and unreachable cells.
+    :raises ValueError: If a source lies outside the grid.
+    """
+    rows, cols = np.shape(mask)
+    width = cols + 2
+    free = np.zeros((rows + 2, width), dtype=bool)
+    free[1:-1, 1:-1] = np.asarray(mask) == 0
+    free = free.reshape(-1)
+    distances = np.full(free.size, -1, dtype=np.int32)
+
+    frontier = []
+    for row, col in sources:
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError(f"Source {(row, col)} is outside the {rows}x{cols} grid.")
+        frontier.append((row + 1) * width + col + 1)
+    frontier = np.unique(np.array(frontier, dtype=np.int64))
+    frontier = frontier[free[frontier]]
+    offsets = np.array([-width, width, -1, 1], dtype=np.int64)
+
+    distance = 0
+    while frontier.size:
+        free[frontier] = False # Reached cells are no longer candidates
+        distances[frontier] = distance
+        distance += 1
+        candidates = (frontier[:, None] + offsets).reshape(-1)
+        frontier = np.unique(candidates[free[candidates]])
+
+    return distances.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+
+class ComponentIndex:
+    """
+    Precomputed connected-component labels for O(1) reachability checks.
+
+    Built with label_components for a GridGraph, or with a flood fill over
+    the keys of a legacy adjacency dict. For a GridGraph every label is the
+    flat index of one of the component's own cells, which keeps labels unique
+    while GridGraph.add_obstacle/remove_obstacle update them incrementally.
+    """
+    # Cells obstacle_added may visit looking for the pieces a new wall cut
+    # off before it falls back to relabeling the whole component
+    split_search_limit = 4096
+
+    def __init__(self, graph):
+        """
+        :param graph: GridGraph or adjacency list (dict of Cell -> list of Cell).
+        """
+        self.graph = graph
+        if isinstance(graph, GridGraph):
+            self.labels = label_components(graph.mask)
+            self._flat_labels = self.labels.reshape(-1)
+        else:
+            self.labels = self._flood_fill_labels(graph)
+
+    @staticmethod
+    def _flood_fill_labels(graph):
+        """Labels every cell with outgoing edges by flood-filling the dict graph."""
+        labels = {}
+        next_label = 0
+        for cell, neighbors in graph.items():
+            if cell in labels or not neighbors:
+                continue
+            labels[cell] = next_label
+            stack = [cell]
+            while stack:
+                for neighbor in graph.get(stack.pop(), []):
+                    if neighbor not in labels:
+                        labels[neighbor] = next_label
+                        stack.append(neighbor)
+            next_label += 1
+        return labels
+
+    def component_of(self, cell):
+        """
+        Returns the component label of a Cell, or -1 for walls and cells outside the grid.
+        """
+        if isinstance(self.graph, GridGraph):
+            if not self.graph.in_bounds(cell.row, cell.col):
+                return -1
+            return int(self._flat_labels[cell.row * self.graph.cols + cell.col])
+        return self.labels.get(cell, -1)
+
+    def connected(self, cell_a, cell_b):
+        """
+        Checks in constant time whether a path exists between two cells.
+        """
+        label = self.component_of(cell_a)
+        return label >= 0 and label == self.component_of(cell_b)
+
+    def obstacle_added(self, cell):
+        """
+        Updates the labels after a cell of the GridGraph became a wall.
+
+        The new wall's open neighbors are flood-filled side by side (see
+        _split_locally): fills that meet merge, and a fill that runs out of
+        cells is a piece the wall cut off, which gets a label of its own.
+        The whole component is relabeled only when the fills exceed
+        split_search_limit cells before settling, or when the old label
+        pointed at the removed cell or ends up in a cut-off piece.
+        """
+        graph = self.graph
+        index = graph.index_of(cell)
+        label = int(self._flat_labels[index])
+        self._flat_labels[index] = -1
+        if label < 0:
+            return
+        if label == index or not self._split_locally(label, graph.neighbor_indices(index)):
+            self._relabel(label)
+
+    def _split_locally(self, label, neighbors):
+        """
+        Relabels the pieces of a component cut off by a new wall, searching
+        outward from the wall's open neighbors until all but one piece is
+        closed or every search has met.
+
+        :param label: Label of the component that lost the wall cell.
+        :param neighbors: Flat indices of the wall's open neighbors.
+        :return: False if the caller must relabel the whole component instead.
+        """
+        flat = memoryview(self._flat_labels)
+        neighbor_indices = self.graph.neighbor_indices
+        owner = {neighbor: fill for fill, neighbor in enumerate(neighbors)} # Cell -> fill that reached it
+        parent = list(range(len(neighbors))) # Fills merged into others point at them
+        queues = [deque([neighbor]) for neighbor in neighbors]
+        members = [[neighbor] for neighbor in neighbors]
+        active = list(range(len(neighbors)))
+        budget = self.split_search_limit
+
+        def find(fill):
+            while parent[fill] != fill:
+                fill = parent[fill]
+            return fill
+
+        while len(active) > 1:
+            for fill in list(active):
+                if parent[fill] != fill:
+                    continue # Merged into another fill during this round
+                if not queues[fill]:
+                    # Closed without touching another fill: a piece of its own
+                    if label in members[fill]:
+                        return False
+                    new_label = members[fill][0]
+                    for member in members[fill]:
+                        flat[member] = new_label
+                    active.remove(fill)
+                    if len(active) == 1:
+                        break
+                    continue
+                for next_index in neighbor_indices(queues[fill].popleft()):
+                    other = owner.get(next_index)
+                    if other is None:
+                        owner[next_index] = fill
+                        members[fill].append(next_index)
+                        queues[fill].append(next_index)
+                        budget -= 1
+                        continue
+                    other = find(other)
+                    if other != fill:
+                        # The fills met: merge the smaller into the larger
+                        keep, gone = (fill, other) if len(members[fill]) >= len(members[other]) else (other, fill)
+                        parent[gone] = keep
+                        queues[keep].extend(queues[gone])
+                        members[keep].extend(members[gone])
+                        active.remove(gone)
+                        fill = keep
+                if budget < 0:
+                    return False
+            active = [fill for fill in active if parent[fill] == fill]
+        return True
+
+    def obstacle_removed(self, cell):
+        """
+        Updates the labels after a wall of the GridGraph was opened, merging
+        every component the new cell touches into one.
+
+        The merged components are relabeled by flood-filling them from the
+        new cell's neighbors, so the cost grows with their size, not the grid's.
+        """
+        graph = self.graph
+        index = graph.index_of(cell)
+        flat = memoryview(self._flat_labels)
+        neighbors = graph.neighbor_indices(index)
+        labels = {flat[neighbor] for neighbor in neighbors}
+        if not labels:
+            flat[index] = index
+            return
+        keep = min(labels)
+        for neighbor in neighbors:
+            label = flat[neighbor]
+            if label == keep:
+                continue # Kept, or already merged through another neighbor
+            flat[neighbor] = keep
+            stack = [neighbor]
+            while stack:
+                for next_index in graph.neighbor_indices(stack.pop()):
+                    if flat[next_index] == label:
+                        flat[next_index] = keep
+                        stack.append(next_index)
+        flat[index] = keep
+
+    def _relabel(self, label):
+        """Re-runs label_components inside the bounding box of one component."""
+        rows, cols = np.nonzero(self.labels == label)
+        if len(rows) == 0:
+            return
+        top, left = rows.min(), cols.min()
+        window = self.labels[top:rows.max() + 1, left:cols.max() + 1]
+        members = window == label
+        local = label_components(~members)[members]
+        width = window.shape[1]
+        window[members] = (local // width + top) * self.graph.cols + (local % width + left)
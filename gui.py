@@ -1,15 +1,184 @@
 
 import tkinter as tk
 from tkinter import messagebox
-from graph_model import Cell, create_graph_from_grid
-from dfs_solver import find_path_recursive, dfs_iterative
+from graph_model import Cell, create_graph_from_grid, mask_fingerprint
+from dfs_solver import find_path_recursive, dfs_iterative, dfs_events, dfs_iterative_events, BACKTRACK, GOAL, CancellationToken, SearchCancelled
+from path_cache import PathCache
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
 import numpy as np
+import functools
+import itertools
+import math
+import queue
+import threading
 import time
 import tracemalloc
 
+# Cell colors of the grid image (RGBA)
+EMPTY_COLOR = (0x3C, 0x3C, 0x3C, 0xFF)
+OBSTACLE_COLOR = (0x6C, 0x75, 0x7D, 0xFF)
+START_COLOR = (0x28, 0xA7, 0x45, 0xFF)
+GOAL_COLOR = (0xDC, 0x35, 0x45, 0xFF)
+VISITED_COLOR = (0x17, 0xA2, 0xB8, 0xFF)
+PATH_COLOR = '#007BFF'
+GRID_LINE_COLOR = '#4A4A4A'
+GRID_LINE_LIMIT = 60   # Cell borders are only drawn on grids up to this many rows/cols
+MAX_IMAGE_SIZE = 512   # Larger grids share image pixels; the screen cannot show more anyway
+DEFAULT_DURATION = 10  # Seconds a search animation should take at most
+POLL_INTERVAL = 100    # Milliseconds between progress checks of a running search
+
+class GridRaster:
+    """
+    The grid drawn as a single RGBA image instead of one patch per cell.
+
+    Cells are colored by writing straight into the image's pixel array, and
+    the image is capped at MAX_IMAGE_SIZE pixels per side, so redrawing it
+    costs about the same on a 100x100 and a 1000x1000 grid. Coordinates stay
+    in cells: cell (r, c) is centered on (x=c, y=r).
+    """
+    def __init__(self, ax, mask, start_pos, goal_pos):
+        """
+        :param ax: Matplotlib axes to draw on.
+        :param mask: 2D array of shape (rows, cols); non-zero marks an obstacle.
+        :param start_pos: (row, col) of the start cell.
+        :param goal_pos: (row, col) of the goal cell.
+        """
+        self.rows, self.cols = rows, cols = mask.shape
+        height, width = min(rows, MAX_IMAGE_SIZE), min(cols, MAX_IMAGE_SIZE)
+        # Image row/column of every grid row/column
+        self.pixel_rows = (np.arange(rows) * height // rows).tolist()
+        self.pixel_cols = (np.arange(cols) * width // cols).tolist()
+
+        pixels = np.empty((height, width, 4), dtype=np.uint8)
+        pixels[:] = EMPTY_COLOR
+        obstacle_rows, obstacle_cols = np.nonzero(mask)
+        pixels[np.take(self.pixel_rows, obstacle_rows), np.take(self.pixel_cols, obstacle_cols)] = OBSTACLE_COLOR
+        self.image = ax.imshow(pixels, interpolation='nearest', extent=(-0.5, cols - 0.5, rows - 0.5, -0.5))
+        self.pixels = self.image.get_array() # imshow keeps its own copy; edit that one
+        self.endpoints = {start_pos, goal_pos}
+        for (r, c), color in ((start_pos, START_COLOR), (goal_pos, GOAL_COLOR)):
+            if 0 <= r < rows and 0 <= c < cols:
+                self.pixels[self.pixel_rows[r], self.pixel_cols[c]] = color
+
+        self.path_line, = ax.plot([], [], color=PATH_COLOR, linewidth=3)
+        grid_lines = []
+        if max(rows, cols) <= GRID_LINE_LIMIT:
+            grid_lines.append(ax.hlines(np.arange(-0.5, rows), -0.5, cols - 0.5, colors=GRID_LINE_COLOR, linewidth=1))
+            grid_lines.append(ax.vlines(np.arange(-0.5, cols), -0.5, rows - 0.5, colors=GRID_LINE_COLOR, linewidth=1))
+        # Artists redrawn on every blitted frame; the rest of the figure is cached
+        self.artists = [self.image, *grid_lines, self.path_line]
+        ax.set_xlim(-0.5, cols - 0.5)
+        ax.set_ylim(rows - 0.5, -0.5)
+
+    def mark(self, row, col, color=VISITED_COLOR):
+        """Colors one cell, leaving the start and goal cells as they are."""
+        if (row, col) not in self.endpoints:
+            self.pixels[self.pixel_rows[row], self.pixel_cols[col]] = color
+            self.image.stale = True
+
+    def show_path(self, path):
+        """Draws the path as one line through the cell centers."""
+        self.path_line.set_data([cell.col for cell in path], [cell.row for cell in path])
+
+class GridModel:
+    """
+    Parsed grid configuration: dimensions, endpoints and an obstacle bitmap.
+
+    `key` identifies the obstacle layout, so a graph built for one model
+    can be reused by any other model with the same key.
+    """
+    def __init__(self, mask, start_pos, goal_pos):
+        """
+        :param mask: uint8 array of shape (rows, cols); 1 marks an obstacle.
+        :param start_pos: (row, col) of the start cell.
+        :param goal_pos: (row, col) of the goal cell.
+        """
+        self.mask = mask
+        self.rows, self.cols = mask.shape
+        self.start_pos = start_pos
+        self.goal_pos = goal_pos
+        self.key = mask_fingerprint(mask)
+
+    def obstacle_cells(self):
+        """Lists the obstacles as Cells, for create_graph_from_grid."""
+        return [Cell(r, c) for r, c in np.argwhere(self.mask).tolist()]
+
+def parse_grid(grid_size_str, start_pos_str, goal_pos_str, obstacles_str):
+    """
+    Parses the text of the grid entries into a GridModel.
+
+    Obstacles outside the grid are ignored, as create_graph_from_grid does.
+
+    :raises ValueError: With a message for the user if an entry is malformed.
+    """
+    def parse_pair(text, message):
+        if not text or len(text.split(',')) != 2:
+            raise ValueError(message)
+        try:
+            return tuple(map(int, text.split(',')))
+        except ValueError:
+            raise ValueError("Invalid input. Please ensure all values are integers.") from None
+
+    rows, cols = parse_pair(grid_size_str, "Invalid Grid Size format. Use 'rows,cols'.")
+    if rows <= 0 or cols <= 0:
+        raise ValueError("Grid Size must be positive.")
+    start_pos = parse_pair(start_pos_str, "Invalid Start Position format. Use 'row,col'.")
+    goal_pos = parse_pair(goal_pos_str, "Invalid Goal Position format. Use 'row,col'.")
+
+    mask = np.zeros((rows, cols), dtype=np.uint8)
+    try:
+        obstacles = [tuple(map(int, o.split(','))) for o in obstacles_str.split(';') if o]
+    except ValueError:
+        raise ValueError("Invalid Obstacles format. Use 'row,col;row,col;...'.") from None
+    if any(len(obstacle) != 2 for obstacle in obstacles):
+        raise ValueError("Invalid Obstacles format. Use 'row,col;row,col;...'.")
+    inside = [(r, c) for r, c in obstacles if 0 <= r < rows and 0 <= c < cols]
+    if inside:
+        obstacle_rows, obstacle_cols = zip(*inside)
+        mask[list(obstacle_rows), list(obstacle_cols)] = 1
+    return GridModel(mask, start_pos, goal_pos)
+
+class FrameBatcher:
+    """
+    Groups search events into animation frames so that an animation of any
+    length finishes in about `duration` seconds.
+
+    The batch size is recomputed before every frame from the events still
+    to show and the frames that fit in the remaining time at the frame rate
+    observed so far. Short searches get one event per frame; slow frames or
+    long searches get proportionally larger batches.
+    """
+    def __init__(self, events, total, duration, interval, clock=time.perf_counter):
+        """
+        :param events: Iterator of events to show.
+        :param total: Expected number of events (an estimate is fine).
+        :param duration: Target length of the whole animation in seconds.
+        :param interval: Frame interval in seconds, used until a frame rate has been observed.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.events = iter(events)
+        self.remaining = total
+        self.duration = duration
+        self.interval = interval
+        self.clock = clock
+
+    def __iter__(self):
+        """Yields lists of events, one list per frame."""
+        started = self.clock()
+        frames = 0
+        while True:
+            elapsed = self.clock() - started
+            frame_time = elapsed / frames if frames else self.interval
+            frames_left = max(1.0, (self.duration - elapsed) / max(frame_time, 1e-6))
+            batch = list(itertools.islice(self.events, max(1, math.ceil(self.remaining / frames_left))))
+            if not batch:
+                return
+            self.remaining = max(0, self.remaining - len(batch))
+            frames += 1
+            yield batch
+
 class DFSVisualizer(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -36,6 +205,12 @@ class DFSVisualizer(tk.Tk):
 
         self.animation = None
         self.is_paused = False
+        self.search_token = None
+        self.model = None       # GridModel parsed from the entries
+        self.model_entries = None # Entry texts self.model was parsed from
+        self.graph = None       # Graph built for self.graph_key
+        self.graph_key = None
+        self.path_cache = PathCache() # Paths found per (layout, search, start, goal)
 
         self.create_controls()
 
@@ -81,6 +256,9 @@ class DFSVisualizer(tk.Tk):
         self.run_iterative_button = tk.Button(self.controls_frame, text="Run Iterative DFS", font=control_font, bg=button_bg, fg=button_fg, command=self.run_iterative_dfs, relief="flat", borderwidth=0)
         self.run_iterative_button.pack(pady=5, fill="x")
 
+        self.cancel_button = tk.Button(self.controls_frame, text="Cancel Search", font=control_font, bg="#555555", fg=button_fg, command=self.cancel_search, relief="flat", borderwidth=0, state=tk.DISABLED)
+        self.cancel_button.pack(pady=5, fill="x")
+
         # Animation Controls
         animation_controls_frame = tk.Frame(self.controls_frame, bg="#3C3C3C")
         animation_controls_frame.pack(pady=10, fill="x")
@@ -92,6 +270,13 @@ class DFSVisualizer(tk.Tk):
         self.speed_slider.set(50)
         self.speed_slider.pack(side="right", fill="x", expand=True, padx=(5, 0))
 
+        self.duration_slider = tk.Scale(self.controls_frame, from_=1, to=120, orient="horizontal", label="Max Duration (s)", font=control_font, bg="#3C3C3C", fg=label_color, troughcolor="#555555", highlightbackground="#3C3C3C")
+        self.duration_slider.set(DEFAULT_DURATION)
+        self.duration_slider.pack(fill="x")
+
+        self.skip_button = tk.Button(self.controls_frame, text="Skip to End", font=control_font, bg=button_bg, fg=button_fg, command=self.skip_to_end, relief="flat", borderwidth=0)
+        self.skip_button.pack(pady=5, fill="x")
+
 
         self.reset_button = tk.Button(self.controls_frame, text="Reset", font=control_font, bg="#555555", fg=button_fg, command=self.reset, relief="flat", borderwidth=0)
         self.reset_button.pack(pady=15, fill="x")
@@ -101,120 +286,161 @@ class DFSVisualizer(tk.Tk):
         self.time_label.pack(pady=5)
         self.memory_label = tk.Label(self.controls_frame, text="Memory Usage: ", font=control_font, bg="#3C3C3C", fg=label_color)
         self.memory_label.pack(pady=5)
+        self.progress_label = tk.Label(self.controls_frame, text="", font=control_font, bg="#3C3C3C", fg=label_color)
+        self.progress_label.pack(pady=5)
 
     def draw_grid(self):
+        """
+        Draws the grid described by the entries, re-parsing them only when
+        their text changed.
+
+        :return: True if the grid is valid and was drawn.
+        """
         if self.animation and self.animation.event_source:
             self.animation.event_source.stop()
             self.animation = None
         self.ax.clear()
         self.ax.set_facecolor("#2E2E2E")
-        try:
-            # Grid size validation
-            grid_size_str = self.grid_size_entry.get()
-            if not grid_size_str or len(grid_size_str.split(',')) != 2:
-                messagebox.showerror("Error", "Invalid Grid Size format. Use 'rows,cols'.")
-                return
-            self.rows, self.cols = map(int, grid_size_str.split(','))
 
-            # Start position validation
-            start_pos_str = self.start_pos_entry.get()
-            if not start_pos_str or len(start_pos_str.split(',')) != 2:
-                messagebox.showerror("Error", "Invalid Start Position format. Use 'row,col'.")
-                return
-            self.start_pos = tuple(map(int, start_pos_str.split(',')))
-
-            # Goal position validation
-            goal_pos_str = self.goal_pos_entry.get()
-            if not goal_pos_str or len(goal_pos_str.split(',')) != 2:
-                messagebox.showerror("Error", "Invalid Goal Position format. Use 'row,col'.")
-                return
-            self.goal_pos = tuple(map(int, goal_pos_str.split(',')))
-
-            # Obstacles validation
-            obstacles_str = self.obstacles_entry.get()
-            if obstacles_str:
-                try:
-                    self.obstacles = [tuple(map(int, o.split(','))) for o in obstacles_str.split(';') if o]
-                except ValueError:
-                    messagebox.showerror("Error", "Invalid Obstacles format. Use 'row,col;row,col;...'.")
-                    return
-            else:
-                self.obstacles = []
-
-            self.ax.set_xticks(np.arange(-.5, self.cols, 1), minor=True)
-            self.ax.set_yticks(np.arange(-.5, self.rows, 1), minor=True)
-            self.ax.set_xticklabels([])
-            self.ax.set_yticklabels([])
-            self.ax.grid(which='minor', color='#4A4A4A')
-
-            for r in range(self.rows):
-                for c in range(self.cols):
-                    if (r, c) == self.start_pos:
-                        self.ax.add_patch(plt.Rectangle((c - 0.5, r - 0.5), 1, 1, color='#28a745', ec='#2E2E2E'))
-                    elif (r, c) == self.goal_pos:
-                        self.ax.add_patch(plt.Rectangle((c - 0.5, r - 0.5), 1, 1, color='#dc3545', ec='#2E2E2E'))
-                    elif (r, c) in self.obstacles:
-                        self.ax.add_patch(plt.Rectangle((c - 0.5, r - 0.5), 1, 1, color='#6c757d', ec='#2E2E2E'))
-                    else:
-                        self.ax.add_patch(plt.Rectangle((c - 0.5, r - 0.5), 1, 1, color='#3C3C3C', ec='#4A4A4A'))
-            
-            self.ax.set_xlim(-0.5, self.cols - 0.5)
-            self.ax.set_ylim(-0.5, self.rows - 0.5)
-            self.ax.invert_yaxis()
-            self.canvas.draw()
-        except ValueError:
-            messagebox.showerror("Error", "Invalid input. Please ensure all values are integers.")
+        entries = (self.grid_size_entry.get(), self.start_pos_entry.get(),
+                   self.goal_pos_entry.get(), self.obstacles_entry.get())
+        if entries != self.model_entries:
+            try:
+                self.model = parse_grid(*entries)
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return False
+            self.model_entries = entries
+        self.rows, self.cols = self.model.rows, self.model.cols
+        self.start_pos, self.goal_pos = self.model.start_pos, self.model.goal_pos
+
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+
+        self.raster = GridRaster(self.ax, self.model.mask, self.start_pos, self.goal_pos)
+        self.canvas.draw()
+        return True
 
     def run_recursive_dfs(self):
-        try:
-            self.draw_grid()
-            self.graph = create_graph_from_grid((self.rows, self.cols), [Cell(r, c) for r, c in self.obstacles])
-            start_node = Cell(self.start_pos[0], self.start_pos[1])
-            goal_node = Cell(self.goal_pos[0], self.goal_pos[1])
-
-            tracemalloc.start()
-            start_time = time.time()
-            path, history, _ = find_path_recursive(self.graph, start_node, goal_node)
-            end_time = time.time()
-            current, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
-
-            self.time_label.config(text=f"Execution Time: {end_time - start_time:.4f}s")
-            self.memory_label.config(text=f"Memory Usage: {peak / 1024:.2f} KB")
-
-            self.animate_search(history, path)
-            if not path:
-                messagebox.showinfo("No Path", "No path found using Recursive DFS.")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+        # The explicit-stack stream visits cells in the same order as the recursive search
+        self.start_search("Recursive DFS", find_path_recursive, dfs_events)
 
     def run_iterative_dfs(self):
-        try:
-            self.draw_grid()
-            self.graph = create_graph_from_grid((self.rows, self.cols), [Cell(r, c) for r, c in self.obstacles])
-            start_node = Cell(self.start_pos[0], self.start_pos[1])
-            goal_node = Cell(self.goal_pos[0], self.goal_pos[1])
+        self.start_search("Iterative DFS", dfs_iterative, dfs_iterative_events)
+
+    def start_search(self, name, solve, events):
+        """
+        Builds the graph and runs the search in a worker thread, so the window
+        stays responsive; poll_search picks up progress and the result.
+
+        :param name: Name of the search for messages.
+        :param solve: Search function taking (graph, start, goal, record_history=, token=).
+        :param events: Event stream function taking (graph, start, goal), used to animate the result.
+        """
+        if self.search_token is not None:
+            return # A search is already running
+        if not self.draw_grid():
+            return
+        model = self.model
+        start_node = Cell(*model.start_pos)
+        goal_node = Cell(*model.goal_pos)
+        # Reuse the graph while the obstacle layout is unchanged; otherwise the worker builds it
+        graph = self.graph if self.graph_key == model.key else None
+        cache_key = PathCache.make_key(model.key, name, start_node, goal_node)
+        if graph is not None:
+            # A repeated query only replays the animation; the graph is needed for its events
+            cached = self.path_cache.get(cache_key)
+            if cached is not None:
+                self.time_label.config(text="Execution Time: cached")
+                self.memory_label.config(text="Memory Usage: cached")
+                self.show_result(name, events, graph, start_node, goal_node, cached.path, cached.nodes_expanded)
+                return
 
+        self.search_token = CancellationToken()
+        results = queue.Queue()
+        worker = threading.Thread(target=self.search_worker, daemon=True,
+                                  args=(solve, graph, model, start_node, goal_node, self.search_token, results))
+        self.set_searching(True)
+        worker.start()
+        self.after(POLL_INTERVAL, self.poll_search, name, events, cache_key, start_node, goal_node, results)
+
+    @staticmethod
+    def search_worker(solve, graph, model, start_node, goal_node, token, results):
+        """
+        Runs one search off the Tk thread, building the graph from the model
+        first if none is given, and reports (graph, path, seconds, peak_bytes)
+        or the exception it raised through the results queue.
+        """
+        try:
+            if graph is None:
+                graph = create_graph_from_grid((model.rows, model.cols), model.obstacle_cells())
             tracemalloc.start()
             start_time = time.time()
-            path, history = dfs_iterative(self.graph, start_node, goal_node)
+            path = solve(graph, start_node, goal_node, record_history=False, token=token)[0]
             end_time = time.time()
-            current, peak = tracemalloc.get_traced_memory()
+            _, peak = tracemalloc.get_traced_memory()
+            results.put((graph, path, end_time - start_time, peak))
+        except Exception as e:
+            results.put(e)
+        finally:
             tracemalloc.stop()
 
-            self.time_label.config(text=f"Execution Time: {end_time - start_time:.4f}s")
-            self.memory_label.config(text=f"Memory Usage: {peak / 1024:.2f} KB")
-
-            self.animate_search(history, path)
-            if not path:
-                messagebox.showinfo("No Path", "No path found using Iterative DFS.")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
+    def poll_search(self, name, events, cache_key, start_node, goal_node, results):
+        """Shows the progress of the running search and, once it is done, its result."""
+        token = self.search_token
+        try:
+            result = results.get_nowait()
+        except queue.Empty:
+            self.progress_label.config(text=f"Visited: {token.nodes_visited}  Depth: {token.depth}")
+            self.after(POLL_INTERVAL, self.poll_search, name, events, cache_key, start_node, goal_node, results)
+            return
 
-    def animate_search(self, history, path):
-        if not history:
+        self.search_token = None
+        self.set_searching(False)
+        if isinstance(result, SearchCancelled):
+            self.progress_label.config(text=f"Cancelled after {token.nodes_visited} nodes")
+            return
+        if isinstance(result, Exception):
+            self.progress_label.config(text="")
+            messagebox.showerror("Error", str(result))
             return
 
+        graph, path, seconds, peak = result
+        self.graph, self.graph_key = graph, cache_key[0]
+        self.path_cache.put(cache_key, path, token.nodes_visited)
+        self.time_label.config(text=f"Execution Time: {seconds:.4f}s")
+        self.memory_label.config(text=f"Memory Usage: {peak / 1024:.2f} KB")
+        self.show_result(name, events, graph, start_node, goal_node, path, token.nodes_visited)
+
+    def show_result(self, name, events, graph, start_node, goal_node, path, nodes_visited):
+        """Reports a finished (or cached) search and animates it."""
+        cache = self.path_cache
+        self.progress_label.config(text=f"Visited: {nodes_visited}  (cache: {cache.hits} hits, {cache.misses} misses)")
+        self.animate_search(lambda: events(graph, start_node, goal_node), path, nodes_visited)
+        if not path:
+            messagebox.showinfo("No Path", f"No path found using {name}.")
+
+    def cancel_search(self):
+        """Asks the running search to stop; poll_search reports when it has."""
+        if self.search_token is not None:
+            self.search_token.cancel()
+
+    def set_searching(self, searching):
+        """Disables the run buttons while a search runs and enables Cancel."""
+        run_state, cancel_state = (tk.DISABLED, tk.NORMAL) if searching else (tk.NORMAL, tk.DISABLED)
+        for button in (self.generate_grid_button, self.run_recursive_button, self.run_iterative_button):
+            button.config(state=run_state)
+        self.cancel_button.config(state=cancel_state)
+
+    def animate_search(self, make_events, path, total):
+        """
+        Animates a search by consuming its event stream a batch at a time,
+        so the visit history is never held in memory.
+
+        :param make_events: Function returning a fresh event stream of the search.
+        :param path: Path found by the search, or None.
+        :param total: Number of nodes the search visited.
+        """
         if self.animation and self.animation.event_source:
             self.animation.event_source.stop()
             self.animation = None
@@ -222,32 +448,62 @@ class DFSVisualizer(tk.Tk):
         self.is_paused = False
         self.play_pause_button.config(text="Pause")
 
-        visited_patches = {}
-        
-        def update(frame):
-            node = history[frame]
-            r, c = node.row, node.col
-            
-            if (r, c) not in [(self.start_pos), (self.goal_pos)]:
-                if (r,c) not in visited_patches:
-                    patch = plt.Rectangle((c - 0.5, r - 0.5), 1, 1, color='#17a2b8', ec='#2E2E2E')
-                    self.ax.add_patch(patch)
-                    visited_patches[(r,c)] = patch
-                else:
-                    visited_patches[(r,c)].set_color('#17a2b8')
-
-
-            if frame == len(history) - 1 and path:
-                for i in range(len(path) - 1):
-                    start_cell = path[i]
-                    end_cell = path[i+1]
-                    self.ax.plot([start_cell.col, end_cell.col], [start_cell.row, end_cell.row], color='#007BFF', linewidth=3)
-
-            self.canvas.draw()
-
-        self.animation = FuncAnimation(self.fig, update, frames=len(history), repeat=False, interval=self.speed_slider.get())
+        batches = FrameBatcher((event for event in make_events() if event[2] != BACKTRACK), total,
+                               self.duration_slider.get(), self.speed_slider.get() / 1000)
+        self.frames = self.frame_sequence(batches)
+        self.frame_update = functools.partial(self.update_batch, path)
+
+        self.animation = FuncAnimation(self.fig, self.frame_update, frames=self.frames, init_func=lambda: self.raster.artists,
+                                       blit=True, repeat=False, cache_frame_data=False,
+                                       interval=self.speed_slider.get())
         self.canvas.draw()
 
+    def frame_sequence(self, batches):
+        """Yields the animation frames, then schedules a full redraw of the final state."""
+        yield from batches
+        self.after_idle(self.show_final_frame)
+
+    def show_final_frame(self):
+        """Hands the frame artists back to normal drawing so they survive redraws once blitting stops."""
+        for artist in self.raster.artists:
+            artist.set_animated(False)
+        self.canvas.draw_idle()
+
+    def skip_to_end(self):
+        """Applies every remaining event at once and stops the animation."""
+        if not self.animation or not self.animation.event_source:
+            return
+        self.animation.pause()
+        self.animation = None
+        for batch in self.frames:
+            self.frame_update(batch)
+
+    def update_batch(self, path, batch):
+        """
+        Applies one frame's worth of search events.
+
+        :return: The artists to blit.
+        """
+        for event in batch:
+            artists = self.update_frame(path, event)
+        return artists
+
+    def update_frame(self, path, event):
+        """
+        Applies one search event: colors the entered cell in the grid image
+        or, on the GOAL event, shows the path. Only needs self.raster, so it
+        can also run headless.
+
+        :return: The artists to blit.
+        """
+        node, _, kind = event
+        if kind == GOAL:
+            if path:
+                self.raster.show_path(path)
+        else:
+            self.raster.mark(node.row, node.col)
+        return self.raster.artists
+
     def toggle_pause(self):
         if not self.animation:
             return
@@ -264,6 +520,7 @@ class DFSVisualizer(tk.Tk):
             self.animation.event_source.interval = int(val)
 
     def reset(self):
+        self.cancel_search()
         if self.animation and self.animation.event_source:
             self.animation.event_source.stop()
             self.animation = None
@@ -280,8 +537,10 @@ class DFSVisualizer(tk.Tk):
         self.obstacles_entry.insert(0, "2,2;2,3;2,4;3,4;4,4;5,4;6,4;6,3;6,2;5,2")
         self.time_label.config(text="Execution Time: ")
         self.memory_label.config(text="Memory Usage: ")
+        self.progress_label.config(text="")
         self.play_pause_button.config(text="Play/Pause")
         self.speed_slider.set(50)
+        self.duration_slider.set(DEFAULT_DURATION)
 
 if __name__ == "__main__":
     app = DFSVisualizer()
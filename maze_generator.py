@@ -0,0 +1,141 @@
+# maze_generator.py
+
+import numpy as np
+from graph_model import Cell
+
+def _default_exclude(grid_dims):
+    """Returns the usual start and goal corners, which must stay open."""
+    rows, cols = grid_dims
+    return [(0, 0), (rows - 1, cols - 1)]
+
+def random_obstacle_mask(grid_dims, density, seed=None, exclude=None):
+    """
+    Scatters obstacles uniformly at random, sampling cells without replacement.
+
+    Unlike drawing cells one at a time and retrying on duplicates, the cost
+    does not grow with the density: exactly int(rows * cols * density) cells
+    are drawn in one vectorized call.
+
+    :param grid_dims: Tuple (rows, cols) of grid dimensions.
+    :param density: The ratio of obstacles to total cells (0.0 to 1.0).
+    :param seed: Seed for NumPy's random generator, or None for fresh entropy.
+    :param exclude: Iterable of (row, col) cells that must stay open.
+                    Defaults to the corners (0, 0) and (rows - 1, cols - 1).
+    :return: uint8 array of shape (rows, cols); 1 marks an obstacle.
+    """
+    rows, cols = grid_dims
+    size = rows * cols
+    if exclude is None:
+        exclude = _default_exclude(grid_dims)
+    excluded = np.unique([r * cols + c for r, c in exclude if 0 <= r < rows and 0 <= c < cols]).astype(np.int64)
+    num_free = size - len(excluded)
+    num_obstacles = min(int(size * density), num_free)
+
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(num_free, size=num_obstacles, replace=False)
+    # Map positions among the free cells to flat indices by skipping excluded cells
+    picks += np.searchsorted(excluded - np.arange(len(excluded)), picks, side='right')
+
+    mask = np.zeros(size, dtype=np.uint8)
+    mask[picks] = 1
+    return mask.reshape(rows, cols)
+
+def backtracker_maze(grid_dims, seed=None):
+    """
+    Generates a perfect maze with the (iterative) recursive-backtracker algorithm.
+
+    Passages run between cells at even (row, col) coordinates, so (0, 0) and,
+    for odd dimensions, (rows - 1, cols - 1) lie on the maze. For even
+    dimensions the trailing row/column is left open so both corners stay
+    connected.
+
+    :param grid_dims: Tuple (rows, cols) of grid dimensions.
+    :param seed: Seed for NumPy's random generator.
+    :return: uint8 array of shape (rows, cols); 1 marks a wall.
+    """
+    rows, cols = grid_dims
+    mask = np.ones((rows, cols), dtype=np.uint8)
+    lattice_rows, lattice_cols = (rows + 1) // 2, (cols + 1) // 2
+    visited = bytearray(lattice_rows * lattice_cols)
+    # One random draw per carved passage, generated up front
+    choices = iter(np.random.default_rng(seed).random(lattice_rows * lattice_cols).tolist())
+
+    visited[0] = 1
+    mask[0, 0] = 0
+    stack = [(0, 0)]
+    while stack:
+        r, c = stack[-1]
+        options = [(nr, nc) for nr, nc in ((r - 1, c), (r, c - 1), (r, c + 1), (r + 1, c))
+                   if 0 <= nr < lattice_rows and 0 <= nc < lattice_cols and not visited[nr * lattice_cols + nc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = options[int(next(choices) * len(options))]
+        visited[nr * lattice_cols + nc] = 1
+        mask[r + nr, c + nc] = 0 # Wall between the two cells
+        mask[2 * nr, 2 * nc] = 0
+        stack.append((nr, nc))
+
+    if rows % 2 == 0:
+        mask[rows - 1, :] = 0
+    if cols % 2 == 0:
+        mask[:, cols - 1] = 0
+    return mask
+
+def corridor_maze(grid_dims, spacing=2, seed=None):
+    """
+    Generates horizontal corridors separated by walls with one random gap each.
+
+    :param grid_dims: Tuple (rows, cols) of grid dimensions.
+    :param spacing: Rows between consecutive walls (corridor height + 1).
+    :param seed: Seed for NumPy's random generator.
+    :return: uint8 array of shape (rows, cols); 1 marks a wall.
+    """
+    rows, cols = grid_dims
+    mask = np.zeros((rows, cols), dtype=np.uint8)
+    # Keep the last row open so the goal corner is never walled in
+    wall_rows = np.arange(spacing - 1, rows - 1, spacing)
+    mask[wall_rows, :] = 1
+    gaps = np.random.default_rng(seed).integers(0, cols, size=len(wall_rows))
+    mask[wall_rows, gaps] = 0
+    return mask
+
+def rooms_maze(grid_dims, room_size=8, seed=None):
+    """
+    Generates a grid of square rooms with one random door in every shared wall.
+
+    :param grid_dims: Tuple (rows, cols) of grid dimensions.
+    :param room_size: Interior side length of each room.
+    :param seed: Seed for NumPy's random generator.
+    :return: uint8 array of shape (rows, cols); 1 marks a wall.
+    """
+    rows, cols = grid_dims
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((rows, cols), dtype=np.uint8)
+    # Walls never sit on the last row/column, so the goal corner stays inside a room
+    wall_rows = np.arange(room_size, rows - 1, room_size + 1)
+    wall_cols = np.arange(room_size, cols - 1, room_size + 1)
+    mask[wall_rows, :] = 1
+    mask[:, wall_cols] = 1
+
+    row_starts = np.concatenate([[0], wall_rows + 1])
+    row_ends = np.concatenate([wall_rows, [rows]])
+    col_starts = np.concatenate([[0], wall_cols + 1])
+    col_ends = np.concatenate([wall_cols, [cols]])
+    # One door per wall segment between two neighboring rooms
+    for wall in wall_rows:
+        doors = rng.integers(col_starts, col_ends)
+        mask[wall, doors] = 0
+    for wall in wall_cols:
+        doors = rng.integers(row_starts, row_ends)
+        mask[doors, wall] = 0
+    return mask
+
+def obstacle_cells(mask):
+    """
+    Lists the obstacles of a mask as Cells, for create_graph_from_grid.
+
+    :param mask: 2D array; non-zero marks an obstacle.
+    :return: List of Cell objects in row-major order.
+    """
+    return [Cell(r, c) for r, c in np.argwhere(mask).tolist()]
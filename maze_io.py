@@ -0,0 +1,162 @@
+# maze_io.py
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+from graph_model import PackedGridGraph
+
+# Binary maze format: a fixed little-endian header followed by the obstacle
+# mask packed eight cells per byte in row-major order (np.packbits layout).
+MAGIC = b'DFSM'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHII') # magic, version, flags (reserved), rows, cols
+
+# Characters of the text format; anything else is read as open floor
+TEXT_WALLS = '#1X'
+
+def write_maze(path, mask):
+    """
+    Saves an obstacle mask in the binary maze format.
+
+    :param path: File to write.
+    :param mask: 2D array-like; non-zero marks an obstacle.
+    :return: Number of bytes written.
+    """
+    mask = np.asarray(mask)
+    if mask.ndim != 2 or 0 in mask.shape:
+        raise ValueError("Maze mask must be a non-empty two-dimensional array.")
+    rows, cols = mask.shape
+    packed = np.packbits(mask.reshape(-1) != 0)
+    with open(path, 'wb') as maze_file:
+        maze_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, rows, cols))
+        maze_file.write(packed.tobytes())
+    return HEADER.size + packed.nbytes
+
+def read_header(buffer):
+    """
+    Validates the header of a binary maze.
+
+    :param buffer: Bytes-like object holding at least the header and the packed mask.
+    :return: Tuple (rows, cols).
+    :raises ValueError: If the buffer is not a complete maze of a supported version.
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError("File is too short to be a maze.")
+    magic, version, _, rows, cols = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a maze file (bad magic number).")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported maze format version {version}.")
+    if len(buffer) < HEADER.size + (rows * cols + 7) // 8:
+        raise ValueError("Maze file is truncated.")
+    return rows, cols
+
+def open_maze(path, intern_cells=False):
+    """
+    Opens a binary maze as a graph without reading it into memory.
+
+    The file is memory-mapped copy-on-write: the OS pages in only the parts
+    of the mask a search touches, and obstacle edits on the returned graph
+    never reach the file.
+
+    :param path: Binary maze file written by write_maze.
+    :param intern_cells: Passed to PackedGridGraph.
+    :return: PackedGridGraph reading the mapped file.
+    """
+    with open(path, 'rb') as maze_file:
+        mapped = mmap.mmap(maze_file.fileno(), 0, access=mmap.ACCESS_COPY)
+    rows, cols = read_header(mapped)
+    return PackedGridGraph(mapped, rows, cols, offset=HEADER.size, intern_cells=intern_cells)
+
+def read_text_maze(path):
+    """
+    Reads a maze drawn as text, one line per row.
+
+    '#', '1' and 'X' are walls; any other character (such as '.' or ' ')
+    is open. Short lines are padded with open cells.
+
+    :param path: Text file.
+    :return: uint8 array of shape (rows, cols); 1 marks a wall.
+    """
+    with open(path) as text_file:
+        lines = text_file.read().splitlines()
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if not lines:
+        raise ValueError("Text maze is empty.")
+    mask = np.zeros((len(lines), max(len(line) for line in lines)), dtype=np.uint8)
+    for row, line in enumerate(lines):
+        mask[row, :len(line)] = [char in TEXT_WALLS for char in line]
+    return mask
+
+def read_image_maze(path, threshold=0.5):
+    """
+    Reads a maze from an image, one pixel per cell; dark pixels are walls.
+
+    :param path: Image file readable by matplotlib (PNG without extra packages).
+    :param threshold: Brightness (0 to 1) below which a pixel is a wall.
+    :return: uint8 array of shape (height, width); 1 marks a wall.
+    """
+    import matplotlib.image # Only needed for image imports
+
+    pixels = matplotlib.image.imread(path)
+    if pixels.dtype == np.uint8:
+        pixels = pixels / 255
+    if pixels.ndim == 3:
+        brightness = pixels[..., :3].mean(axis=2)
+        if pixels.shape[2] == 4:
+            brightness = np.where(pixels[..., 3] > 0, brightness, 1.0) # Transparent is open
+    else:
+        brightness = pixels
+    return (brightness < threshold).astype(np.uint8)
+
+def load_mask(path):
+    """
+    Reads a maze in any supported format into an unpacked mask.
+
+    The format is chosen by extension: .txt for text, .png (or other image
+    types) for images, anything else for the binary format.
+
+    :param path: Maze file.
+    :return: uint8 array of shape (rows, cols); 1 marks a wall.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.txt':
+        return read_text_maze(path)
+    if extension in ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff'):
+        return read_image_maze(path)
+    return open_maze(path).unpack_mask()
+
+def parse_args(argv=None):
+    """Parses the command-line options of the maze converter."""
+    parser = argparse.ArgumentParser(description="Convert and inspect maze files.")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subcommands.add_parser('convert', help="Convert a text, image or binary maze to the binary format.")
+    convert_parser.add_argument('source', help="Input maze (.txt, .png or binary).")
+    convert_parser.add_argument('target', help="Binary maze file to write.")
+
+    info_parser = subcommands.add_parser('info', help="Print the size and obstacle count of a binary maze.")
+    info_parser.add_argument('maze', help="Binary maze file.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = parse_args(argv)
+    if args.command == 'convert':
+        mask = load_mask(args.source)
+        size = write_maze(args.target, mask)
+        print(f"Wrote {mask.shape[0]}x{mask.shape[1]} maze to {args.target} ({size} bytes).")
+        return 0
+
+    graph = open_maze(args.maze)
+    obstacles = int(graph.mask.sum())
+    print(f"{graph.rows}x{graph.cols} maze, {obstacles} obstacles ({obstacles / len(graph):.1%}).")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+# path_cache.py
+
+import json
+import os
+import weakref
+from collections import OrderedDict, namedtuple
+
+from graph_model import Cell, mask_fingerprint
+from dfs_solver import run_search
+
+DEFAULT_MAX_ENTRIES = 1024
+CACHE_FORMAT_VERSION = 1
+
+# A cached search result: the path (list of Cells, or None) and how many nodes the search expanded
+CachedPath = namedtuple('CachedPath', ['path', 'nodes_expanded'])
+
+class PathCache:
+    """
+    Bounded LRU cache of search results keyed by grid content and endpoints.
+
+    Keys are (fingerprint, algorithm, start, goal), where the fingerprint is
+    mask_fingerprint of the obstacle layout, so identical grids share
+    entries however they were built. When at most max_entries are held, the
+    least recently used entry is evicted. An entry is only ever served for
+    the exact layout it was computed on, so it never goes stale: after an
+    edit the graph simply gets a new fingerprint, and the old layout's
+    entries stay valid for any graph (or later edit) that restores it until
+    the LRU drops them. hits, misses, evictions and invalidations count
+    cache activity for monitoring; see stats().
+
+    With a `path`, entries are loaded from that JSON file on creation and
+    written back by save().
+    """
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        """
+        :param max_entries: Maximum number of cached results.
+        :param path: Optional JSON file to load from and save to.
+        """
+        if max_entries < 1:
+            raise ValueError("The path cache must hold at least one entry.")
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict() # Key -> CachedPath with a tuple path, least recently used first
+        self._fingerprints = weakref.WeakKeyDictionary() # Graph -> (version, fingerprint)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    @staticmethod
+    def make_key(fingerprint, algorithm, start_node, goal_node):
+        """Builds the cache key of one query."""
+        return fingerprint, algorithm, tuple(start_node), tuple(goal_node)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Looks up a result and marks it as recently used.
+
+        :return: CachedPath with a fresh copy of the path, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return CachedPath(list(entry.path) if entry.path is not None else None, entry.nodes_expanded)
+
+    def put(self, key, path, nodes_expanded=0):
+        """
+        Stores a result, evicting the least recently used one if the cache is full.
+
+        :param key: Key from make_key.
+        :param path: List of Cells, or None if the goal is unreachable.
+        :param nodes_expanded: Nodes the search expanded, for callers that report it.
+        """
+        self._entries[key] = CachedPath(tuple(path) if path is not None else None, nodes_expanded)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, fingerprint):
+        """
+        Drops every entry of one obstacle layout, e.g. to free room when the
+        caller knows the layout will not come back.
+
+        :return: Number of entries dropped.
+        """
+        stale = [key for key in self._entries if key[0] == fingerprint]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        """Drops every entry; the counters are kept."""
+        self._entries.clear()
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        :return: Dictionary of hits, misses, evictions, invalidations, entries and hit_rate.
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations, 'entries': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def fingerprint(self, graph):
+        """
+        Returns the fingerprint of a grid graph's obstacle layout.
+
+        The hash is computed once per graph version.
+
+        :param graph: GridGraph (or subclass); dict graphs have no mask to hash.
+        :raises TypeError: If the graph has no obstacle mask.
+        """
+        if not hasattr(graph, 'mask'):
+            raise TypeError("Only grid graphs can be fingerprinted; pass mask_fingerprint(mask) with make_key instead.")
+        known = self._fingerprints.get(graph)
+        if known is not None and known[0] == graph.version:
+            return known[1]
+        fingerprint = mask_fingerprint(graph.mask)
+        self._fingerprints[graph] = (graph.version, fingerprint)
+        return fingerprint
+
+    def find_path(self, graph, start_node, goal_node, algorithm='iterative', components=None):
+        """
+        Answers a query from the cache, or runs run_search and caches its path.
+
+        :param graph: GridGraph (or subclass).
+        :param start_node: Starting Cell.
+        :param goal_node: Target Cell.
+        :param algorithm: Algorithm name accepted by run_search.
+        :param components: Optional ComponentIndex passed to run_search.
+        :return: CachedPath.
+        """
+        key = self.make_key(self.fingerprint(graph), algorithm, start_node, goal_node)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        path, history, _ = run_search(graph, start_node, goal_node, algorithm, components)
+        self.put(key, path, len(history))
+        return CachedPath(path, len(history))
+
+    def save(self, path=None):
+        """
+        Writes every entry, in LRU order, to a JSON file; the file is replaced atomically.
+
+        :param path: File to write; defaults to the path given at construction.
+        :return: Number of entries written.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No cache file given.")
+        entries = [{'fingerprint': fingerprint, 'algorithm': algorithm, 'start': list(start), 'goal': list(goal),
+                    'path': [list(cell) for cell in entry.path] if entry.path is not None else None,
+                    'nodes_expanded': entry.nodes_expanded}
+                   for (fingerprint, algorithm, start, goal), entry in self._entries.items()]
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as cache_file:
+            json.dump({'version': CACHE_FORMAT_VERSION, 'entries': entries}, cache_file)
+        os.replace(temporary, path)
+        return len(entries)
+
+    def load(self, path=None):
+        """
+        Adds the entries of a JSON file written by save(), keeping the LRU order.
+
+        :param path: File to read; defaults to the path given at construction.
+        :return: Number of entries read.
+        :raises ValueError: If the file is not a cache of a supported version
+                            or holds a malformed entry; no entry is added then.
+        """
+        path = path or self.path
+        with open(path) as cache_file:
+            data = json.load(cache_file)
+        if not isinstance(data, dict) or data.get('version') != CACHE_FORMAT_VERSION:
+            raise ValueError(f"{path} is not a path cache of version {CACHE_FORMAT_VERSION}.")
+        loaded = []
+        try:
+            for entry in data['entries']:
+                key = self.make_key(entry['fingerprint'], entry['algorithm'], entry['start'], entry['goal'])
+                path_cells = [Cell(*cell) for cell in entry['path']] if entry['path'] is not None else None
+                loaded.append((key, path_cells, entry['nodes_expanded']))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path} holds a malformed path cache entry: {e!r}") from e
+        for key, path_cells, nodes_expanded in loaded:
+            self.put(key, path_cells, nodes_expanded)
+        return len(loaded)
@@ -1,115 +1,286 @@
 # performance_analyzer.py
 
+import argparse
+import hashlib
+import os
 import time
 import tracemalloc
 import numpy as np
-import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from statistics import mean, stdev
 
 # Project-specific imports
-from graph_model import Cell, create_graph_from_grid
-from dfs_solver import find_path_recursive, dfs_iterative
+from graph_model import Cell, CellBitmap, GridGraph, create_graph_from_grid
+from dfs_solver import run_search, dfs_iterative, dfs_iterative_tree, reconstruct_path
+from maze_generator import random_obstacle_mask, obstacle_cells
+from benchmark_store import append_results
 
-def run_performance_test(grid_size, density, algorithm, num_runs=5):
+def trial_seed(base_seed, grid_size, density, run_index):
     """
-    Runs a performance test for a given DFS algorithm on a grid of specific
-    size and obstacle density.
+    Derives a deterministic per-trial seed. Every algorithm gets the same seed
+    for the same (grid size, density, run), so all of them search the same
+    maze, and results do not depend on which process runs the trial.
+    """
+    rows, cols = grid_size
+    key = f"{base_seed}:{rows}x{cols}:{density}:{run_index}".encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], 'little')
+
+PHASES = ['generate', 'build', 'search', 'reconstruct']
+
+def build_graph(grid_size, mask, graph_type):
+    """
+    Builds the searchable graph for an obstacle mask.
 
     :param grid_size: A tuple (rows, cols) for the grid dimensions.
-    :param density: The ratio of obstacles to total cells (0.0 to 1.0).
-    :param algorithm: A string, either 'recursive' or 'iterative'.
-    :param num_runs: The number of times to run the test to get an average.
-    :return: A dictionary containing the average metrics.
+    :param mask: uint8 obstacle mask from maze_generator.
+    :param graph_type: 'dict' for create_graph_from_grid, 'grid' for the array-backed GridGraph,
+                       'bitmap' for a GridGraph searched with a CellBitmap visited set.
+    """
+    if graph_type == 'dict':
+        return create_graph_from_grid(grid_size, obstacle_cells(mask))
+    if graph_type in ('grid', 'bitmap'):
+        return GridGraph(mask)
+    raise ValueError(f"Unknown graph type: {graph_type}")
+
+def _run_phases(grid_size, density, algorithm, seed, graph_type, phase_done):
+    """
+    Runs generation, graph build, search and path reconstruction once,
+    calling phase_done(name) as each phase finishes.
+
+    Only dfs_iterative separates the search from rebuilding the path; the
+    other engines carry the path while searching, so their reconstruct
+    phase is empty. With the 'bitmap' graph type the visited bitmap is
+    allocated inside the search phase, so its bytes count towards the
+    search peak, and dfs_iterative keeps no parent dict to reconstruct from.
+
+    :return: Tuple of (path, history, max_depth).
     """
     rows, cols = grid_size
     start_node = Cell(0, 0)
     goal_node = Cell(rows - 1, cols - 1)
 
-    times, memories, recursion_depths = [], [], []
+    mask = random_obstacle_mask(grid_size, density, seed, exclude=[(start_node.row, start_node.col), (goal_node.row, goal_node.col)])
+    phase_done('generate')
+    maze_graph = build_graph(grid_size, mask, graph_type)
+    phase_done('build')
 
-    print(f"Testing {algorithm} DFS on {rows}x{cols} grid with {density*100:.0f}% density...")
+    if graph_type == 'bitmap':
+        visited = CellBitmap.for_graph(maze_graph)
+        if algorithm == 'iterative':
+            path, history = dfs_iterative(maze_graph, start_node, goal_node, visited=visited)
+            max_depth = 0
+        else:
+            path, history, max_depth = run_search(maze_graph, start_node, goal_node, algorithm, visited=visited)
+        phase_done('search')
+    elif algorithm == 'iterative':
+        found, parent, history = dfs_iterative_tree(maze_graph, start_node, goal_node)
+        phase_done('search')
+        path = reconstruct_path(parent, goal_node) if found else None
+        max_depth = 0
+    else:
+        # The third return value is the max_depth integer (0 for bidirectional)
+        path, history, max_depth = run_search(maze_graph, start_node, goal_node, algorithm)
+        phase_done('search')
+    phase_done('reconstruct')
+    return path, history, max_depth
 
-    for i in range(num_runs):
-        # Generate a new random grid for each run
-        num_obstacles = int(rows * cols * density)
-        obstacles = set()
-        while len(obstacles) < num_obstacles:
-            r, c = random.randint(0, rows - 1), random.randint(0, cols - 1)
-            # Ensure start and goal are not obstacles
-            if (r, c) != (start_node.row, start_node.col) and (r, c) != (goal_node.row, goal_node.col):
-                obstacles.add(Cell(r, c))
-
-        maze_graph = create_graph_from_grid(grid_size, list(obstacles))
-
-        # Start measurements
-        tracemalloc.start()
-        start_time = time.perf_counter()
-
-        path = None
-        recursion_depth = 0
-
-        if algorithm == 'recursive':
-            # The third return value is the max_depth integer
-            path, _, max_depth = find_path_recursive(maze_graph, start_node, goal_node)
-            recursion_depth = max_depth
-        else: # iterative
-            path, _ = dfs_iterative(maze_graph, start_node, goal_node)
-            recursion_depth = 0 # Not applicable for iterative
-
-        end_time = time.perf_counter()
-        _, peak_mem = tracemalloc.get_traced_memory()
+def run_trial(grid_size, density, algorithm, seed, graph_type='dict'):
+    """
+    Runs one search on a freshly generated random grid and measures every phase.
+
+    Timings come from a run without tracemalloc, so tracing overhead never
+    inflates them; peak memory per phase comes from a second, traced run of
+    the same seeded trial.
+
+    :param grid_size: A tuple (rows, cols) for the grid dimensions.
+    :param density: The ratio of obstacles to total cells (0.0 to 1.0).
+    :param algorithm: A string, one of 'recursive', 'explicit', 'iterative' or 'bidirectional'.
+    :param seed: Seed for the obstacle layout (see trial_seed).
+    :param graph_type: 'dict', 'grid' or 'bitmap', see build_graph.
+    :return: A dictionary with time and memory_kb (search plus reconstruction, above
+             the memory in use once the graph is built),
+             per-phase '<phase>_time' / '<phase>_memory_kb' entries, depth,
+             nodes_expanded, nodes_per_sec and path_found.
+    """
+    # Timing run
+    marks = [time.perf_counter()]
+    path, history, max_depth = _run_phases(grid_size, density, algorithm, seed, graph_type,
+                                           lambda phase: marks.append(time.perf_counter()))
+    phase_times = dict(zip(PHASES, (end - start for start, end in zip(marks, marks[1:]))))
+
+    # Memory run. Each phase's peak is taken relative to the memory in use
+    # when the phase began, so earlier phases (the graph) are not counted again.
+    phase_peaks, phase_baselines = {}, {}
+    in_use = 0
+    def record_peak(phase):
+        nonlocal in_use
+        phase_baselines[phase] = in_use
+        in_use, phase_peaks[phase] = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+    tracemalloc.start()
+    try:
+        in_use = tracemalloc.get_traced_memory()[0]
+        _run_phases(grid_size, density, algorithm, seed, graph_type, record_peak)
+    finally:
         tracemalloc.stop()
+    phase_memory = {phase: (phase_peaks[phase] - phase_baselines[phase]) / 1024 for phase in PHASES} # Convert to KB
 
-        # If a path was found, store the results
-        if path:
-            times.append(end_time - start_time)
-            memories.append(peak_mem / 1024)  # Convert to KB
-            recursion_depths.append(recursion_depth)
-        else:
-            # If no path is found, the trial is invalid for performance timing
-            # but we print a note. A real-world scenario might handle this differently.
-            print(f"  - Run {i+1}/{num_runs}: No path found. Discarding result.")
+    trial = {
+        'time': phase_times['search'] + phase_times['reconstruct'],
+        # The reconstruct phase still holds what the search allocated
+        'memory_kb': (max(phase_peaks['search'], phase_peaks['reconstruct']) - phase_baselines['search']) / 1024,
+        'depth': max_depth,
+        'nodes_expanded': len(history),
+        'nodes_per_sec': len(history) / phase_times['search'] if phase_times['search'] > 0 else float('inf'),
+        'path_found': path is not None
+    }
+    for phase in PHASES:
+        trial[f'{phase}_time'] = phase_times[phase]
+        trial[f'{phase}_memory_kb'] = phase_memory[phase]
+    return trial
 
+def summarize_trials(trials):
+    """
+    Averages the trials in which a path was found.
 
-    # Calculate averages, handling cases where no paths were found
-    if not times:
+    :param trials: List of dictionaries returned by run_trial.
+    :return: A dictionary containing the average metrics.
+    """
+    # If no path is found, the trial is invalid for performance timing
+    found = [trial for trial in trials if trial['path_found']]
+    if not found:
         return {
             'avg_time': float('inf'),
             'avg_memory_kb': float('inf'),
             'avg_recursion_depth': float('inf'),
+            'avg_nodes_expanded': float('inf'),
+            'avg_nodes_per_sec': 0,
+            **{f'avg_{phase}_time': float('inf') for phase in PHASES},
             'std_time': 0,
             'path_found_ratio': 0
         }
 
+    times = [trial['time'] for trial in found]
     return {
         'avg_time': mean(times),
-        'avg_memory_kb': mean(memories),
-        'avg_recursion_depth': mean(recursion_depths) if algorithm == 'recursive' else 0,
+        'avg_memory_kb': mean(trial['memory_kb'] for trial in found),
+        'avg_recursion_depth': mean(trial['depth'] for trial in found),
+        'avg_nodes_expanded': mean(trial['nodes_expanded'] for trial in found),
+        'avg_nodes_per_sec': mean(trial['nodes_per_sec'] for trial in found),
+        **{f'avg_{phase}_time': mean(trial[f'{phase}_time'] for trial in found) for phase in PHASES},
         'std_time': stdev(times) if len(times) > 1 else 0,
-        'path_found_ratio': len(times) / num_runs
+        'path_found_ratio': len(found) / len(trials)
     }
 
-def main():
+def run_performance_test(grid_size, density, algorithm, num_runs=5, base_seed=0, graph_type='dict'):
+    """
+    Runs a performance test for a given DFS algorithm on a grid of specific
+    size and obstacle density.
+
+    :param grid_size: A tuple (rows, cols) for the grid dimensions.
+    :param density: The ratio of obstacles to total cells (0.0 to 1.0).
+    :param algorithm: A string, one of 'recursive', 'explicit', 'iterative' or 'bidirectional'.
+    :param num_runs: The number of times to run the test to get an average.
+    :param base_seed: Seed from which the per-run maze seeds are derived.
+    :param graph_type: 'dict', 'grid' or 'bitmap', see build_graph.
+    :return: A dictionary containing the average metrics.
+    """
+    rows, cols = grid_size
+    print(f"Testing {algorithm} DFS on {rows}x{cols} grid with {density*100:.0f}% density...")
+
+    trials = []
+    for i in range(num_runs):
+        trial = run_trial(grid_size, density, algorithm, trial_seed(base_seed, grid_size, density, i), graph_type)
+        if not trial['path_found']:
+            print(f"  - Run {i+1}/{num_runs}: No path found. Discarding result.")
+        trials.append(trial)
+    return summarize_trials(trials)
+
+def _init_worker(recursion_limit):
+    """Process-pool initializer: each worker needs its own recursion limit."""
+    sys.setrecursionlimit(recursion_limit)
+
+def _run_job(job):
+    """Unpacks a (grid_size, density, algorithm, seed, graph_type) job for Executor.map."""
+    return run_trial(*job)
+
+def run_sweep(grid_sizes, densities, algorithms, num_runs=5, base_seed=0, workers=1, graph_type='dict'):
+    """
+    Runs every (grid size, density, algorithm, run) trial, optionally across
+    a pool of worker processes.
+
+    Seeds are derived per trial and results are collected in job order, so a
+    parallel sweep searches the same mazes and reports the same paths, depths
+    and node counts as a serial one; only the timings differ.
+
+    :param grid_sizes: List of (rows, cols) tuples.
+    :param densities: List of obstacle densities.
+    :param algorithms: List of algorithm names accepted by run_search.
+    :param num_runs: Trials per (grid size, density, algorithm).
+    :param base_seed: Seed from which the per-trial maze seeds are derived.
+    :param workers: Number of worker processes; 1 runs everything in this process.
+    :param graph_type: 'dict', 'grid' or 'bitmap', see build_graph.
+    :return: Nested dict results[grid_size][density][algorithm] -> list of trial dicts.
+    """
+    jobs = [(size, density, algo, trial_seed(base_seed, size, density, run), graph_type)
+            for size in grid_sizes for density in densities for algo in algorithms for run in range(num_runs)]
+    # Recursive DFS can go as deep as the number of cells
+    recursion_limit = max(sys.getrecursionlimit(), max(rows * cols for rows, cols in grid_sizes) + 1000)
+
+    print(f"Running {len(jobs)} trials on {workers} worker(s)...")
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(recursion_limit,)) as pool:
+            trials = list(pool.map(_run_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        original_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(recursion_limit)
+        try:
+            trials = [_run_job(job) for job in jobs]
+        finally:
+            sys.setrecursionlimit(original_limit)
+
+    results = {size: {density: {algo: [] for algo in algorithms} for density in densities} for size in grid_sizes}
+    for (size, density, algo, _, _), trial in zip(jobs, trials):
+        results[size][density][algo].append(trial)
+    return results
+
+def parse_args(argv=None):
+    """Parses the command-line options of the benchmark sweep."""
+    parser = argparse.ArgumentParser(description="Benchmark the DFS solvers across grid sizes and obstacle densities.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 40, 60], help="Square grid sizes to test.")
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.1, 0.2, 0.3], help="Obstacle densities to test.")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per configuration.")
+    parser.add_argument('--seed', type=int, default=0, help="Base seed for maze generation.")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (0 uses every core).")
+    parser.add_argument('--graph', choices=['dict', 'grid', 'bitmap'], default='dict',
+                        help="Graph representation to search ('bitmap': GridGraph with a CellBitmap visited set).")
+    parser.add_argument('--store', metavar='PATH', help="Append every trial to this JSON lines results file (see benchmark_store.py).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Main function to define test parameters, run all tests, and print results.
     """
-    # Increase Python's recursion limit to handle deep paths in large grids.
-    # The max grid size is 60x60 = 3600 cells. A limit of 4000 is safe.
-    sys.setrecursionlimit(4000)
+    args = parse_args(argv)
+    grid_sizes = args.sizes
+    densities = args.densities
+    # 'explicit' replays the recursive order on an explicit stack
+    algorithms = ['recursive', 'explicit', 'iterative', 'bidirectional']
+    workers = args.workers or os.cpu_count()
 
-    grid_sizes = [20, 40, 60]
-    densities = [0.1, 0.2, 0.3]
-    algorithms = ['recursive', 'iterative']
+    trials = run_sweep([(size, size) for size in grid_sizes], densities, algorithms,
+                       num_runs=args.runs, base_seed=args.seed, workers=workers, graph_type=args.graph)
+    if args.store:
+        count = append_results(args.store, trials, graph_type=args.graph)
+        print(f"Stored {count} trials in {args.store}")
 
     # Store results in a nested dictionary: results[size][density][algo]
-    results = {size: {f"{int(d*100)}%": {} for d in densities} for size in grid_sizes}
-
-    for size in grid_sizes:
-        for density in densities:
-            for algo in algorithms:
-                metrics = run_performance_test((size, size), density, algo)
-                results[size][f"{int(density*100)}%"][algo] = metrics
+    d_keys = [f"{d*100:g}%" for d in densities]
+    results = {size: {d_key: {algo: summarize_trials(trials[(size, size)][density][algo]) for algo in algorithms}
+                      for d_key, density in zip(d_keys, densities)}
+               for size in grid_sizes}
+    density_header = " | ".join(f"{f'{d_key} Density':<20}" for d_key in d_keys)
 
     print("\n" + "="*80)
     print("PERFORMANCE ANALYSIS RESULTS")
@@ -119,12 +290,12 @@ def main():
     print("-" * 80)
     print("TABLE 1: Average Max Recursion Depth (Recursive DFS)")
     print("-" * 80)
-    header = f"{ 'Grid Size':<15} | { '10% Density':<20} | { '20% Density':<20} | { '30% Density':<20}"
+    header = f"{ 'Grid Size':<15} | {density_header}"
     print(header)
     print("-" * len(header))
     for size in grid_sizes:
         row = f"{ f'{size}x{size}':<15} | "
-        for d_key in ['10%', '20%', '30%']:
+        for d_key in d_keys:
             depth = results[size][d_key]['recursive']['avg_recursion_depth']
             row += f"{ f'{depth:.2f}':<20} | "
         print(row)
@@ -133,13 +304,13 @@ def main():
     print("\n" + "-" * 80)
     print("TABLE 2: Average Execution Time (seconds)")
     print("-" * 80)
-    header = f"{ 'Grid Size':<15} | { 'Algorithm':<12} | { '10% Density':<20} | { '20% Density':<20} | { '30% Density':<20}"
+    header = f"{ 'Grid Size':<15} | { 'Algorithm':<13} | {density_header}"
     print(header)
     print("-" * len(header))
     for size in grid_sizes:
         for algo in algorithms:
-            row = f"{ f'{size}x{size}':<15} | {algo:<12} | "
-            for d_key in ['10%', '20%', '30%']:
+            row = f"{ f'{size}x{size}':<15} | {algo:<13} | "
+            for d_key in d_keys:
                 time_val = results[size][d_key][algo]['avg_time']
                 row += f"{ f'{time_val:.4f}s':<20} | "
             print(row)
@@ -151,19 +322,60 @@ def main():
     print("\n" + "-" * 80)
     print("TABLE 3: Average Peak Memory Usage (KB)")
     print("-" * 80)
-    header = f"{ 'Grid Size':<15} | { 'Algorithm':<12} | { '10% Density':<20} | { '20% Density':<20} | { '30% Density':<20}"
+    header = f"{ 'Grid Size':<15} | { 'Algorithm':<13} | {density_header}"
     print(header)
     print("-" * len(header))
     for size in grid_sizes:
         for algo in algorithms:
-            row = f"{ f'{size}x{size}':<15} | {algo:<12} | "
-            for d_key in ['10%', '20%', '30%']:
+            row = f"{ f'{size}x{size}':<15} | {algo:<13} | "
+            for d_key in d_keys:
                 mem_val = results[size][d_key][algo]['avg_memory_kb']
                 row += f"{ f'{mem_val:.2f} KB':<20} | "
             print(row)
         if size != grid_sizes[-1]:
             print("-" * len(header))
 
+    # --- TABLE 4: Nodes Expanded ---
+    print("\n" + "-" * 80)
+    print("TABLE 4: Average Nodes Expanded (bidirectional change vs. iterative)")
+    print("-" * 80)
+    header = f"{ 'Grid Size':<15} | { 'Algorithm':<13} | {density_header}"
+    print(header)
+    print("-" * len(header))
+    for size in grid_sizes:
+        for algo in ['iterative', 'bidirectional']:
+            row = f"{ f'{size}x{size}':<15} | {algo:<13} | "
+            for d_key in d_keys:
+                nodes = results[size][d_key][algo]['avg_nodes_expanded']
+                if algo == 'bidirectional':
+                    baseline = results[size][d_key]['iterative']['avg_nodes_expanded']
+                    change = (nodes / baseline - 1) * 100 if 0 < baseline < float('inf') else 0
+                    row += f"{ f'{nodes:.1f} ({change:+.0f}%)':<20} | "
+                else:
+                    row += f"{ f'{nodes:.1f}':<20} | "
+            print(row)
+        if size != grid_sizes[-1]:
+            print("-" * len(header))
+
+    # --- TABLE 5: Phase Breakdown ---
+    print("\n" + "-" * 80)
+    print("TABLE 5: Average Phase Timings (ms) and Search Throughput")
+    print("-" * 80)
+    header = (f"{ 'Grid Size':<15} | { 'Density':<8} | { 'Algorithm':<13} | "
+              + " | ".join(f"{phase:<11}" for phase in PHASES) + f" | { 'Nodes/sec':<12}")
+    print(header)
+    print("-" * len(header))
+    for size in grid_sizes:
+        for d_key in d_keys:
+            for algo in algorithms:
+                metrics = results[size][d_key][algo]
+                row = f"{ f'{size}x{size}':<15} | {d_key:<8} | {algo:<13} | "
+                row += " | ".join(f"{metrics[f'avg_{phase}_time'] * 1000:<11.3f}" for phase in PHASES)
+                row += f" | {metrics['avg_nodes_per_sec']:<12,.0f}"
+                print(row)
+        if size != grid_sizes[-1]:
+            print("-" * len(header))
+
     print("\n" + "="*80)
 
 
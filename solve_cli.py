@@ -0,0 +1,188 @@
+# solve_cli.py
+
+import argparse
+import json
+import re
+import sys
+import time
+
+from graph_model import Cell, CellBitmap, GridGraph
+from dfs_solver import find_path_recursive, find_path_explicit_stack, dfs_iterative, dfs_bidirectional, CancellationToken
+from maze_io import open_maze, load_mask
+from tiled_grid import open_tiled_maze, DEFAULT_CACHE_TILES
+
+ENGINES = ['recursive', 'explicit', 'iterative', 'bidirectional']
+MAX_BITMAP_CELLS = 2 ** 28 # Larger grids use a set of visited cells rather than a whole-grid bitmap
+
+def load_graph(path, cache_tiles=DEFAULT_CACHE_TILES):
+    """
+    Opens a maze file as a graph: binary and tiled mazes are memory-mapped,
+    text and image mazes are read into a GridGraph.
+
+    :param cache_tiles: Resident tile limit for tiled (.tiles) mazes.
+    """
+    if path.lower().endswith('.maze'):
+        return open_maze(path)
+    if path.lower().endswith('.tiles'):
+        return open_tiled_maze(path, cache_tiles)
+    return GridGraph(load_mask(path))
+
+def parse_query(line):
+    """
+    Parses one query line of four integers: start row, start col, goal row, goal col.
+    Any mix of spaces, tabs and commas separates them.
+
+    :return: Tuple (start, goal) of Cells.
+    :raises ValueError: If the line does not hold exactly four integers.
+    """
+    fields = [field for field in re.split(r'[\s,]+', line.strip()) if field]
+    if len(fields) != 4:
+        raise ValueError(f"Expected 'start_row start_col goal_row goal_col', got {line.strip()!r}")
+    start_row, start_col, goal_row, goal_col = map(int, fields)
+    return Cell(start_row, start_col), Cell(goal_row, goal_col)
+
+def solve_query(graph, start_node, goal_node, engine, components=None, visited=None):
+    """
+    Runs one query with the chosen engine and measures it.
+
+    The recursive, explicit and iterative engines run without recording a
+    history; a CancellationToken counts their visited nodes instead.
+
+    :param visited: Optional CellBitmap for the single-ended engines; it is
+                    cleared (a generation bump) before the search, so one
+                    bitmap serves every query.
+    :return: Dictionary with found, path, path_length, nodes_expanded, max_depth and time (seconds).
+    """
+    token = CancellationToken()
+    start_time = time.perf_counter()
+    if visited is not None and engine != 'bidirectional':
+        visited.clear()
+    if engine == 'bidirectional':
+        path, history = dfs_bidirectional(graph, start_node, goal_node, components)
+        nodes_expanded, max_depth = len(history), 0
+    elif engine == 'iterative':
+        path, _ = dfs_iterative(graph, start_node, goal_node, components, record_history=False, token=token,
+                                visited=visited)
+        nodes_expanded, max_depth = token.nodes_visited, 0
+    else:
+        solve = find_path_recursive if engine == 'recursive' else find_path_explicit_stack
+        path, _, max_depth = solve(graph, start_node, goal_node, components, record_history=False, token=token,
+                                  visited=visited)
+        nodes_expanded = token.nodes_visited
+    elapsed = time.perf_counter() - start_time
+    return {
+        'found': path is not None,
+        'path': path,
+        'path_length': len(path) if path else 0,
+        'nodes_expanded': nodes_expanded,
+        'max_depth': max_depth,
+        'time': elapsed,
+    }
+
+def solve_stream(graph, lines, engine, components=None, include_path=True):
+    """
+    Answers a stream of query lines, yielding one JSON-serializable record per query.
+
+    Blank lines and lines starting with '#' are skipped. Malformed queries
+    and endpoints outside the maze yield a record with an 'error' key. The
+    single-ended engines share one CellBitmap visited set across queries,
+    unless the grid has more than MAX_BITMAP_CELLS cells.
+
+    :param graph: Graph to search.
+    :param lines: Iterable of query lines.
+    :param engine: One of ENGINES.
+    :param components: Optional ComponentIndex used to reject unreachable queries without searching.
+    :param include_path: If False, records omit the path itself.
+    :return: Generator of dicts.
+    """
+    visited = None
+    if engine != 'bidirectional' and len(graph) <= MAX_BITMAP_CELLS:
+        visited = CellBitmap.for_graph(graph)
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            start_node, goal_node = parse_query(line)
+        except ValueError as e:
+            yield {'line': line_number, 'error': str(e)}
+            continue
+        record = {'line': line_number, 'start': list(start_node), 'goal': list(goal_node)}
+        outside = [cell for cell in (start_node, goal_node) if cell not in graph]
+        if outside:
+            record['error'] = f"Cell {tuple(outside[0])} is outside the {graph.rows}x{graph.cols} maze"
+            yield record
+            continue
+        result = solve_query(graph, start_node, goal_node, engine, components, visited)
+        path = result.pop('path')
+        if include_path:
+            result['path'] = [list(cell) for cell in path] if path else None
+        record.update(result)
+        yield record
+
+def parse_args(argv=None):
+    """Parses the command-line options of the batch solver."""
+    parser = argparse.ArgumentParser(description="Solve (start, goal) queries on a maze file and print JSON lines.")
+    parser.add_argument('maze', help="Maze file (.maze binary, .txt or image).")
+    parser.add_argument('--queries', default='-', help="File of 'start_row start_col goal_row goal_col' lines ('-' for stdin).")
+    parser.add_argument('--output', default='-', help="JSON lines output file ('-' for stdout).")
+    parser.add_argument('--engine', choices=ENGINES, default='iterative', help="DFS variant to run.")
+    parser.add_argument('--components', action='store_true',
+                        help="Label connected components first to answer unreachable queries instantly.")
+    parser.add_argument('--no-path', action='store_true', help="Leave the path out of the output records.")
+    parser.add_argument('--tile-cache', type=int, default=DEFAULT_CACHE_TILES,
+                        help="Tiles kept in memory for tiled (.tiles) mazes.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Command-line entry point. Exits with status 1 if any query was malformed
+    or outside the maze (the other queries are still answered) and with
+    status 2 if the maze, the query file or the output file cannot be opened,
+    or if --components is given for a tiled maze too large to label.
+    """
+    args = parse_args(argv)
+    start_time = time.perf_counter()
+    try:
+        graph = load_graph(args.maze, args.tile_cache)
+    except (OSError, ValueError) as e:
+        print(f"Cannot open maze {args.maze}: {e}", file=sys.stderr)
+        return 2
+    if args.engine == 'recursive':
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), len(graph) + 1000))
+    try:
+        components = graph.components() if args.components else None
+    except ValueError as e:
+        print(f"Cannot label components of {args.maze}: {e}", file=sys.stderr)
+        return 2
+    print(f"Loaded {graph.rows}x{graph.cols} maze in {time.perf_counter() - start_time:.3f}s", file=sys.stderr)
+
+    try:
+        queries = sys.stdin if args.queries == '-' else open(args.queries)
+    except OSError as e:
+        print(f"Cannot open queries {args.queries}: {e}", file=sys.stderr)
+        return 2
+    try:
+        output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    except OSError as e:
+        if queries is not sys.stdin:
+            queries.close()
+        print(f"Cannot open output {args.output}: {e}", file=sys.stderr)
+        return 2
+    failures = 0
+    try:
+        for record in solve_stream(graph, queries, args.engine, components, include_path=not args.no_path):
+            failures += 'error' in record
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+    finally:
+        if queries is not sys.stdin:
+            queries.close()
+        if output is not sys.stdout:
+            output.close()
+    if hasattr(graph, 'tile_stats'):
+        stats = graph.tile_stats()
+        print(f"Tiles: {stats['loads']} loads, {stats['hits']} hits, {stats['evictions']} evictions", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
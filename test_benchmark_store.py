@@ -0,0 +1,64 @@
+# test_benchmark_store.py
+
+import os
+import tempfile
+import unittest
+from benchmark_store import append_results, load_results, compare, mann_whitney_greater, machine_fingerprint
+
+class TestBenchmarkStore(unittest.TestCase):
+    """
+    Unit tests for the JSON lines results store and regression detection.
+    """
+
+    @staticmethod
+    def _sweep(times, memory_kb=100.0):
+        """Builds a run_sweep-shaped result with one configuration."""
+        trials = [{'time': t, 'memory_kb': memory_kb, 'nodes_expanded': 10, 'path_found': True} for t in times]
+        return {(20, 20): {0.1: {'iterative': trials}}}
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_records_are_keyed_by_revision_and_machine(self):
+        """
+        Appended trials round-trip with their revision, machine and configuration.
+        """
+        append_results(self.path, self._sweep([1.0, 1.1]), revision='abc123', fingerprint='m1')
+        append_results(self.path, self._sweep([2.0]), revision='def456', fingerprint='m2')
+        records = load_results(self.path, revision='abc')
+        self.assertEqual(len(records), 2)
+        self.assertEqual((records[0]['grid_size'], records[0]['density'], records[0]['algorithm']), ('20x20', 0.1, 'iterative'))
+        self.assertEqual(len(load_results(self.path, fingerprint='m2')), 1)
+        self.assertEqual(len(machine_fingerprint()), 12)
+
+    def test_compare_flags_only_significant_regressions(self):
+        """
+        A consistent slowdown is flagged; noise and improvements are not.
+        """
+        baseline = [1.00, 1.02, 0.98, 1.01, 0.99, 1.00]
+        append_results(self.path, self._sweep(baseline), revision='base', fingerprint='m')
+        append_results(self.path, self._sweep([t * 1.3 for t in baseline], memory_kb=100.0), revision='slow', fingerprint='m')
+        append_results(self.path, self._sweep([1.01, 0.97, 1.03, 0.99, 1.02, 0.98]), revision='same', fingerprint='m')
+        append_results(self.path, self._sweep(baseline, memory_kb=150.0), revision='fat', fingerprint='m')
+
+        base = load_results(self.path, 'base')
+        slow = compare(base, load_results(self.path, 'slow'))
+        self.assertEqual([(r['metric'], r['key']) for r in slow], [('time', ('20x20', 0.1, 'iterative', 'dict'))])
+        self.assertEqual(compare(base, load_results(self.path, 'same')), [])
+        self.assertEqual(compare(load_results(self.path, 'slow'), base), [])
+        self.assertEqual([r['metric'] for r in compare(base, load_results(self.path, 'fat'))], ['memory_kb'])
+
+    def test_mann_whitney_greater(self):
+        """
+        The one-sided test is small for clearly larger samples and 1.0 for identical ones.
+        """
+        self.assertLess(mann_whitney_greater([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]), 0.01)
+        self.assertGreater(mann_whitney_greater([6, 7, 8, 9, 10], [1, 2, 3, 4, 5]), 0.99)
+        self.assertEqual(mann_whitney_greater([3, 3, 3], [3, 3, 3]), 1.0)
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,84 @@
+# test_cluster_graph.py
+
+import random
+import unittest
+import numpy as np
+from graph_model import Cell, GridGraph
+from dfs_solver import dfs_iterative
+from maze_generator import backtracker_maze, random_obstacle_mask
+from cluster_graph import ClusterGraph, find_path_hierarchical
+
+class TestClusterGraph(unittest.TestCase):
+    """
+    Unit tests for the hierarchical cluster index.
+    """
+
+    def assertValidPath(self, graph, path, start, goal):
+        self.assertEqual((path[0], path[-1]), (start, goal))
+        self.assertEqual(len(set(path)), len(path))
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, graph[a])
+
+    def test_matches_search_reachability(self):
+        """
+        Tests that the hierarchical search finds a simple, contiguous path
+        exactly when iterative DFS does, for several cluster sizes.
+        """
+        rng = random.Random(4)
+        for seed, cluster_size in [(1, 1), (2, 3), (3, 4), (4, 16)]:
+            mask = random_obstacle_mask((19, 23), 0.35, seed)
+            graph = GridGraph(mask)
+            clusters = ClusterGraph(graph, cluster_size)
+            for _ in range(40):
+                start = Cell(rng.randrange(19), rng.randrange(23))
+                goal = Cell(rng.randrange(19), rng.randrange(23))
+                path, history, max_depth = clusters.find_path(start, goal)
+                expected, _ = dfs_iterative(graph, start, goal)
+                self.assertEqual(path is None, expected is None, f"{start} -> {goal}, clusters of {cluster_size}")
+                if path:
+                    self.assertValidPath(graph, path, start, goal)
+                    self.assertEqual(max_depth, len(path) - 1)
+                    self.assertTrue(set(path) <= set(history))
+
+    def test_regions_and_entrances(self):
+        """
+        Tests that a wall splitting a cluster yields two regions, each linked to its neighbors.
+        """
+        mask = np.zeros((4, 8), dtype=np.uint8)
+        mask[:, 1] = 1 # Splits the left cluster into columns 0 and 2-3
+        clusters = ClusterGraph(GridGraph(mask), 4)
+        self.assertEqual(len(clusters.adjacency), 3)
+        left, middle, right = (clusters.region_of(Cell(0, col)) for col in (0, 2, 4))
+        self.assertEqual(clusters.adjacency[left], [])
+        self.assertEqual(clusters.adjacency[middle], [right])
+        self.assertEqual(clusters.region_of(Cell(0, 1)), -1)
+        self.assertEqual(find_path_hierarchical(clusters.graph, Cell(0, 0), Cell(3, 7), clusters=clusters),
+                         (None, [], 0))
+
+    def test_rebuilds_after_edits(self):
+        """
+        Tests that obstacle edits are picked up by the next query.
+        """
+        graph = GridGraph(backtracker_maze((21, 21), seed=2))
+        clusters = ClusterGraph(graph, 5)
+        start, goal = Cell(0, 0), Cell(20, 20)
+        path, _, _ = clusters.find_path(start, goal, record_history=False)
+        graph.add_obstacle(path[len(path) // 2]) # A perfect maze has no second route
+        self.assertEqual(clusters.find_path(start, goal, record_history=False), (None, None, 0))
+        graph.remove_obstacle(path[len(path) // 2])
+        self.assertEqual(clusters.find_path(start, goal, record_history=False)[0], path)
+
+    def test_edge_cases(self):
+        """
+        Tests start equal to goal (also on a wall), blocked endpoints and cells outside the grid.
+        """
+        graph = GridGraph(backtracker_maze((9, 9), seed=3))
+        clusters = ClusterGraph(graph, 4)
+        self.assertEqual(clusters.find_path(Cell(2, 2), Cell(2, 2)), ([Cell(2, 2)], [Cell(2, 2)], 0))
+        self.assertEqual(clusters.find_path(Cell(0, 0), Cell(1, 1)), (None, [], 0)) # (1, 1) is a wall
+        self.assertEqual(clusters.find_path(Cell(1, 1), Cell(1, 1)), dfs_iterative(graph, Cell(1, 1), Cell(1, 1)) + (0,))
+        self.assertEqual(clusters.find_path(Cell(1, 1), Cell(1, 1), record_history=False), ([Cell(1, 1)], None, 0))
+        self.assertEqual(clusters.find_path(Cell(0, 0), Cell(9, 0)), (None, [], 0))
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
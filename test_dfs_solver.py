@@ -1,8 +1,12 @@
 # test_dfs_solver.py
 
+import random
+import sys
 import unittest
-from graph_model import Cell, create_graph_from_grid
-from dfs_solver import find_path_recursive, dfs_iterative
+from graph_model import Cell, CellBitmap, create_graph_from_grid, create_grid_graph
+from dfs_solver import find_path_recursive, dfs_iterative, find_path_explicit_stack, solve_batch, SearchWorkspace, IncrementalSolver, dfs_bidirectional
+from dfs_solver import dfs_events, dfs_iterative_events, ENTER, BACKTRACK, GOAL, CancellationToken, SearchCancelled
+from dfs_solver import find_path_guided, run_search
 
 class TestDFSSolver(unittest.TestCase):
     """
@@ -207,6 +211,276 @@ class TestDFSSolver(unittest.TestCase):
 
         self._run_dfs_tests(maze_graph, start, goal, ['(0, 0)', '(5, 5)'], "Complex Maze", check_exact_path=False)
 
+    def test_iterative_matches_path_copy_reference(self):
+        """
+        Tests that parent-pointer reconstruction keeps the visitation order and
+        path of the original path-copying iterative DFS.
+        """
+        def reference_dfs(graph, start, goal):
+            stack = [(start, [start])]
+            visited = {start}
+            history = []
+            while stack:
+                node, path = stack.pop()
+                history.append(node)
+                if node == goal:
+                    return path, history
+                for neighbor in reversed(graph.get(node, [])):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        stack.append((neighbor, path + [neighbor]))
+            return None, history
+
+        obstacles_cells = [Cell(*o) for o in [(0, 2), (1, 2), (2, 2), (3, 0), (3, 1), (4, 3)]]
+        maze_graph = create_graph_from_grid((6, 6), obstacles_cells)
+        for goal in [Cell(5, 5), Cell(0, 5), Cell(4, 3)]:
+            self.assertEqual(dfs_iterative(maze_graph, self.start_node, goal),
+                             reference_dfs(maze_graph, self.start_node, goal))
+
+    def test_explicit_stack_matches_recursive(self):
+        """
+        Tests that the explicit-stack engine reproduces the recursive path,
+        history and max depth, including when no path exists.
+        """
+        obstacles_cells = [Cell(*o) for o in [(0, 2), (1, 2), (2, 2), (3, 0), (3, 1), (4, 3)]]
+        maze_graph = create_graph_from_grid((6, 6), obstacles_cells)
+        for goal in [Cell(5, 5), Cell(0, 5), Cell(4, 3), Cell(2, 1)]:
+            self.assertEqual(find_path_explicit_stack(maze_graph, self.start_node, goal),
+                             find_path_recursive(maze_graph, self.start_node, goal))
+
+    def test_explicit_stack_beyond_recursion_limit(self):
+        """
+        Tests that the explicit-stack engine handles paths deeper than the
+        interpreter recursion limit.
+        """
+        rows, cols = 150, 150
+        maze_graph = create_graph_from_grid((rows, cols), [])
+        path, history, max_depth = find_path_explicit_stack(maze_graph, Cell(0, 0), Cell(rows - 1, cols - 1))
+        self.assertIsNotNone(path)
+        self.assertEqual(path[-1], Cell(rows - 1, cols - 1))
+        self.assertGreater(max_depth, sys.getrecursionlimit())
+        self.assertEqual(max_depth, len(path) - 1)
+
+    def test_batch_matches_single_queries(self):
+        """
+        Tests that the batch solver returns the dfs_iterative path for every
+        query, on both the dict graph and the GridGraph.
+        """
+        obstacles_cells = [Cell(*o) for o in [(0, 2), (1, 2), (2, 2), (3, 0), (3, 1), (4, 3)]]
+        queries = [(Cell(0, 0), Cell(5, 5)), (Cell(5, 5), Cell(0, 0)), (Cell(0, 0), Cell(4, 3)),
+                   (Cell(1, 1), Cell(1, 1)), (Cell(4, 4), Cell(0, 5)), (Cell(0, 0), Cell(9, 9))]
+        for graph in [create_graph_from_grid((6, 6), obstacles_cells), create_grid_graph((6, 6), obstacles_cells)]:
+            results = list(solve_batch(graph, queries))
+            self.assertEqual(len(results), len(queries))
+            for start, goal, path in results:
+                expected, _ = dfs_iterative(graph, start, goal)
+                self.assertEqual(path, expected, f"Batch mismatch for {start} -> {goal}")
+
+    def test_workspace_reuses_buffers(self):
+        """
+        Tests that consecutive queries advance the generation instead of
+        reallocating the visited buffer.
+        """
+        graph = create_grid_graph(self.grid_dims, [])
+        workspace = SearchWorkspace(graph)
+        stamp = workspace.stamp
+        first = workspace.find_path(self.start_node, self.goal_node)
+        second = workspace.find_path(self.goal_node, self.start_node)
+        self.assertEqual(first[0], self.start_node)
+        self.assertEqual(second[-1], self.start_node)
+        self.assertIs(workspace.stamp, stamp)
+        self.assertEqual(workspace.generation, 2)
+
+    def test_incremental_solver_matches_fresh_search(self):
+        """
+        Tests that repairing the previous DFS tree after each obstacle edit
+        gives the same path and history as searching the edited grid from scratch.
+        """
+        rng = random.Random(11)
+        graph = create_grid_graph((7, 7), [Cell(*o) for o in [(1, 1), (2, 3), (4, 2), (5, 5)]])
+        goal = Cell(6, 6)
+        solver = IncrementalSolver(graph, self.start_node, goal)
+        solver.solve()
+        for _ in range(40):
+            cell = Cell(rng.randrange(7), rng.randrange(7))
+            if rng.random() < 0.6:
+                path, history = solver.add_obstacle(cell)
+            else:
+                path, history = solver.remove_obstacle(cell)
+            fresh = create_grid_graph((7, 7), [c for c in graph if graph.is_blocked(c)])
+            expected_path, expected_history, _ = find_path_explicit_stack(fresh, self.start_node, goal)
+            self.assertEqual(path, expected_path, f"Path mismatch after editing {cell}")
+            self.assertEqual(history, expected_history, f"History mismatch after editing {cell}")
+
+    def test_incremental_solver_keeps_unaffected_result(self):
+        """
+        Tests that a wall outside the explored region leaves the result untouched.
+        """
+        graph = create_grid_graph((1, 5), [])
+        solver = IncrementalSolver(graph, Cell(0, 0), Cell(0, 2))
+        path, history = solver.solve()
+        self.assertEqual(solver.add_obstacle(Cell(0, 4)), (path, history))
+        self.assertIsNone(solver.add_obstacle(Cell(0, 1))[0])
+        self.assertEqual(len(solver.remove_obstacle(Cell(0, 1))[0]), 3)
+
+    def test_bidirectional_finds_valid_paths(self):
+        """
+        Tests that bidirectional DFS agrees with iterative DFS on whether a
+        path exists and that every path it returns is a contiguous walk.
+        """
+        rng = random.Random(5)
+        for _ in range(30):
+            obstacles_cells = [Cell(rng.randrange(8), rng.randrange(8)) for _ in range(18)]
+            obstacles_cells = [c for c in obstacles_cells if c not in (Cell(0, 0), Cell(7, 7))]
+            maze_graph = create_graph_from_grid((8, 8), obstacles_cells)
+            path, history = dfs_bidirectional(maze_graph, Cell(0, 0), Cell(7, 7))
+            expected, _ = dfs_iterative(maze_graph, Cell(0, 0), Cell(7, 7))
+            self.assertEqual(path is None, expected is None)
+            if path:
+                self.assertEqual((path[0], path[-1]), (Cell(0, 0), Cell(7, 7)))
+                self.assertEqual(len(set(path)), len(path))
+                for a, b in zip(path, path[1:]):
+                    self.assertIn(b, maze_graph[a])
+
+    def test_guided_search_walks_shortest_path(self):
+        """
+        Tests that the distance-guided DFS finds paths exactly when iterative DFS does,
+        that they are shortest, and that it never enters a cell off the path.
+        """
+        rng = random.Random(9)
+        for _ in range(30):
+            obstacles_cells = [Cell(rng.randrange(8), rng.randrange(8)) for _ in range(18)]
+            obstacles_cells = [c for c in obstacles_cells if c not in (Cell(0, 0), Cell(7, 7))]
+            maze_graph = create_grid_graph((8, 8), obstacles_cells)
+            distances = maze_graph.distance_field([Cell(7, 7)])
+            path, history, max_depth = find_path_guided(maze_graph, Cell(0, 0), Cell(7, 7))
+            expected, _ = dfs_iterative(maze_graph, Cell(0, 0), Cell(7, 7))
+            self.assertEqual(path is None, expected is None)
+            if path:
+                self.assertEqual(len(path) - 1, distances[0, 0])
+                self.assertEqual((history, max_depth), (path, len(path) - 1))
+                for a, b in zip(path, path[1:]):
+                    self.assertIn(b, maze_graph[a])
+            else:
+                self.assertEqual(history, [])
+        self.assertEqual(run_search(maze_graph, Cell(7, 7), Cell(7, 7), 'guided'), ([Cell(7, 7)], [Cell(7, 7)], 0))
+        for start, goal in [(Cell(0, 0), Cell(8, 0)), (Cell(0, 0), Cell(-1, 3)), (Cell(0, -1), Cell(7, 7))]:
+            self.assertEqual(find_path_guided(maze_graph, start, goal), (None, [], 0))
+        # Start equal to the goal is a one-cell path for every engine, even on a wall
+        walled = create_grid_graph((5, 5), [Cell(2, 2)])
+        for algorithm in ('recursive', 'explicit', 'iterative', 'bidirectional', 'guided'):
+            for components in (None, walled.components()):
+                self.assertEqual(run_search(walled, Cell(2, 2), Cell(2, 2), algorithm, components),
+                                 ([Cell(2, 2)], [Cell(2, 2)], 0), algorithm)
+        open_graph = create_grid_graph((8, 8), [])
+        visited = CellBitmap.for_graph(open_graph)
+        path, _, _ = run_search(open_graph, Cell(0, 0), Cell(7, 7), 'guided', visited=visited)
+        self.assertEqual(len(visited), len(path))
+
+    def test_bidirectional_expands_fewer_nodes_corner_to_corner(self):
+        """
+        Tests that meeting in the middle expands fewer nodes than a
+        single-ended search on an open corner-to-corner query.
+        """
+        maze_graph = create_graph_from_grid((30, 30), [])
+        _, bidirectional_history = dfs_bidirectional(maze_graph, Cell(0, 0), Cell(29, 29))
+        _, iterative_history = dfs_iterative(maze_graph, Cell(0, 0), Cell(29, 29))
+        self.assertLess(len(bidirectional_history), len(iterative_history))
+
+    def _replay_events(self, events):
+        """
+        Replays an event stream, checking that every ENTER extends the branch
+        and every BACKTRACK leaves its tip. Returns (entered, branch, reached_goal).
+        """
+        entered, branch, reached_goal = [], [], False
+        for node, depth, kind in events:
+            self.assertFalse(reached_goal, "No events may follow GOAL")
+            if kind == ENTER:
+                self.assertEqual(depth, len(branch))
+                branch.append(node)
+                entered.append(node)
+            elif kind == BACKTRACK:
+                self.assertEqual(branch.pop(), node)
+                self.assertEqual(depth, len(branch))
+            else:
+                self.assertEqual(kind, GOAL)
+                self.assertEqual((node, depth), (branch[-1], len(branch) - 1))
+                reached_goal = True
+        return entered, branch, reached_goal
+
+    def test_event_streams_match_list_results(self):
+        """
+        Tests that the streamed ENTER events are exactly the history, and that
+        the branch rebuilt from the events is the returned path.
+        """
+        maze_graph = create_graph_from_grid((8, 8), [Cell(*o) for o in [(0, 2), (1, 2), (2, 2), (3, 0), (3, 1), (4, 3), (6, 6), (6, 7)]])
+        for goal in [Cell(7, 7), Cell(0, 5), Cell(4, 3), Cell(0, 0)]:
+            for stream, solve in [(dfs_events, lambda g, s, t: find_path_explicit_stack(g, s, t)[:2]),
+                                  (dfs_iterative_events, dfs_iterative)]:
+                with self.subTest(goal=goal, stream=stream.__name__):
+                    path, history = solve(maze_graph, self.start_node, goal)
+                    entered, branch, reached_goal = self._replay_events(stream(maze_graph, self.start_node, goal))
+                    self.assertEqual(entered, history)
+                    self.assertEqual(reached_goal, path is not None)
+                    self.assertEqual(branch, path if path is not None else [])
+
+    def test_record_history_opt_out(self):
+        """
+        Tests that searches without history return the same path and None for history.
+        """
+        maze_graph = create_graph_from_grid((6, 6), [Cell(*o) for o in [(0, 2), (1, 2), (2, 2), (3, 0), (3, 1)]])
+        for goal in [Cell(5, 5), Cell(0, 2)]:
+            self.assertEqual(dfs_iterative(maze_graph, self.start_node, goal, record_history=False),
+                             (dfs_iterative(maze_graph, self.start_node, goal)[0], None))
+            for solve in (find_path_recursive, find_path_explicit_stack):
+                path, history, max_depth = solve(maze_graph, self.start_node, goal, record_history=False)
+                self.assertIsNone(history)
+                self.assertEqual((path, max_depth), solve(maze_graph, self.start_node, goal)[::2])
+
+    def test_bitmap_visited_matches_set(self):
+        """
+        Tests that searches with a reused CellBitmap return the same results as with a set.
+        """
+        maze_graph = create_grid_graph((6, 6), [Cell(*o) for o in [(0, 2), (1, 2), (2, 2), (3, 0), (3, 1), (4, 4)]])
+        visited = CellBitmap.for_graph(maze_graph)
+        for goal in [Cell(5, 5), Cell(0, 3), Cell(0, 2), self.start_node]:
+            for solve in (find_path_recursive, find_path_explicit_stack, dfs_iterative):
+                visited.clear()
+                self.assertEqual(solve(maze_graph, self.start_node, goal, visited=visited),
+                                 solve(maze_graph, self.start_node, goal), f"{solve.__name__} to {goal}")
+
+    def test_cancellation_token_reports_progress(self):
+        """
+        Tests that a search with an uncancelled token returns the usual result
+        and leaves the token counting every visited node.
+        """
+        maze_graph = create_graph_from_grid((6, 6), [Cell(*o) for o in [(0, 2), (1, 2), (2, 2), (3, 0), (3, 1)]])
+        goal = Cell(5, 5)
+        for solve in (find_path_recursive, find_path_explicit_stack, dfs_iterative):
+            with self.subTest(solve=solve.__name__):
+                token = CancellationToken()
+                result = solve(maze_graph, self.start_node, goal, token=token)
+                self.assertEqual(result, solve(maze_graph, self.start_node, goal))
+                self.assertEqual(token.nodes_visited, len(result[1]))
+
+    def test_cancelled_search_stops(self):
+        """
+        Tests that cancelling a token stops each search at its next node.
+        """
+        class CancelAfter(CancellationToken):
+            def check(self, nodes_visited, depth):
+                if nodes_visited == 10:
+                    self.cancel()
+                super().check(nodes_visited, depth)
+
+        maze_graph = create_graph_from_grid((20, 20), [])
+        for solve in (find_path_recursive, find_path_explicit_stack, dfs_iterative):
+            with self.subTest(solve=solve.__name__):
+                token = CancelAfter()
+                with self.assertRaises(SearchCancelled):
+                    solve(maze_graph, self.start_node, Cell(19, 19), token=token)
+                self.assertEqual(token.nodes_visited, 10)
+
 # This block allows you to run the tests directly from the command line
 if __name__ == '__main__':
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
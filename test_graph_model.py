@@ -0,0 +1,302 @@
+# test_graph_model.py
+
+import unittest
+from unittest import mock
+import numpy as np
+from graph_model import Cell, create_graph_from_grid, create_grid_graph, GridGraph, ComponentIndex, label_components, mask_fingerprint
+from graph_model import CellBitmap, distance_field
+from dfs_solver import find_path_recursive, dfs_iterative
+
+class TestCell(unittest.TestCase):
+    """
+    Unit tests for the compact, immutable Cell representation.
+    """
+
+    def test_api_compatibility(self):
+        """
+        Cells keep .row/.col access, value equality, hashing and the "(r, c)" repr.
+        """
+        cell = Cell(2, 3)
+        self.assertEqual((cell.row, cell.col), (2, 3))
+        self.assertEqual(cell, Cell(2, 3))
+        self.assertNotEqual(cell, Cell(3, 2))
+        self.assertEqual(len({cell, Cell(2, 3)}), 1)
+        self.assertEqual(repr(cell), "(2, 3)")
+        self.assertEqual(str([Cell(0, 1)]), "[(0, 1)]")
+
+    def test_compact_and_immutable(self):
+        """
+        Cells carry no instance __dict__ and cannot be modified.
+        """
+        cell = Cell(1, 1)
+        self.assertFalse(hasattr(cell, '__dict__'))
+        with self.assertRaises(AttributeError):
+            cell.row = 5
+
+    def test_interned_cells_are_shared(self):
+        """
+        A grid built with intern_cells hands out the same object for the same cell.
+        """
+        grid = create_grid_graph((3, 3), [], intern_cells=True)
+        self.assertIs(grid.cell_at(4), grid.cell_at(4))
+        self.assertIs(grid.neighbors(Cell(0, 1))[-1], grid.neighbors(Cell(2, 1))[0])
+        self.assertEqual(grid.neighbors(Cell(1, 1)), create_grid_graph((3, 3), []).neighbors(Cell(1, 1)))
+
+class TestGridGraph(unittest.TestCase):
+    """
+    Unit tests for the array-backed GridGraph and its compatibility with the
+    legacy dict adjacency list.
+    """
+
+    def setUp(self):
+        """
+        Builds the same obstacle layout as both a legacy dict and a GridGraph.
+        """
+        self.grid_dims = (6, 6)
+        self.obstacles = [Cell(*o) for o in [(0, 1), (1, 1), (2, 1), (3, 1), (4, 1),
+                                             (1, 3), (2, 3), (3, 3), (4, 3), (5, 3),
+                                             (1, 4), (2, 4), (3, 4), (4, 4)]]
+        self.legacy = create_graph_from_grid(self.grid_dims, self.obstacles)
+        self.grid = create_grid_graph(self.grid_dims, self.obstacles)
+
+    def test_neighbors_match_legacy_graph(self):
+        """
+        Every cell must have the same neighbors, in the same order, as the dict graph.
+        """
+        self.assertEqual(len(self.grid), len(self.legacy))
+        for cell, neighbors in self.legacy.items():
+            self.assertEqual(self.grid.get(cell, []), neighbors, f"Neighbor mismatch at {cell}")
+
+    def test_mask_is_one_byte_per_cell(self):
+        """
+        The obstacle mask should be a uint8 array with one entry per cell.
+        """
+        self.assertEqual(self.grid.mask.dtype, np.uint8)
+        self.assertEqual(self.grid.mask.nbytes, 36)
+        self.assertEqual(int(self.grid.mask.sum()), len(self.obstacles))
+
+    def test_out_of_bounds_lookup(self):
+        """
+        Cells outside the grid behave like missing dict keys.
+        """
+        self.assertIsNone(self.grid.get(Cell(-1, 0)))
+        self.assertEqual(self.grid.get(Cell(6, 0), []), [])
+        self.assertNotIn(Cell(0, 6), self.grid)
+        with self.assertRaises(KeyError):
+            self.grid[Cell(10, 10)]
+
+    def test_solvers_accept_grid_graph(self):
+        """
+        Both solvers return identical results on the dict and the GridGraph.
+        """
+        start, goal = Cell(0, 0), Cell(5, 5)
+        self.assertEqual(find_path_recursive(self.grid, start, goal),
+                         find_path_recursive(self.legacy, start, goal))
+        self.assertEqual(dfs_iterative(self.grid, start, goal),
+                         dfs_iterative(self.legacy, start, goal))
+
+    def test_edits_outside_the_grid_are_rejected(self):
+        """
+        Tests that obstacle edits outside the grid raise instead of wrapping onto another cell.
+        """
+        grid = GridGraph(np.zeros((3, 3), dtype=np.uint8))
+        for cell in [Cell(1, -1), Cell(-1, 0), Cell(3, 0), Cell(0, 3)]:
+            with self.assertRaises(ValueError):
+                grid.add_obstacle(cell)
+            with self.assertRaises(ValueError):
+                grid.remove_obstacle(cell)
+        self.assertFalse(grid.mask.any())
+        self.assertEqual(grid.version, 0)
+
+    def test_from_mask(self):
+        """
+        A GridGraph can be constructed directly from a boolean mask.
+        """
+        mask = np.zeros((3, 4), dtype=bool)
+        mask[1, :3] = True
+        grid = GridGraph(mask)
+        self.assertEqual((grid.rows, grid.cols), (3, 4))
+        self.assertTrue(grid.is_blocked(Cell(1, 0)))
+        self.assertEqual(grid.neighbor_indices(grid.index_of(Cell(0, 3))), [2, 7])
+
+    def test_mask_fingerprint(self):
+        """
+        Tests that fingerprints depend on the obstacle layout and shape only.
+        """
+        mask = np.zeros((4, 6), dtype=np.uint8)
+        mask[1, 2] = 1
+        same = mask.astype(bool) * 7
+        moved = np.zeros_like(mask)
+        moved[2, 1] = 1
+        self.assertEqual(mask_fingerprint(mask), mask_fingerprint(same))
+        self.assertNotEqual(mask_fingerprint(mask), mask_fingerprint(moved))
+        self.assertNotEqual(mask_fingerprint(np.zeros((4, 6))), mask_fingerprint(np.zeros((6, 4))))
+
+    def test_cell_bitmap_is_a_reusable_visited_set(self):
+        """
+        Tests that CellBitmap behaves like a set of cells and is empty again after clear().
+        """
+        visited = CellBitmap(3, 4)
+        self.assertEqual(len(visited.marks), 12)
+        visited.add(Cell(2, 3))
+        visited.add(Cell(0, 1))
+        visited.add(Cell(0, 1))
+        self.assertIn(Cell(2, 3), visited)
+        self.assertIn((0, 1), visited)
+        self.assertNotIn(Cell(1, 0), visited)
+        self.assertEqual(len(visited), 2)
+        visited.discard(Cell(2, 3))
+        self.assertNotIn(Cell(2, 3), visited)
+        visited.clear()
+        self.assertEqual(len(visited), 0)
+        self.assertNotIn((0, 1), visited)
+        # Clearing only bumps the generation; old marks must not reappear when it wraps around
+        for search in range(600):
+            self.assertNotIn(Cell(1, search % 4), visited)
+            visited.add(Cell(1, search % 4))
+            self.assertEqual(len(visited), 1)
+            visited.clear()
+        self.assertEqual(len(visited), 0)
+
+class TestComponentIndex(unittest.TestCase):
+    """
+    Unit tests for connected-component labeling and O(1) reachability checks.
+    """
+
+    def test_labels_match_search_reachability(self):
+        """
+        Two open cells share a label exactly when iterative DFS connects them.
+        """
+        rng = np.random.default_rng(7)
+        mask = (rng.random((12, 15)) < 0.4).astype(np.uint8)
+        grid = GridGraph(mask)
+        legacy = create_graph_from_grid((12, 15), [Cell(r, c) for r, c in np.argwhere(mask)])
+        index = grid.components()
+        legacy_index = ComponentIndex(legacy)
+        start = Cell(*np.argwhere(mask == 0)[0])
+        for cell in grid:
+            path, _ = dfs_iterative(grid, start, cell)
+            reachable = path is not None and not grid.is_blocked(cell)
+            self.assertEqual(index.connected(start, cell), reachable, f"Reachability mismatch at {cell}")
+            self.assertEqual(legacy_index.connected(start, cell), reachable, f"Dict index mismatch at {cell}")
+
+    def test_distance_field_matches_search_reachability(self):
+        """
+        Cells get a distance exactly when DFS reaches them, and distances step by one between neighbors.
+        """
+        rng = np.random.default_rng(11)
+        mask = (rng.random((12, 15)) < 0.35).astype(np.uint8)
+        grid = GridGraph(mask)
+        goal = Cell(*np.argwhere(mask == 0)[-1])
+        distances = grid.distance_field([goal])
+        self.assertEqual(distances[goal], 0)
+        for cell in grid:
+            path, _ = dfs_iterative(grid, cell, goal)
+            reachable = path is not None and not grid.is_blocked(cell)
+            self.assertEqual(distances[cell] >= 0, reachable, f"Reachability mismatch at {cell}")
+            if reachable and cell != goal:
+                self.assertEqual(min(distances[n] for n in grid.neighbors(cell)), distances[cell] - 1)
+
+    def test_distance_field_sources(self):
+        """
+        Several sources measure to the nearest one; blocked sources are ignored and outside ones rejected.
+        """
+        mask = np.zeros((3, 5), dtype=np.uint8)
+        mask[1, 2] = 1
+        distances = distance_field(mask, [(0, 0), (2, 4), (1, 2)])
+        np.testing.assert_array_equal(distances, [[0, 1, 2, 3, 2],
+                                                  [1, 2, -1, 2, 1],
+                                                  [2, 3, 2, 1, 0]])
+        with self.assertRaises(ValueError):
+            distance_field(mask, [(3, 0)])
+
+    def test_obstacles_are_unlabeled(self):
+        """
+        Obstacles get label -1 and each open region gets its smallest flat index.
+        """
+        mask = np.array([[0, 1, 0],
+                         [0, 1, 0],
+                         [1, 1, 0]], dtype=np.uint8)
+        expected = np.array([[0, -1, 2],
+                             [0, -1, 2],
+                             [-1, -1, 2]])
+        np.testing.assert_array_equal(label_components(mask), expected)
+
+    def test_solvers_reject_unreachable_goal(self):
+        """
+        With an index attached, walled-off goals return no path and no history.
+        """
+        grid = create_grid_graph((5, 5), [Cell(3, 4), Cell(4, 3)])
+        index = grid.components()
+        self.assertFalse(index.connected(Cell(0, 0), Cell(4, 4)))
+        self.assertEqual(dfs_iterative(grid, Cell(0, 0), Cell(4, 4), index), (None, []))
+        self.assertEqual(find_path_recursive(grid, Cell(0, 0), Cell(4, 4), index), (None, [], 0))
+        self.assertIsNotNone(dfs_iterative(grid, Cell(0, 0), Cell(3, 3), index)[0])
+
+    def test_incremental_updates_match_rebuild(self):
+        """
+        Labels kept up to date by add_obstacle/remove_obstacle agree with a
+        freshly built index after every edit.
+        """
+        rng = np.random.default_rng(3)
+        grid = GridGraph((rng.random((9, 9)) < 0.3).astype(np.uint8))
+        index = grid.components()
+        for step in range(60):
+            cell = Cell(*rng.integers(0, 9, size=2))
+            if rng.random() < 0.5:
+                grid.add_obstacle(cell)
+            else:
+                grid.remove_obstacle(cell)
+            rebuilt = ComponentIndex(GridGraph(grid.mask.copy()))
+            for other in grid:
+                self.assertEqual(index.connected(cell, other), rebuilt.connected(cell, other),
+                                 f"Step {step}: {cell} vs {other}")
+        self.assertGreater(grid.version, 0)
+
+    def test_walls_are_handled_without_relabeling(self):
+        """
+        Tests that a wall that does not split its component, or cuts off a
+        piece smaller than split_search_limit, never relabels the whole
+        component, and that larger splits fall back to it.
+        """
+        mask = np.zeros((7, 7), dtype=np.uint8)
+        mask[3, :] = 1
+        mask[3, 3] = 0 # Single gap joining the top and bottom halves
+        grid = GridGraph(mask)
+        index = grid.components()
+        with mock.patch.object(index, '_relabel', wraps=index._relabel) as relabel:
+            grid.add_obstacle(Cell(1, 2)) # Open on all sides: its neighbors meet around it
+            grid.add_obstacle(Cell(6, 6)) # Corner: its two neighbors meet through (5, 5)
+            self.assertTrue(index.connected(Cell(0, 0), Cell(6, 0)))
+            grid.add_obstacle(Cell(5, 1))
+            grid.add_obstacle(Cell(6, 1))
+            grid.add_obstacle(Cell(5, 0)) # Cuts off (6, 0)
+            self.assertFalse(index.connected(Cell(6, 0), Cell(4, 0)))
+            self.assertTrue(index.connected(Cell(0, 0), Cell(4, 0)))
+            relabel.assert_not_called()
+            index.split_search_limit = 4
+            grid.add_obstacle(Cell(3, 3))
+            relabel.assert_called_once()
+        self.assertFalse(index.connected(Cell(0, 0), Cell(4, 0)))
+        self.assertTrue(index.connected(Cell(4, 4), Cell(4, 0)))
+
+    def test_local_splits_match_rebuild(self):
+        """
+        Tests that labels stay correct over many wall additions on a grid
+        large enough for both local splits and full relabels.
+        """
+        rng = np.random.default_rng(8)
+        grid = GridGraph((rng.random((40, 40)) < 0.3).astype(np.uint8))
+        index = grid.components()
+        index.split_search_limit = 64
+        for _ in range(300):
+            grid.add_obstacle(Cell(*rng.integers(0, 40, size=2).tolist()))
+        expected = label_components(grid.mask)
+        labels = index.labels
+        # Same partition: labels map one-to-one onto the rebuilt ones
+        pairs = set(zip(labels.reshape(-1).tolist(), expected.reshape(-1).tolist()))
+        self.assertEqual(len(pairs), len({a for a, _ in pairs}))
+        self.assertEqual(len(pairs), len({b for _, b in pairs}))
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
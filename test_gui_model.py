@@ -0,0 +1,113 @@
+# test_gui_model.py
+
+import unittest
+import numpy as np
+from graph_model import Cell
+from gui import FrameBatcher, GridModel, parse_grid
+
+class FakeClock:
+    """Clock that only moves when the test advances it."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestFrameBatcher(unittest.TestCase):
+    """
+    Unit tests for the batching of search events into animation frames, driven by a fake clock.
+    """
+
+    def _batches(self, events, total, frame_seconds, duration=1.0, interval=0.125):
+        """Collects the batches, advancing the clock by frame_seconds after each frame."""
+        clock = FakeClock()
+        batches = []
+        for batch in FrameBatcher(events, total, duration, interval, clock):
+            batches.append(batch)
+            clock.now += frame_seconds
+        return batches
+
+    def test_short_search_gets_one_event_per_frame(self):
+        """
+        Tests that a search shorter than the frames available shows every event on its own frame.
+        """
+        batches = self._batches(range(5), 5, 0.125)
+        self.assertEqual(batches, [[0], [1], [2], [3], [4]])
+
+    def test_long_search_fits_the_duration(self):
+        """
+        Tests that a long search is spread evenly over the frames that fit in the duration.
+        """
+        batches = self._batches(range(800), 800, 0.125)
+        self.assertEqual([len(batch) for batch in batches], [100] * 8)
+        self.assertEqual(sum(batches, []), list(range(800)))
+
+    def test_slow_frames_get_larger_batches(self):
+        """
+        Tests that frames slower than the interval shrink the frame budget and
+        that the last frame flushes every remaining event.
+        """
+        batches = self._batches(range(800), 800, 0.5)
+        self.assertEqual([len(batch) for batch in batches], [100, 700])
+
+    def test_underestimated_total_still_shows_every_event(self):
+        """
+        Tests that events beyond the expected total are still yielded, one per frame.
+        """
+        batches = self._batches(iter(range(6)), 3, 0.0)
+        self.assertEqual(batches, [[0], [1], [2], [3], [4], [5]])
+
+    def test_overrun_flushes_the_rest(self):
+        """
+        Tests that once the duration has passed, everything left comes in one batch.
+        """
+        batches = self._batches(range(50), 50, 2.0)
+        self.assertEqual([len(batch) for batch in batches], [7, 43])
+
+class TestGridModel(unittest.TestCase):
+    """
+    Unit tests for parsing the grid entries into a GridModel.
+    """
+
+    def test_parse_grid(self):
+        """
+        Tests that dimensions, endpoints and obstacles are parsed, ignoring obstacles outside the grid.
+        """
+        model = parse_grid("3,4", "0,0", "2,3", "1,1;0,3;5,5;1,-1;")
+        self.assertEqual((model.rows, model.cols), (3, 4))
+        self.assertEqual((model.start_pos, model.goal_pos), ((0, 0), (2, 3)))
+        np.testing.assert_array_equal(model.mask, [[0, 0, 0, 1], [0, 1, 0, 0], [0, 0, 0, 0]])
+        self.assertEqual(model.obstacle_cells(), [Cell(0, 3), Cell(1, 1)])
+        self.assertFalse(parse_grid("2,2", "0,0", "1,1", "").mask.any())
+
+    def test_parse_errors(self):
+        """
+        Tests that every malformed entry is reported with its message for the user.
+        """
+        cases = [
+            (("3", "0,0", "2,2", ""), "Invalid Grid Size format. Use 'rows,cols'."),
+            (("0,3", "0,0", "2,2", ""), "Grid Size must be positive."),
+            (("3,3", "0,0,0", "2,2", ""), "Invalid Start Position format. Use 'row,col'."),
+            (("3,3", "0,0", "", ""), "Invalid Goal Position format. Use 'row,col'."),
+            (("3,x", "0,0", "2,2", ""), "Invalid input. Please ensure all values are integers."),
+            (("3,3", "0,0", "2,2", "1,1;a,b"), "Invalid Obstacles format. Use 'row,col;row,col;...'."),
+            (("3,3", "0,0", "2,2", "1,1,1"), "Invalid Obstacles format. Use 'row,col;row,col;...'."),
+        ]
+        for entries, message in cases:
+            with self.subTest(entries=entries):
+                with self.assertRaises(ValueError) as raised:
+                    parse_grid(*entries)
+                self.assertEqual(str(raised.exception), message)
+
+    def test_key_identifies_the_layout(self):
+        """
+        Tests that the key depends on the obstacle layout and shape only, not on endpoints or entry order.
+        """
+        model = parse_grid("4,5", "0,0", "3,4", "1,1;2,3")
+        self.assertEqual(model.key, parse_grid("4,5", "3,0", "0,4", "2,3;1,1;1,1").key)
+        self.assertEqual(model.key, GridModel(model.mask.copy(), (0, 0), (3, 4)).key)
+        self.assertNotEqual(model.key, parse_grid("4,5", "0,0", "3,4", "1,1").key)
+        self.assertNotEqual(model.key, parse_grid("5,4", "0,0", "3,3", "1,1;2,3").key)
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
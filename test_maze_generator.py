@@ -0,0 +1,63 @@
+# test_maze_generator.py
+
+import unittest
+import numpy as np
+from graph_model import Cell, GridGraph, label_components
+from maze_generator import random_obstacle_mask, backtracker_maze, corridor_maze, rooms_maze, obstacle_cells
+
+class TestMazeGenerator(unittest.TestCase):
+    """
+    Unit tests for the vectorized random masks and the structured maze generators.
+    """
+
+    def test_random_mask_density_and_exclusions(self):
+        """
+        Exactly the requested number of obstacles is drawn, never on excluded cells.
+        """
+        for density in [0.0, 0.3, 0.9, 1.0]:
+            mask = random_obstacle_mask((30, 40), density, seed=4)
+            self.assertEqual(mask.dtype, np.uint8)
+            self.assertEqual(int(mask.sum()), min(int(1200 * density), 1198))
+            self.assertEqual((mask[0, 0], mask[29, 39]), (0, 0))
+
+        mask = random_obstacle_mask((5, 5), 1.0, seed=1, exclude=[(2, 2), (0, 4)])
+        self.assertEqual(sorted(map(tuple, np.argwhere(mask == 0).tolist())), [(0, 4), (2, 2)])
+
+    def test_random_mask_is_seedable(self):
+        """
+        The same seed reproduces the same mask; different seeds differ.
+        """
+        first = random_obstacle_mask((20, 20), 0.3, seed=9)
+        np.testing.assert_array_equal(first, random_obstacle_mask((20, 20), 0.3, seed=9))
+        self.assertFalse(np.array_equal(first, random_obstacle_mask((20, 20), 0.3, seed=10)))
+
+    def test_structured_mazes_connect_the_corners(self):
+        """
+        Backtracker, corridor and room mazes keep (0, 0) and the far corner connected.
+        """
+        for dims in [(9, 9), (10, 7), (16, 21)]:
+            for mask in [backtracker_maze(dims, seed=3), corridor_maze(dims, spacing=3, seed=3),
+                         rooms_maze(dims, room_size=3, seed=3)]:
+                labels = label_components(mask)
+                self.assertGreaterEqual(labels[0, 0], 0)
+                self.assertEqual(labels[0, 0], labels[-1, -1], f"Corners disconnected on {dims}")
+
+    def test_backtracker_maze_is_a_tree(self):
+        """
+        On odd dimensions the carved passages form a spanning tree (a perfect maze).
+        """
+        mask = backtracker_maze((11, 13), seed=5)
+        grid = GridGraph(mask)
+        open_cells = [cell for cell in grid if not grid.is_blocked(cell)]
+        edges = sum(len(grid.neighbors(cell)) for cell in open_cells) // 2
+        self.assertEqual(edges, len(open_cells) - 1)
+
+    def test_obstacle_cells(self):
+        """
+        Masks convert to Cell lists for the legacy graph builder.
+        """
+        mask = np.array([[0, 1], [1, 0]], dtype=np.uint8)
+        self.assertEqual(obstacle_cells(mask), [Cell(0, 1), Cell(1, 0)])
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
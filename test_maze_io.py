@@ -0,0 +1,137 @@
+# test_maze_io.py
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import matplotlib.image
+from graph_model import Cell, GridGraph, PackedGridGraph
+from dfs_solver import dfs_iterative, find_path_explicit_stack, SearchWorkspace
+from maze_generator import backtracker_maze, random_obstacle_mask
+from maze_io import write_maze, open_maze, read_header, read_text_maze, read_image_maze, load_mask, HEADER
+
+class TestMazeIO(unittest.TestCase):
+    """
+    Unit tests for the binary maze format, memory-mapped loading and the text/image imports.
+    """
+
+    def setUp(self):
+        """Creates a scratch directory for the maze files of each test."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip(self):
+        """
+        Tests that a written maze opens with the same dimensions and mask,
+        including sizes that do not fill the last byte.
+        """
+        for dims in [(1, 1), (7, 9), (33, 17)]:
+            mask = random_obstacle_mask(dims, 0.4, seed=3)
+            path = self._path('round_trip.maze')
+            size = write_maze(path, mask)
+            self.assertEqual(size, HEADER.size + (dims[0] * dims[1] + 7) // 8)
+            self.assertEqual(os.path.getsize(path), size)
+            graph = open_maze(path)
+            self.assertEqual((graph.rows, graph.cols), dims)
+            np.testing.assert_array_equal(graph.mask, mask)
+            np.testing.assert_array_equal(load_mask(path), mask)
+
+    def test_packed_graph_matches_grid_graph(self):
+        """
+        Tests that searches on a memory-mapped maze give the same results as
+        on a GridGraph of the same mask.
+        """
+        mask = backtracker_maze((41, 37), seed=5)
+        path = self._path('search.maze')
+        write_maze(path, mask)
+        packed, grid = open_maze(path), GridGraph(mask)
+        start, goal = Cell(0, 0), Cell(40, 36)
+        self.assertEqual(dfs_iterative(packed, start, goal), dfs_iterative(grid, start, goal))
+        self.assertEqual(find_path_explicit_stack(packed, start, goal), find_path_explicit_stack(grid, start, goal))
+        self.assertEqual(SearchWorkspace(packed).find_path(start, goal), SearchWorkspace(grid).find_path(start, goal))
+        for cell in [Cell(0, 0), Cell(1, 1), Cell(40, 36), Cell(41, 0), Cell(-1, 2)]:
+            self.assertEqual(packed.get(cell), grid.get(cell))
+
+    def test_edits_stay_in_memory(self):
+        """
+        Tests that obstacle edits update the graph and its components but never the file.
+        """
+        mask = np.zeros((5, 5), dtype=np.uint8)
+        mask[2, :] = 1
+        path = self._path('edits.maze')
+        write_maze(path, mask)
+        with open(path, 'rb') as maze_file:
+            original = maze_file.read()
+
+        graph = open_maze(path)
+        components = graph.components()
+        self.assertFalse(components.connected(Cell(0, 0), Cell(4, 4)))
+        self.assertTrue(graph.remove_obstacle(Cell(2, 3)))
+        self.assertFalse(graph.remove_obstacle(Cell(2, 3)))
+        self.assertTrue(components.connected(Cell(0, 0), Cell(4, 4)))
+        self.assertTrue(graph.add_obstacle(Cell(0, 0)))
+        self.assertTrue(graph.is_blocked(Cell(0, 0)))
+        self.assertEqual(graph.version, 2)
+        with open(path, 'rb') as maze_file:
+            self.assertEqual(maze_file.read(), original)
+        for edit in (graph.add_obstacle, graph.remove_obstacle):
+            with self.assertRaises(ValueError):
+                edit(Cell(1, -1)) # Would wrap onto (0, 4)
+        self.assertFalse(graph.is_blocked(Cell(0, 4)))
+
+    def test_mask_is_unpacked_once_per_version(self):
+        """
+        Tests that the unpacked mask is shared until an edit and that unpack_mask returns a private copy.
+        """
+        mask = random_obstacle_mask((9, 11), 0.3, seed=2)
+        path = self._path('mask.maze')
+        write_maze(path, mask)
+        graph = open_maze(path)
+        self.assertIs(graph.mask, graph.mask)
+        self.assertFalse(graph.mask.flags.writeable)
+        copy = graph.unpack_mask()
+        copy[:] = 1
+        np.testing.assert_array_equal(graph.mask, mask)
+        graph.add_obstacle(Cell(*np.argwhere(mask == 0)[0]))
+        self.assertEqual(int(graph.mask.sum()), int(mask.sum()) + 1)
+
+    def test_invalid_files_are_rejected(self):
+        """
+        Tests that wrong magic numbers, versions and truncated files raise ValueError.
+        """
+        valid = HEADER.pack(b'DFSM', 1, 0, 4, 4) + bytes(2)
+        for data in [b'', b'DFSM', HEADER.pack(b'NOPE', 1, 0, 4, 4) + bytes(2),
+                     HEADER.pack(b'DFSM', 9, 0, 4, 4) + bytes(2), valid[:-1]]:
+            with self.assertRaises(ValueError):
+                read_header(data)
+        self.assertEqual(read_header(valid), (4, 4))
+        with self.assertRaises(ValueError):
+            PackedGridGraph(bytes(1), 4, 4)
+
+    def test_text_import(self):
+        """
+        Tests that walls are read from '#', '1' and 'X' and short lines are padded.
+        """
+        path = self._path('maze.txt')
+        with open(path, 'w') as text_file:
+            text_file.write("#..1\n.X\n....\n\n")
+        expected = [[1, 0, 0, 1], [0, 1, 0, 0], [0, 0, 0, 0]]
+        np.testing.assert_array_equal(read_text_maze(path), expected)
+        np.testing.assert_array_equal(load_mask(path), expected)
+
+    def test_image_import(self):
+        """
+        Tests that dark pixels of an image become walls.
+        """
+        mask = random_obstacle_mask((6, 8), 0.3, seed=1)
+        path = self._path('maze.png')
+        matplotlib.image.imsave(path, 1 - mask, cmap='gray', vmin=0, vmax=1)
+        np.testing.assert_array_equal(read_image_maze(path), mask)
+        np.testing.assert_array_equal(load_mask(path), mask)
+
+# This block allows you to run the tests directly from the command line
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,101 @@
+# test_path_cache.py
+
+import json
+import os
+import tempfile
+import unittest
+from graph_model import Cell, GridGraph, create_graph_from_grid
+from dfs_solver import dfs_iterative, find_path_recursive
+from maze_generator import backtracker_maze
+from path_cache import PathCache, CachedPath
+
+class TestPathCache(unittest.TestCase):
+    """
+    Unit tests for the LRU path cache.
+    """
+
+    def setUp(self):
+        self.graph = GridGraph(backtracker_maze((15, 15), seed=4))
+        self.start, self.goal = Cell(0, 0), Cell(14, 14)
+
+    def test_lru_eviction_and_counters(self):
+        """
+        Tests that the least recently used entry is evicted and that every lookup is counted.
+        """
+        cache = PathCache(max_entries=2)
+        keys = [PathCache.make_key('layout', 'iterative', (0, 0), (0, col)) for col in range(3)]
+        cache.put(keys[0], [Cell(0, 0)], 1)
+        cache.put(keys[1], None, 5)
+        self.assertEqual(cache.get(keys[0]), CachedPath([Cell(0, 0)], 1)) # keys[1] is now least recent
+        cache.put(keys[2], [Cell(0, 0)], 1)
+        self.assertNotIn(keys[1], cache)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[2]).nodes_expanded, 1)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'evictions': 1, 'invalidations': 0,
+                                         'entries': 2, 'hit_rate': 2 / 3})
+
+    def test_find_path_caches_search_results(self):
+        """
+        Tests that repeated queries are answered from the cache with the solver's result.
+        """
+        cache = PathCache()
+        expected, history = dfs_iterative(self.graph, self.start, self.goal)
+        for _ in range(3):
+            self.assertEqual(cache.find_path(self.graph, self.start, self.goal), (expected, len(history)))
+        path, _, _ = find_path_recursive(self.graph, self.start, self.goal)
+        self.assertEqual(cache.find_path(self.graph, self.start, self.goal, 'recursive').path, path)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (2, 2, 2))
+        # Callers get copies, so changing one leaves the cache intact
+        cache.find_path(self.graph, self.start, self.goal).path.clear()
+        self.assertEqual(cache.find_path(self.graph, self.start, self.goal).path, expected)
+        # Same layout, different graph object: same entries
+        self.assertEqual(cache.fingerprint(GridGraph(self.graph.mask.copy())), cache.fingerprint(self.graph))
+
+    def test_mutation_changes_the_key(self):
+        """
+        Tests that an edited grid never gets the old layout's paths, and that
+        those entries are kept for when the layout comes back.
+        """
+        cache = PathCache()
+        path = cache.find_path(self.graph, self.start, self.goal).path
+        self.graph.add_obstacle(path[len(path) // 2]) # A perfect maze has no second route
+        self.assertIsNone(cache.find_path(self.graph, self.start, self.goal).path)
+        self.assertEqual((cache.invalidations, cache.misses, len(cache)), (0, 2, 2))
+        self.graph.remove_obstacle(path[len(path) // 2])
+        self.assertEqual(cache.find_path(self.graph, self.start, self.goal).path, path)
+        self.assertEqual(cache.hits, 1)
+        with self.assertRaises(TypeError):
+            cache.fingerprint(create_graph_from_grid((3, 3), []))
+
+    def test_persistence(self):
+        """
+        Tests that saved entries load back in LRU order and that foreign files are rejected.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'paths.json')
+            cache = PathCache(path=path)
+            found = cache.find_path(self.graph, self.start, self.goal)
+            cache.find_path(self.graph, self.start, Cell(1, 1)) # A wall: no path
+            self.assertEqual(cache.save(), 2)
+
+            restored = PathCache(max_entries=1, path=path)
+            self.assertEqual(len(restored), 1) # Only the most recent entry fits
+            self.assertIsNone(restored.find_path(self.graph, self.start, Cell(1, 1)).path)
+            restored = PathCache(path=path)
+            self.assertEqual(restored.find_path(self.graph, self.start, self.goal), found)
+            self.assertEqual(restored.misses, 0)
+
+            good = {'fingerprint': 'f', 'algorithm': 'iterative', 'start': [0, 0], 'goal': [0, 1],
+                    'path': [[0, 0], [0, 1]], 'nodes_expanded': 2}
+            for data in [{'version': 99, 'entries': []}, {'version': 1}, {'version': 1, 'entries': [good, {}]},
+                         {'version': 1, 'entries': [dict(good, path=[[0, 0, 0]])]},
+                         {'version': 1, 'entries': [dict(good, start=None)]}]:
+                with self.subTest(data=data):
+                    with open(path, 'w') as cache_file:
+                        json.dump(data, cache_file)
+                    with self.assertRaises(ValueError):
+                        restored.load(path)
+            self.assertEqual(len(restored), 2) # A rejected file adds nothing
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,64 @@
+# test_performance_analyzer.py
+
+import tracemalloc
+import unittest
+from performance_analyzer import run_sweep, run_trial, trial_seed, PHASES
+
+class TestBenchmarkRunner(unittest.TestCase):
+    """
+    Unit tests for the seeded, optionally parallel benchmark sweep.
+    """
+
+    @staticmethod
+    def _outcomes(results):
+        """Strips timings so only the deterministic part of each trial remains."""
+        return {size: {density: {algo: [(t['depth'], t['nodes_expanded'], t['path_found']) for t in trials]
+                                 for algo, trials in by_algo.items()}
+                       for density, by_algo in by_density.items()}
+                for size, by_density in results.items()}
+
+    def test_trials_are_deterministic(self):
+        """
+        The same seed produces the same maze and search outcome.
+        """
+        seed = trial_seed(0, (15, 15), 0.2, 1)
+        first = run_trial((15, 15), 0.2, 'iterative', seed)
+        second = run_trial((15, 15), 0.2, 'iterative', seed)
+        self.assertEqual((first['nodes_expanded'], first['path_found']),
+                         (second['nodes_expanded'], second['path_found']))
+
+    def test_parallel_sweep_matches_serial(self):
+        """
+        A process-pool sweep reports the same outcomes as a serial sweep.
+        """
+        args = ([(12, 12), (16, 16)], [0.1, 0.3], ['recursive', 'iterative'])
+        serial = run_sweep(*args, num_runs=2, workers=1)
+        parallel = run_sweep(*args, num_runs=2, workers=2)
+        self.assertEqual(self._outcomes(serial), self._outcomes(parallel))
+
+    def test_trial_reports_every_phase(self):
+        """
+        Each trial reports time and peak memory per phase plus throughput, for
+        both graph representations, and leaves tracemalloc stopped.
+        """
+        for graph_type in ['dict', 'grid']:
+            trial = run_trial((20, 20), 0.1, 'iterative', trial_seed(0, (20, 20), 0.1, 0), graph_type)
+            for phase in PHASES:
+                self.assertGreaterEqual(trial[f'{phase}_time'], 0)
+                self.assertGreaterEqual(trial[f'{phase}_memory_kb'], 0)
+            self.assertGreater(trial['build_memory_kb'], 0)
+            self.assertAlmostEqual(trial['time'], trial['search_time'] + trial['reconstruct_time'])
+            self.assertGreater(trial['nodes_per_sec'], 0)
+            self.assertFalse(tracemalloc.is_tracing())
+
+    def test_phase_memory_excludes_earlier_phases(self):
+        """
+        The search's peak memory counts only what the search allocates, not the graph built before it.
+        """
+        trial = run_trial((60, 60), 0.0, 'bidirectional', trial_seed(0, (60, 60), 0.0, 0), 'dict')
+        self.assertGreater(trial['build_memory_kb'], 500)
+        self.assertLess(trial['memory_kb'], trial['build_memory_kb'] / 10)
+        self.assertLess(trial['search_memory_kb'], trial['build_memory_kb'] / 10)
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,103 @@
+# test_solve_cli.py
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from graph_model import Cell, GridGraph
+from dfs_solver import run_search
+from maze_generator import backtracker_maze
+from maze_io import write_maze
+from solve_cli import parse_query, solve_stream, main, ENGINES
+
+class TestSolveCLI(unittest.TestCase):
+    """
+    Unit tests for the headless batch solver.
+    """
+
+    def setUp(self):
+        """Writes a small maze and a query file to a scratch directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.mask = backtracker_maze((21, 21), seed=2)
+        self.maze_path = os.path.join(directory.name, 'maze.maze')
+        write_maze(self.maze_path, self.mask)
+        self.queries_path = os.path.join(directory.name, 'queries.txt')
+        with open(self.queries_path, 'w') as queries_file:
+            queries_file.write("# start goal\n0 0 20 20\n\n0,0,1,1\n2 2 10 10\n")
+        self.output_path = os.path.join(directory.name, 'out.jsonl')
+
+    def _run(self, *options):
+        status = main([self.maze_path, '--queries', self.queries_path, '--output', self.output_path, *options])
+        with open(self.output_path) as output:
+            return status, [json.loads(line) for line in output]
+
+    def test_parse_query(self):
+        """
+        Tests that queries accept spaces, tabs and commas and reject other shapes.
+        """
+        self.assertEqual(parse_query("1 2\t3,4\n"), (Cell(1, 2), Cell(3, 4)))
+        for line in ["1 2 3", "1 2 3 4 5", "a b c d"]:
+            with self.assertRaises(ValueError):
+                parse_query(line)
+
+    def test_engines_match_run_search(self):
+        """
+        Tests that every engine reports the same path and statistics as run_search.
+        """
+        graph = GridGraph(self.mask)
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                status, records = self._run('--engine', engine)
+                self.assertEqual(status, 0)
+                self.assertEqual([record['line'] for record in records], [2, 4, 5])
+                for record in records:
+                    path, history, max_depth = run_search(graph, Cell(*record['start']), Cell(*record['goal']), engine)
+                    self.assertEqual(record['path'], [list(cell) for cell in path] if path else None)
+                    self.assertEqual(record['found'], path is not None)
+                    self.assertEqual(record['nodes_expanded'], len(history))
+                    self.assertEqual(record['max_depth'], max_depth)
+                    self.assertGreaterEqual(record['time'], 0)
+
+    def test_options_and_errors(self):
+        """
+        Tests --no-path and --components, and that bad queries produce error
+        records and a failing exit status without stopping the batch.
+        """
+        status, records = self._run('--no-path', '--components')
+        self.assertEqual(status, 0)
+        self.assertTrue(all('path' not in record for record in records))
+        self.assertFalse(records[1]['found']) # (1, 1) is always a wall
+
+        graph = GridGraph(self.mask)
+        records = list(solve_stream(graph, ["0 0 20 20", "0 0 99 0", "oops", "0 0 0 0"], 'iterative'))
+        self.assertNotIn('error', records[0])
+        self.assertIn('outside', records[1]['error'])
+        self.assertIn('error', records[2])
+        self.assertEqual(records[3]['path'], [[0, 0]])
+
+        with open(self.queries_path, 'a') as queries_file:
+            queries_file.write("1 2 3\n")
+        status, records = self._run()
+        self.assertEqual(status, 1)
+        self.assertEqual(len(records), 4)
+
+    def test_unopenable_files(self):
+        """
+        Tests that a missing maze or query file, or an output file that cannot
+        be created, is reported on stderr with exit status 2.
+        """
+        missing = os.path.join(os.path.dirname(self.maze_path), 'missing', 'file')
+        for argv, name in [([missing], 'maze'), ([self.maze_path, '--queries', missing], 'queries'),
+                           ([self.maze_path, '--queries', self.queries_path, '--output', missing], 'output')]:
+            with self.subTest(name=name):
+                errors = io.StringIO()
+                with redirect_stderr(errors):
+                    self.assertEqual(main(argv), 2)
+                self.assertIn(f"Cannot open {name} {missing}", errors.getvalue())
+
+# This block allows you to run the tests directly from the command line
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,139 @@
+# test_tiled_grid.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from graph_model import Cell, GridGraph
+from dfs_solver import dfs_iterative, find_path_explicit_stack, find_path_guided
+from maze_generator import backtracker_maze, random_obstacle_mask
+from maze_io import write_maze
+from tiled_grid import write_tiled_maze, convert_maze, open_tiled_maze, read_header, tile_layout, HEADER, TiledGridGraph
+from path_cache import PathCache
+from solve_cli import load_graph, main
+
+class TestTiledGrid(unittest.TestCase):
+    """
+    Unit tests for the tiled maze format and the LRU-cached TiledGridGraph.
+    """
+
+    def setUp(self):
+        """Creates a scratch directory for the maze files of each test."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip_and_conversion(self):
+        """
+        Tests that masks survive the tiled format, including partial edge tiles,
+        and that converting a binary maze gives the same file as writing the mask.
+        """
+        for dims, tile_size in [((1, 1), 8), ((7, 9), 8), ((33, 17), 16), ((40, 40), 8)]:
+            mask = random_obstacle_mask(dims, 0.4, seed=3)
+            tiled_path, maze_path, converted_path = self._path('a.tiles'), self._path('a.maze'), self._path('b.tiles')
+            size = write_tiled_maze(tiled_path, mask, tile_size)
+            tile_rows, tile_cols, tile_bytes = tile_layout(*dims, tile_size)
+            self.assertEqual(os.path.getsize(tiled_path), size)
+            self.assertEqual(size, HEADER.size + tile_rows * tile_cols * tile_bytes)
+            write_maze(maze_path, mask)
+            convert_maze(maze_path, converted_path, tile_size)
+            with open(tiled_path, 'rb') as written, open(converted_path, 'rb') as converted:
+                self.assertEqual(written.read(), converted.read())
+            graph = open_tiled_maze(tiled_path)
+            self.assertEqual((graph.rows, graph.cols, graph.tile_size), (*dims, tile_size))
+            np.testing.assert_array_equal(graph.mask, mask)
+
+    def test_bad_files_are_rejected(self):
+        """
+        Tests that wrong magic numbers, truncated files and bad tile sizes raise ValueError.
+        """
+        path = self._path('maze.tiles')
+        write_tiled_maze(path, np.zeros((20, 20)), 8)
+        with open(path, 'rb') as tiled_file:
+            data = tiled_file.read()
+        for broken in [b'', b'XXXX' + data[4:], data[:-1]]:
+            with self.assertRaises(ValueError):
+                read_header(broken)
+        with self.assertRaises(ValueError):
+            write_tiled_maze(path, np.zeros((20, 20)), 12)
+
+    def test_searches_cross_tile_boundaries(self):
+        """
+        Tests that searches with a tiny tile cache match a GridGraph, loading
+        and evicting tiles as the search wanders across them.
+        """
+        mask = backtracker_maze((41, 37), seed=5)
+        path = self._path('search.tiles')
+        write_tiled_maze(path, mask, 8)
+        tiled, grid = open_tiled_maze(path, cache_tiles=2), GridGraph(mask)
+        start, goal = Cell(0, 0), Cell(40, 36)
+        self.assertEqual(dfs_iterative(tiled, start, goal), dfs_iterative(grid, start, goal))
+        self.assertEqual(find_path_explicit_stack(tiled, start, goal), find_path_explicit_stack(grid, start, goal))
+        for cell in [Cell(0, 0), Cell(1, 1), Cell(8, 7), Cell(40, 36), Cell(41, 0), Cell(-1, 2)]:
+            self.assertEqual(tiled.get(cell), grid.get(cell))
+        stats = tiled.tile_stats()
+        self.assertGreaterEqual(stats['loads'], tiled.tile_rows * tiled.tile_cols)
+        self.assertEqual(stats['evictions'], stats['loads'] - stats['resident'])
+        self.assertEqual(stats['resident'], 2)
+
+    def test_edits_survive_eviction_but_not_the_file(self):
+        """
+        Tests that obstacle edits outlive their tile's eviction and never reach the file.
+        """
+        mask = np.zeros((16, 16), dtype=np.uint8)
+        path = self._path('edit.tiles')
+        write_tiled_maze(path, mask, 8)
+        graph = open_tiled_maze(path, cache_tiles=1)
+        self.assertTrue(graph.add_obstacle(Cell(1, 1)))
+        self.assertFalse(graph.add_obstacle(Cell(1, 1)))
+        self.assertFalse(graph.is_blocked(Cell(15, 15))) # Evicts the edited tile
+        self.assertTrue(graph.is_blocked(Cell(1, 1)))
+        self.assertEqual(graph.version, 1)
+        self.assertFalse(open_tiled_maze(path).is_blocked(Cell(1, 1)))
+        for edit in (graph.add_obstacle, graph.remove_obstacle):
+            for cell in (Cell(1, -1), Cell(16, 0)):
+                with self.assertRaises(ValueError):
+                    edit(cell)
+        self.assertEqual(graph.version, 1)
+
+    def test_large_grids_are_not_unpacked_whole(self):
+        """
+        Tests that whole-grid consumers refuse a grid above max_mask_cells
+        while searches and the batch solver without --components still work.
+        """
+        mask = backtracker_maze((21, 21), seed=1)
+        path = self._path('large.tiles')
+        write_tiled_maze(path, mask, 8)
+        graph = open_tiled_maze(path)
+        graph.max_mask_cells = 21 * 21 - 1
+        for consumer in (lambda: graph.mask, graph.components, lambda: PathCache().fingerprint(graph),
+                         lambda: find_path_guided(graph, Cell(0, 0), Cell(20, 20))):
+            with self.assertRaises(ValueError):
+                consumer()
+        self.assertEqual(dfs_iterative(graph, Cell(0, 0), Cell(20, 20)),
+                         dfs_iterative(GridGraph(mask), Cell(0, 0), Cell(20, 20)))
+
+        queries_path, output_path = self._path('queries.txt'), self._path('out.jsonl')
+        with open(queries_path, 'w') as queries_file:
+            queries_file.write("0 0 20 20\n")
+        argv = [path, '--queries', queries_path, '--output', output_path]
+        with mock.patch.object(TiledGridGraph, 'max_mask_cells', 100), mock.patch('sys.stderr'):
+            self.assertEqual(main(argv + ['--components']), 2)
+            self.assertEqual(main(argv), 0)
+
+    def test_solve_cli_opens_tiled_mazes(self):
+        """
+        Tests that the batch solver loads .tiles files as tiled graphs.
+        """
+        mask = backtracker_maze((21, 21), seed=1)
+        path = self._path('cli.tiles')
+        write_tiled_maze(path, mask, 8)
+        graph = load_graph(path, cache_tiles=3)
+        self.assertEqual(graph.cache_tiles, 3)
+        np.testing.assert_array_equal(graph.mask, mask)
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
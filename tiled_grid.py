@@ -0,0 +1,374 @@
+# tiled_grid.py
+
+import argparse
+import mmap
+import struct
+import sys
+from collections import OrderedDict
+
+import numpy as np
+from graph_model import Cell, GridGraph, _CellPool
+from maze_io import HEADER as MAZE_HEADER, read_header as read_maze_header
+
+# Tiled maze format: a fixed little-endian header followed by square tiles
+# in row-major tile order. Each tile holds tile_size x tile_size cells packed
+# eight per byte (np.packbits layout); cells past the grid edge are walls.
+MAGIC = b'DFST'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHIII') # magic, version, flags (reserved), rows, cols, tile_size
+
+DEFAULT_TILE_SIZE = 256
+DEFAULT_CACHE_TILES = 64
+# Largest grid TiledGridGraph.mask will unpack whole (256 MiB at one byte per cell)
+MAX_MASK_CELLS = 2 ** 28
+
+def tile_layout(rows, cols, tile_size):
+    """
+    Computes the tile grid of a maze.
+
+    :return: Tuple (tile_rows, tile_cols, tile_bytes).
+    :raises ValueError: If tile_size is not a positive multiple of 8.
+    """
+    if tile_size <= 0 or tile_size % 8:
+        raise ValueError("Tile size must be a positive multiple of 8.")
+    return -(-rows // tile_size), -(-cols // tile_size), tile_size * tile_size // 8
+
+def _write_tiles(path, rows, cols, tile_size, read_band):
+    """
+    Writes a tiled maze one band of tile rows at a time.
+
+    :param read_band: Function (first_row, end_row) returning the uint8 mask of those rows.
+    :return: Number of bytes written.
+    """
+    tile_rows, tile_cols, tile_bytes = tile_layout(rows, cols, tile_size)
+    with open(path, 'wb') as tiled_file:
+        tiled_file.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, rows, cols, tile_size))
+        for tile_row in range(tile_rows):
+            first_row = tile_row * tile_size
+            band = np.ones((tile_size, tile_cols * tile_size), dtype=np.uint8)
+            mask = read_band(first_row, min(first_row + tile_size, rows))
+            band[:mask.shape[0], :cols] = mask != 0
+            # (tile_size, tile_cols, tile_size) -> one contiguous block per tile
+            tiles = band.reshape(tile_size, tile_cols, tile_size).transpose(1, 0, 2)
+            tiled_file.write(np.packbits(tiles.reshape(tile_cols, -1), axis=1).tobytes())
+    return HEADER.size + tile_rows * tile_cols * tile_bytes
+
+def write_tiled_maze(path, mask, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Saves an obstacle mask in the tiled maze format.
+
+    :param path: File to write.
+    :param mask: 2D array-like; non-zero marks an obstacle.
+    :param tile_size: Side of the square tiles, a multiple of 8.
+    :return: Number of bytes written.
+    """
+    mask = np.asarray(mask)
+    if mask.ndim != 2 or 0 in mask.shape:
+        raise ValueError("Maze mask must be a non-empty two-dimensional array.")
+    rows, cols = mask.shape
+    return _write_tiles(path, rows, cols, tile_size, lambda first, end: mask[first:end])
+
+def convert_maze(source, target, tile_size=DEFAULT_TILE_SIZE):
+    """
+    Converts a binary maze (see maze_io) to the tiled format.
+
+    The source is memory-mapped and unpacked one band of tile_size rows at a
+    time, so converting needs memory for one band only, never the whole grid.
+
+    :param source: Binary maze file written by maze_io.write_maze.
+    :param target: Tiled maze file to write.
+    :param tile_size: Side of the square tiles, a multiple of 8.
+    :return: Number of bytes written.
+    """
+    with open(source, 'rb') as maze_file:
+        mapped = mmap.mmap(maze_file.fileno(), 0, access=mmap.ACCESS_READ)
+    rows, cols = read_maze_header(mapped)
+    bits = np.frombuffer(mapped, dtype=np.uint8, offset=MAZE_HEADER.size)
+
+    def read_band(first_row, end_row):
+        first_bit, end_bit = first_row * cols, end_row * cols
+        chunk = np.unpackbits(bits[first_bit // 8:(end_bit + 7) // 8])
+        start = first_bit % 8
+        return chunk[start:start + end_bit - first_bit].reshape(end_row - first_row, cols)
+
+    return _write_tiles(target, rows, cols, tile_size, read_band)
+
+def read_header(buffer):
+    """
+    Validates the header of a tiled maze.
+
+    :param buffer: Bytes-like object holding at least the header and every tile.
+    :return: Tuple (rows, cols, tile_size).
+    :raises ValueError: If the buffer is not a complete tiled maze of a supported version.
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError("File is too short to be a tiled maze.")
+    magic, version, _, rows, cols, tile_size = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a tiled maze file (bad magic number).")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported tiled maze format version {version}.")
+    tile_rows, tile_cols, tile_bytes = tile_layout(rows, cols, tile_size)
+    if len(buffer) < HEADER.size + tile_rows * tile_cols * tile_bytes:
+        raise ValueError("Tiled maze file is truncated.")
+    return rows, cols, tile_size
+
+class TiledGridGraph(GridGraph):
+    """
+    GridGraph over a tiled maze file, for grids too large to hold in memory.
+
+    The file is memory-mapped copy-on-write, and tiles are unpacked to one
+    byte per cell only when a lookup first touches them. At most
+    `cache_tiles` tiles stay resident, in least-recently-used order; edited
+    tiles are packed back into the (private) mapping when evicted, so edits
+    survive eviction but never reach the file. Lookups across tile
+    boundaries are transparent to the solvers.
+
+    tile_loads, tile_hits and tile_evictions count cache activity (a hit is
+    a switch to a tile that was still resident) for tuning tile_size and
+    cache_tiles; see tile_stats().
+
+    Whole-grid consumers (mask, and through it components(),
+    distance_field(), ClusterGraph and PathCache.fingerprint) refuse grids
+    of more than max_mask_cells cells rather than unpacking them.
+    """
+    max_mask_cells = MAX_MASK_CELLS
+    def __init__(self, buffer, rows, cols, tile_size, cache_tiles=DEFAULT_CACHE_TILES, offset=HEADER.size,
+                 intern_cells=False):
+        """
+        :param buffer: Buffer (mmap, bytes, bytearray) holding the tiles.
+        :param rows: Number of grid rows.
+        :param cols: Number of grid columns.
+        :param tile_size: Side of the square tiles, a multiple of 8.
+        :param cache_tiles: Maximum number of unpacked tiles kept in memory.
+        :param offset: Byte offset of the first tile inside the buffer.
+        :param intern_cells: If True, hand out one shared Cell object per cell.
+        """
+        if cache_tiles < 1:
+            raise ValueError("The tile cache must hold at least one tile.")
+        self.tile_rows, self.tile_cols, self._tile_bytes = tile_layout(rows, cols, tile_size)
+        self._buffer = buffer
+        self._offset = offset
+        self.rows, self.cols = rows, cols
+        self.tile_size = tile_size
+        self.cache_tiles = cache_tiles
+        self._resident = OrderedDict() # Tile number -> bytearray, least recently used first
+        self._dirty = set()
+        self._current_key, self._current = None, None
+        self._blocked = None # No byte mask: lookups go through the tiles
+        self._cell_pool = _CellPool(cols) if intern_cells else None
+        self._components = None
+        self.version = 0 # Incremented on every obstacle edit
+        self.reset_tile_stats()
+
+    def reset_tile_stats(self):
+        """Sets the tile counters back to zero."""
+        self.tile_loads = 0
+        self.tile_hits = 0
+        self.tile_evictions = 0
+
+    def tile_stats(self):
+        """
+        Returns the tile cache counters.
+
+        :return: Dictionary of loads, hits, evictions and resident tile count.
+        """
+        return {'loads': self.tile_loads, 'hits': self.tile_hits,
+                'evictions': self.tile_evictions, 'resident': len(self._resident)}
+
+    def _unpack_tile(self, key):
+        start = self._offset + key * self._tile_bytes
+        packed = np.frombuffer(self._buffer, dtype=np.uint8, count=self._tile_bytes, offset=start)
+        return bytearray(np.unpackbits(packed).tobytes())
+
+    def _store_tile(self, key, tile):
+        """Packs a resident tile back into the buffer."""
+        start = self._offset + key * self._tile_bytes
+        self._buffer[start:start + self._tile_bytes] = np.packbits(np.frombuffer(tile, dtype=np.uint8)).tobytes()
+
+    def _tile(self, key):
+        """Returns tile number `key`, loading it and evicting the least recently used tile if needed."""
+        tile = self._resident.get(key)
+        if tile is not None:
+            self._resident.move_to_end(key)
+            self.tile_hits += 1
+        else:
+            if len(self._resident) >= self.cache_tiles:
+                old_key, old_tile = self._resident.popitem(last=False)
+                if old_key in self._dirty:
+                    self._store_tile(old_key, old_tile)
+                    self._dirty.discard(old_key)
+                self.tile_evictions += 1
+            tile = self._resident[key] = self._unpack_tile(key)
+            self.tile_loads += 1
+        self._current_key, self._current = key, tile
+        return tile
+
+    def _blocked_at(self, row, col):
+        """Reads one cell; consecutive lookups in the same tile skip the cache bookkeeping."""
+        tile_size = self.tile_size
+        tile_row, local_row = divmod(row, tile_size)
+        tile_col, local_col = divmod(col, tile_size)
+        key = tile_row * self.tile_cols + tile_col
+        tile = self._current if key == self._current_key else self._tile(key)
+        return tile[local_row * tile_size + local_col]
+
+    @property
+    def mask(self):
+        """
+        Unpacked uint8 copy of the whole obstacle mask, for vectorized consumers
+        such as label_components.
+
+        :raises ValueError: If the grid has more than max_mask_cells cells.
+        """
+        if self.rows * self.cols > self.max_mask_cells:
+            raise ValueError(f"The {self.rows}x{self.cols} tiled grid is too large to unpack whole "
+                             f"(more than {self.max_mask_cells} cells).")
+        tile_size = self.tile_size
+        mask = np.empty((self.tile_rows * tile_size, self.tile_cols * tile_size), dtype=np.uint8)
+        for key in range(self.tile_rows * self.tile_cols):
+            tile = self._resident.get(key)
+            if tile is None:
+                tile = self._unpack_tile(key) # Read directly, leaving the cache untouched
+            tile_row, tile_col = divmod(key, self.tile_cols)
+            mask[tile_row * tile_size:(tile_row + 1) * tile_size, tile_col * tile_size:(tile_col + 1) * tile_size] = \
+                np.frombuffer(tile, dtype=np.uint8).reshape(tile_size, tile_size)
+        return mask[:self.rows, :self.cols].copy()
+
+    def is_blocked(self, cell):
+        """Checks whether a Cell is an obstacle."""
+        return bool(self._blocked_at(cell.row, cell.col))
+
+    def neighbor_indices(self, index):
+        """
+        Returns the flat indices of open neighbors, in (row, col) order.
+
+        :param index: Flat index of an open cell.
+        :return: List of flat indices.
+        """
+        cols = self.cols
+        row, col = divmod(index, cols)
+        return [neighbor_row * cols + neighbor_col for neighbor_row, neighbor_col in self._open_neighbors(row, col)]
+
+    def _open_neighbors(self, row, col):
+        blocked_at = self._blocked_at
+        result = []
+        # Up, Left, Right, Down matches the sorted order of the legacy graph
+        if row > 0 and not blocked_at(row - 1, col):
+            result.append((row - 1, col))
+        if col > 0 and not blocked_at(row, col - 1):
+            result.append((row, col - 1))
+        if col < self.cols - 1 and not blocked_at(row, col + 1):
+            result.append((row, col + 1))
+        if row < self.rows - 1 and not blocked_at(row + 1, col):
+            result.append((row + 1, col))
+        return result
+
+    def neighbors(self, cell):
+        """
+        Returns the open neighbors of a Cell, in (row, col) order.
+
+        :param cell: Cell inside the grid.
+        :return: List of Cells.
+        """
+        if self._cell_pool is not None:
+            pool, cols = self._cell_pool, self.cols
+            return [pool[row * cols + col] for row, col in self._open_neighbors(cell.row, cell.col)]
+        return [Cell(row, col) for row, col in self._open_neighbors(cell.row, cell.col)]
+
+    def get(self, cell, default=None):
+        """
+        Dict-style neighbor lookup used by the solvers.
+
+        Obstacles have no outgoing edges; cells outside the grid return default.
+        """
+        if not self.in_bounds(cell.row, cell.col):
+            return default
+        if self._blocked_at(cell.row, cell.col):
+            return []
+        return self.neighbors(cell)
+
+    def _set_blocked(self, cell, blocked):
+        """Writes one obstacle cell and reports whether it changed."""
+        self._check_bounds(cell)
+        if bool(self._blocked_at(cell.row, cell.col)) == blocked:
+            return False
+        tile_size = self.tile_size
+        self._current[(cell.row % tile_size) * tile_size + cell.col % tile_size] = int(blocked)
+        self._dirty.add(self._current_key)
+        self.version += 1
+        return True
+
+    def add_obstacle(self, cell):
+        """
+        Turns an open cell into a wall.
+
+        :param cell: Cell inside the grid.
+        :return: True if the grid changed.
+        :raises ValueError: If the cell lies outside the grid.
+        """
+        if not self._set_blocked(cell, True):
+            return False
+        if self._components is not None:
+            self._components.obstacle_added(cell)
+        return True
+
+    def remove_obstacle(self, cell):
+        """
+        Turns a wall back into an open cell.
+
+        :param cell: Cell inside the grid.
+        :return: True if the grid changed.
+        :raises ValueError: If the cell lies outside the grid.
+        """
+        if not self._set_blocked(cell, False):
+            return False
+        if self._components is not None:
+            self._components.obstacle_removed(cell)
+        return True
+
+def open_tiled_maze(path, cache_tiles=DEFAULT_CACHE_TILES, intern_cells=False):
+    """
+    Opens a tiled maze as a graph without reading it into memory.
+
+    :param path: Tiled maze file written by write_tiled_maze or convert_maze.
+    :param cache_tiles: Maximum number of unpacked tiles kept in memory.
+    :param intern_cells: Passed to TiledGridGraph.
+    :return: TiledGridGraph reading the mapped file.
+    """
+    with open(path, 'rb') as tiled_file:
+        mapped = mmap.mmap(tiled_file.fileno(), 0, access=mmap.ACCESS_COPY)
+    rows, cols, tile_size = read_header(mapped)
+    return TiledGridGraph(mapped, rows, cols, tile_size, cache_tiles, intern_cells=intern_cells)
+
+def parse_args(argv=None):
+    """Parses the command-line options of the tiled maze tools."""
+    parser = argparse.ArgumentParser(description="Convert binary mazes to the tiled format and inspect tiled mazes.")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subcommands.add_parser('convert', help="Convert a binary maze (see maze_io.py) to the tiled format.")
+    convert_parser.add_argument('source', help="Binary maze file.")
+    convert_parser.add_argument('target', help="Tiled maze file to write.")
+    convert_parser.add_argument('--tile-size', type=int, default=DEFAULT_TILE_SIZE,
+                                help="Side of the square tiles (a multiple of 8).")
+
+    info_parser = subcommands.add_parser('info', help="Print the size and tile layout of a tiled maze.")
+    info_parser.add_argument('maze', help="Tiled maze file.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = parse_args(argv)
+    if args.command == 'convert':
+        size = convert_maze(args.source, args.target, args.tile_size)
+        print(f"Wrote {args.target} ({size} bytes, {args.tile_size}x{args.tile_size} tiles).")
+        return 0
+
+    graph = open_tiled_maze(args.maze)
+    tile_kb = graph.tile_size * graph.tile_size / 1024
+    print(f"{graph.rows}x{graph.cols} maze in {graph.tile_rows}x{graph.tile_cols} tiles of "
+          f"{graph.tile_size}x{graph.tile_size} cells ({tile_kb:g} KB each when resident).")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())